@@ -0,0 +1,50 @@
+# benchmark for assumption queries
+#
+# Fresh expressions are built from symbols with assumptions and the
+# usual assumption attributes are queried, so that each query is
+# evaluated and propagated once per object.
+
+import sys
+sys.path.insert(0, '..')
+
+from time import clock
+from sympy import *
+
+N = 2000
+
+x = Symbol('x', positive=True)
+y = Symbol('y', negative=True)
+n = Symbol('n', integer=True)
+z = Symbol('z')
+
+queries = ['is_positive', 'is_negative', 'is_nonnegative', 'is_real',
+           'is_integer', 'is_bounded', 'is_zero', 'is_even', 'is_irrational']
+
+def bench_queries(make):
+    exprs = [make(i) for i in xrange(N)]
+    t1 = clock()
+    for e in exprs:
+        for q in queries:
+            getattr(e, q)
+    return clock() - t1
+
+def bench_expand(e):
+    clear_cache()
+    t1 = clock()
+    e.expand()
+    return clock() - t1
+
+workloads = [
+    ("Mul", lambda i: Mul(Integer(i+2), x, y, n, evaluate=False)),
+    ("Pow", lambda i: Pow(x, Rational(i+1, 3), evaluate=False)),
+    ("Add", lambda i: Add(Integer(i), x, n**2, evaluate=False)),
+    ("Symbol", lambda i: Symbol('s%d' % i, nonnegative=True)),
+    ]
+
+if __name__ == '__main__':
+    print "N =", N
+    print "-" * 40
+    for name, make in workloads:
+        print "%24s : %6.3f s" % ("queries " + name, bench_queries(make))
+    print "%24s : %6.3f s" % ("expand((x+y+n+z)**8)",
+                              bench_expand((x+y+n+z)**8))
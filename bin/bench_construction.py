@@ -0,0 +1,77 @@
+# benchmark for the construction of large sums and products
+
+import sys
+sys.path.insert(0, '..')
+
+from time import clock
+from sympy import *
+from sympy.core.cache import clear_cache
+
+N = 10000
+
+x, y = symbols('xy')
+
+def bench_add_symbols():
+    terms = [Symbol('x%s' % i) for i in xrange(N)]
+    clear_cache()
+    t1 = clock()
+    Add(*terms)
+    return clock() - t1
+
+def bench_add_products():
+    terms = [Integer(i+2)*Symbol('x%s' % i)*y for i in xrange(N)]
+    clear_cache()
+    t1 = clock()
+    Add(*terms)
+    return clock() - t1
+
+def bench_add_powers():
+    terms = [x**(i+2) for i in xrange(N)]
+    clear_cache()
+    t1 = clock()
+    Add(*terms)
+    return clock() - t1
+
+def bench_add_nested():
+    terms = [Add(Symbol('x%s' % i), Symbol('y%s' % i)) for i in xrange(N//2)]
+    clear_cache()
+    t1 = clock()
+    Add(*terms)
+    return clock() - t1
+
+def bench_add_from_terms():
+    terms = dict([(Symbol('x%s' % i), Integer(i+2)) for i in xrange(N)])
+    clear_cache()
+    t1 = clock()
+    Add.from_terms(terms)
+    return clock() - t1
+
+def bench_mul_symbols():
+    terms = [Symbol('x%s' % i) for i in xrange(N)]
+    clear_cache()
+    t1 = clock()
+    Mul(*terms)
+    return clock() - t1
+
+def bench_mul_powers():
+    terms = [Symbol('x%s' % i)**(i+2) for i in xrange(N)]
+    clear_cache()
+    t1 = clock()
+    Mul(*terms)
+    return clock() - t1
+
+tests = [
+    ("Add(x0, x1, ...)", bench_add_symbols),
+    ("Add(2*x0*y, ...)", bench_add_products),
+    ("Add(x**2, x**3, ...)", bench_add_powers),
+    ("Add(x0+y0, x1+y1, ...)", bench_add_nested),
+    ("Add.from_terms({x0: 2, ...})", bench_add_from_terms),
+    ("Mul(x0, x1, ...)", bench_mul_symbols),
+    ("Mul(x0**2, x1**3, ...)", bench_mul_powers),
+    ]
+
+if __name__ == '__main__':
+    print "N =", N
+    print "-" * 40
+    for name, test in tests:
+        print "%28s : %6.3f s" % (name, test())
@@ -0,0 +1,32 @@
+# benchmark for common subexpression elimination on many expressions
+#
+# The expressions are the entries of the Jacobians of n functions which
+# share subexpressions; the time should grow linearly with n.
+
+import sys
+sys.path.insert(0, '..')
+
+from time import clock
+from sympy import *
+
+x, y, z = symbols('xyz')
+
+def jacobian_entries(n):
+    exprs = []
+    for i in xrange(n):
+        f = Matrix([[sin(x*y + i)*exp(x + z), cos(x*y + i)*exp(x + z)]])
+        J = f.jacobian([x, y, z])
+        exprs.extend([J[k, l] for k in range(2) for l in range(3)])
+    return exprs
+
+def bench(n):
+    exprs = jacobian_entries(n)
+    t1 = clock()
+    replacements, reduced = cse(exprs)
+    return len(exprs), len(replacements), clock() - t1
+
+if __name__ == '__main__':
+    print "%12s %14s : %s" % ("expressions", "replacements", "time")
+    print "-" * 40
+    for n in [100, 200, 400, 800]:
+        print "%12s %14s : %6.3f s" % bench(n)
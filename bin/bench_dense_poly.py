@@ -0,0 +1,49 @@
+# benchmark for the sparse and dense algorithms of polynomials.fast
+#
+# Random integer polynomials of the given degrees are multiplied,
+# divided and their gcd is computed, once with the dictionary based
+# algorithms only and once with the dense ones for dense operands.
+# The modular gcd is only run for small degrees.
+
+import sys
+sys.path.insert(0, '..')
+
+import random
+from time import clock
+from sympy.polynomials.fast import dense_poly, intpoly
+
+def random_poly(degree, bound=1000):
+    coeffs = {}
+    for e in xrange(degree + 1):
+        c = random.randint(-bound, bound)
+        if c:
+            coeffs[e] = c
+    coeffs[degree] = random.randint(1, bound)
+    return intpoly.IntPoly(coeffs)
+
+def bench(n, f, g, h):
+    fg = f*g
+    fh, gh = f*h, g*h
+    t1 = clock()
+    f*g
+    t2 = clock()
+    intpoly.div(fg, g)
+    t3 = clock()
+    intpoly.gcd_heuristic(fh, gh)
+    t4 = clock()
+    if n <= 50:
+        intpoly.gcd_small_primes(fh, gh)
+    t5 = clock()
+    return t2 - t1, t3 - t2, t4 - t3, t5 - t4
+
+if __name__ == '__main__':
+    random.seed(1)
+    print "%6s %8s : %9s %9s %9s %9s" \
+          % ("degree", "", "mul", "div", "gcd", "gcd mod p")
+    print "-" * 58
+    for n in [20, 50, 100, 500, 1000]:
+        f, g, h = random_poly(n), random_poly(n), random_poly(n//5)
+        for name, threshold in [("sparse", 2.0), ("dense", 0.5)]:
+            dense_poly.density_threshold = threshold
+            print "%6i %8s : %7.3f s %7.3f s %7.3f s %7.3f s" \
+                  % ((n, name) + bench(n, f, g, h))
@@ -0,0 +1,58 @@
+# benchmark for evaluating one expression at many points
+
+import sys
+sys.path.insert(0, '..')
+
+from time import clock
+from sympy import *
+from sympy.utilities.lambdify import evaluate_many
+
+N = 100000
+N_SUBS = 100    # subs is slow, it is timed on fewer points
+
+x, y = symbols('xy')
+e = sin(x)*exp(-y**2) + x**3*y - log(1 + x**2)/(1 + y**2)
+
+points = [(i/float(N), 1 - i/float(N)) for i in xrange(N)]
+
+def bench_subs():
+    t1 = clock()
+    for p in points[:N_SUBS]:
+        float(e.subs_dict({x: p[0], y: p[1]}))
+    return (clock() - t1) * N / N_SUBS
+
+def bench_lambdify():
+    t1 = clock()
+    f = lambdify(e, [x, y])
+    for p in points:
+        f(*p)
+    return clock() - t1
+
+def bench_lambdify_vector():
+    # a torus: the three coordinates share subexpressions
+    r = 2 + cos(y)
+    f = lambdify([r*cos(x), r*sin(x), sin(y)*exp(-x**2)*(1 + x**2)], [x, y])
+    t1 = clock()
+    for p in points:
+        f(*p)
+    return clock() - t1
+
+def bench_lambdify_create():
+    t1 = clock()
+    for i in xrange(N_SUBS):
+        lambdify(e, [x, y])
+    return clock() - t1
+
+def bench_evaluate_many():
+    t1 = clock()
+    evaluate_many(e, [x, y], points)
+    return clock() - t1
+
+if __name__ == '__main__':
+    print "N =", N
+    print "-" * 40
+    print "%24s : %6.3f s (extrapolated)" % ("subs + float", bench_subs())
+    print "%24s : %6.3f s" % ("lambdify", bench_lambdify())
+    print "%24s : %6.3f s" % ("lambdify, vector", bench_lambdify_vector())
+    print "%24s : %6.3f s" % ("%s x lambdify" % N_SUBS, bench_lambdify_create())
+    print "%24s : %6.3f s" % ("evaluate_many", bench_evaluate_many())
@@ -0,0 +1,29 @@
+# benchmark suite for expand() of polynomial expressions
+
+import sys
+sys.path.insert(0, '..')
+
+from time import clock
+from sympy import *
+from sympy.core.cache import clear_cache
+
+x, y, z, w = symbols('xyzw')
+
+tests = [
+    ("(x+y)**50", lambda: (x+y)**50),
+    ("(1+x+y+z)**10", lambda: (1+x+y+z)**10),
+    ("(1+x+y+z)**20", lambda: (1+x+y+z)**20),
+    ("(x+y+z+w)**8*(x-y)**8", lambda: (x+y+z+w)**8*(x-y)**8),
+    ("(1+x)**20*(1-x)**20", lambda: (1+x)**20*(1-x)**20),
+    ("(x+sin(y))**15", lambda: (x+sin(y))**15),
+    ("(x/2+y/3+1)**12", lambda: (x/2+y/3+1)**12),
+    ]
+
+if __name__ == '__main__':
+    for name, make in tests:
+        e = make()
+        clear_cache()
+        t1 = clock()
+        r = e.expand()
+        t = clock() - t1
+        print "%24s : %6.3f s  (%d terms)" % (name, t, len(r[:]))
@@ -0,0 +1,39 @@
+# benchmark for the headless export of plots
+#
+# A sequence of plots is calculated and written one at a time; the time
+# per plot and the peak memory of the process are printed for each
+# format. The memory should not grow with the number of plots.
+
+import sys
+sys.path.insert(0, '..')
+
+import resource
+from time import time
+from StringIO import StringIO
+from sympy import *
+from sympy.plotting.plot_export import export_plots
+
+x, y = symbols('xy')
+
+def jobs(n, format):
+    for i in xrange(n):
+        if format == 'obj' or i % 2:
+            f = (sin(x*y + i)/(1 + x**2), [x, -3, 3, 40], [y, -3, 3, 40])
+        else:
+            f = (sin(x + i)*exp(-x**2/10), [x, -10, 10, 400])
+        yield f, StringIO()
+
+def bench(n, format):
+    t1 = time()
+    export_plots(jobs(n, format), format, size=(300, 250))
+    t2 = time()
+    memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return (t2 - t1) / n, memory
+
+if __name__ == '__main__':
+    print "%6s %6s : %10s %12s" % ("format", "plots", "per plot", "peak memory")
+    print "-" * 40
+    for format in ['obj', 'svg', 'png']:
+        for n in [10, 40]:
+            t, memory = bench(n, format)
+            print "%6s %6i : %8.3f s %9i kB" % (format, n, t, memory)
@@ -0,0 +1,81 @@
+# benchmark for the factorization of univariate integer polynomials
+#
+# Hard cases for the recombination of the modular factors: the
+# Swinnerton-Dyer polynomials are irreducible, but split into factors
+# of degree 1 or 2 modulo every prime, and x**n - 1 splits into many
+# cyclotomic polynomials. Some cases are also run with the exhaustive
+# subset search instead of the lattice reduction for comparison.
+
+import sys
+sys.path.insert(0, '..')
+
+import random
+from time import time
+from sympy.polynomials.fast import intpoly
+
+IntPoly = intpoly.IntPoly
+
+def binomial(n, k):
+    result = 1
+    for i in xrange(k):
+        result = result*(n - i)/(i + 1)
+    return result
+
+def swinnerton_dyer(n):
+    """The polynomial with roots +-sqrt(2) +- ... +-sqrt(p_n)."""
+    primes = [2, 3, 5, 7, 11, 13, 17][:n]
+    f = IntPoly({2:1, 0:-primes[0]})
+    for q in primes[1:]:
+        # f(x + sqrt(q)) == a + sqrt(q)*b
+        a, b = {}, {}
+        for k, c in f.coeffs.iteritems():
+            for i in xrange(k + 1):
+                t = c*binomial(k, i)*q**(i//2)
+                if i % 2:
+                    b[k-i] = b.get(k-i, 0) + t
+                else:
+                    a[k-i] = a.get(k-i, 0) + t
+        a, b = IntPoly(a), IntPoly(b)
+        f = a*a - (b*b).scale(q)
+    return f
+
+def random_poly(degree, bound=100):
+    coeffs = {}
+    for e in xrange(degree + 1):
+        coeffs[e] = random.randint(-bound, bound)
+    coeffs[degree] = random.randint(1, bound)
+    return IntPoly(coeffs)
+
+def timed(f):
+    t1 = time()
+    factors = intpoly.factor(f)
+    return time() - t1, len(factors) - 1
+
+if __name__ == '__main__':
+    random.seed(1)
+    sd4, sd5 = swinnerton_dyer(4), swinnerton_dyer(5)
+    # sd4(3*x), which has the leading coefficient 3**16
+    sd4_3x = IntPoly(dict([(e, c*3**e) for e, c in sd4.coeffs.iteritems()]))
+    cases = [
+        ("Swinnerton-Dyer deg 16", sd4, True),
+        ("Swinnerton-Dyer deg 32", sd5, True),
+        ("Swinnerton-Dyer deg 64", swinnerton_dyer(6), False),
+        ("x**60 - 1", IntPoly({60:1, 0:-1}), True),
+        ("x**100 - 1", IntPoly({100:1, 0:-1}), False),
+        ("x**105 - 1", IntPoly({105:1, 0:-1}), False),
+        ("SD 32 * SD 16(3x) * rnd 20", sd5*sd4_3x*random_poly(20), False),
+        ("rnd 30 * rnd 30 * rnd 30",
+         random_poly(30)*random_poly(30)*random_poly(30), False),
+        ("rnd 100", random_poly(100), False),
+        ]
+    threshold = intpoly.lattice_threshold
+    print "%26s : %8s %9s %9s" % ("", "factors", "lattice", "subsets")
+    print "-" * 60
+    for name, f, subsets in cases:
+        intpoly.lattice_threshold = threshold
+        t, k = timed(f)
+        if subsets:
+            intpoly.lattice_threshold = sys.maxint
+            print "%26s : %8i %7.3f s %7.3f s" % (name, k, t, timed(f)[0])
+        else:
+            print "%26s : %8i %7.3f s" % (name, k, t)
@@ -0,0 +1,69 @@
+# benchmark for polynomials over GF(p)
+#
+# Times multiplication, gcd and factorization of random polynomials
+# modulo primes, and the modular integer gcd, which computes gcds modulo
+# many primes. The GF(p) algorithms are run with and without NumPy if it
+# is installed.
+
+import sys
+sys.path.insert(0, '..')
+
+import random
+from time import clock
+from sympy.polynomials.fast import gfpoly, intpoly
+
+def random_int_poly(degree, bound=100):
+    coeffs = {}
+    for e in xrange(degree + 1):
+        coeffs[e] = random.randint(-bound, bound)
+    coeffs[degree] = random.randint(1, bound)
+    return intpoly.IntPoly(coeffs)
+
+def bench_gf(n, p):
+    poly_type = gfpoly.GFPolyFactory(p)
+    f = poly_type.random(n, n)
+    g = poly_type.random(n, n)
+    h = poly_type.random(n//2, n//2)
+    fh, gh = f*h, g*h
+    t1 = clock()
+    f*g
+    t2 = clock()
+    gfpoly.gcd(fh, gh)
+    t3 = clock()
+    return t2 - t1, t3 - t2
+
+def bench_factor(n, p):
+    f = gfpoly.GFPolyFactory(p).random(n, n)
+    t1 = clock()
+    gfpoly.factor(f)
+    return clock() - t1
+
+def bench_int_gcd(n):
+    f, g, h = random_int_poly(n), random_int_poly(n), random_int_poly(n//2)
+    fh, gh = f*h, g*h
+    t1 = clock()
+    intpoly.gcd_small_primes(fh, gh)
+    return clock() - t1
+
+if __name__ == '__main__':
+    random.seed(1)
+    numpy = gfpoly.numpy
+    backends = [("python", None)]
+    if numpy is not None:
+        backends.append(("numpy", numpy))
+    print "%6s %11s %7s : %9s %9s" % ("degree", "p", "", "mul", "gcd")
+    print "-" * 50
+    for n in [100, 500, 1000]:
+        for p in [101, 2**31 - 1]:
+            for name, module in backends:
+                gfpoly.numpy = module
+                print "%6i %11i %7s : %7.3f s %7.3f s" \
+                      % ((n, p, name) + bench_gf(n, p))
+    gfpoly.numpy = numpy
+    print
+    for n, p in [(20, 101), (40, 101), (20, 10007)]:
+        print "%24s : %6.3f s" % ("factor deg %i mod %i" % (n, p),
+                                  bench_factor(n, p))
+    for n in [10, 20, 40]:
+        print "%24s : %6.3f s" % ("gcd_small_primes deg %i" % (2*n),
+                                  bench_int_gcd(n))
@@ -0,0 +1,29 @@
+# benchmark for has() with classes on large trigonometric expressions
+
+import sys
+sys.path.insert(0, '..')
+
+from time import clock
+from sympy import *
+
+N = 300
+M = 1000
+
+x, y = symbols('xy')
+
+def make_expr():
+    return Add(*[sin(x)**i*cos(Symbol('y%s' % i)) + tan(i*x) for i in xrange(N)])
+
+def bench(e, cls):
+    t1 = clock()
+    for i in xrange(M):
+        e.has(cls)
+    return clock() - t1
+
+if __name__ == '__main__':
+    e = make_expr()
+    print "N =", N, " M =", M
+    print "-" * 40
+    for name, cls in [("sin", sin), ("cot", cot), ("Order", Basic.Order),
+                      ("Derivative", Derivative)]:
+        print "%24s : %6.3f s" % ("has(%s)" % name, bench(e, cls))
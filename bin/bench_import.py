@@ -0,0 +1,34 @@
+# benchmark for the startup time of sympy
+#
+# Each statement is run in a new interpreter; the best wall time of
+# several runs is printed, minus the time of an empty interpreter.
+
+import sys
+sys.path.insert(0, '..')
+
+import os
+from time import time
+
+statements = [
+    "import sympy",
+    "from sympy import *",
+    "from sympy import Symbol, sin",
+    "from sympy import integrate",
+    ]
+
+def run(code, n=5):
+    command = '%s -c "%s"' % (sys.executable, code)
+    best = None
+    for i in xrange(n):
+        t1 = time()
+        os.system(command)
+        t2 = time()
+        if best is None or t2 - t1 < best:
+            best = t2 - t1
+    return best
+
+if __name__ == '__main__':
+    os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    empty = run("pass")
+    for code in statements:
+        print "%32s : %6.3f s" % (code, run(code) - empty)
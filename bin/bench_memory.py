@@ -0,0 +1,51 @@
+# memory benchmark for the core classes: bytes used per expression node
+#
+# Every test creates N distinct nodes of one kind and reports the growth of
+# the resident set size divided by N. The caches are disabled while the
+# nodes are created so that only the nodes themselves are measured.
+
+import sys
+sys.path.insert(0, '..')
+
+from sympy import *
+from sympy.core.cache import set_cache_size, clear_cache
+
+N = 100000
+
+def rss():
+    # resident set size in bytes (Linux)
+    for line in open('/proc/self/status'):
+        if line.startswith('VmRSS:'):
+            return int(line.split()[1]) * 1024
+    raise RuntimeError('cannot determine the resident set size')
+
+x = Symbol('x')
+y = Symbol('y')
+
+tests = [
+    ("Integer", lambda i: Integer(10**6 + i)),
+    ("Rational", lambda i: Rational(1, 10**6 + i)),
+    ("Symbol", lambda i: Symbol(names[i])),
+    ("Pow", lambda i: Pow(x, ints[i])),
+    ("Mul", lambda i: Mul(x, y, ints[i])),
+    ("Add", lambda i: Add(x, y, ints[i])),
+    ]
+
+def run(name, make):
+    args = range(N)
+    clear_cache()
+    before = rss()
+    nodes = [make(i) for i in args]
+    after = rss()
+    clear_cache()
+    return (after - before) / float(N)
+
+if __name__ == '__main__':
+    set_cache_size(0, 0)
+    # arguments are created in advance, so that they are not counted
+    names = ['s%s' % i for i in xrange(N)]
+    ints = [Integer(10**6 + i) for i in xrange(N)]
+    print "%12s : %s" % ("node", "bytes/node")
+    print "-" * 30
+    for name, make in tests:
+        print "%12s : %8.1f" % (name, run(name, make))
@@ -0,0 +1,49 @@
+# benchmark for the multi-modular algorithms of polynomials.fast.intpoly
+#
+# gcd of f*h and g*h and the resultant and discriminant of random
+# integer polynomials, computed with one process and with a pool of
+# worker processes. The gcd of small primes is shown for comparison.
+
+import sys
+sys.path.insert(0, '..')
+
+import random
+from time import time
+from sympy.polynomials.fast import intpoly
+from sympy.utilities import parallel
+
+def random_poly(degree, bound=100):
+    coeffs = {}
+    for e in xrange(degree + 1):
+        c = random.randint(-bound, bound)
+        if c:
+            coeffs[e] = c
+    coeffs[degree] = random.randint(1, bound)
+    return intpoly.IntPoly(coeffs)
+
+def timed(f, *args, **kwargs):
+    t1 = time()
+    f(*args, **kwargs)
+    return time() - t1
+
+if __name__ == '__main__':
+    random.seed(1)
+    processes = [None]
+    if parallel.available:
+        processes.append(4)
+        # start the workers
+        intpoly.resultant(random_poly(2), random_poly(2), processes=4)
+    print "%6s %9s : %9s %9s %9s" % ("degree", "processes", "gcd",
+                                     "resultant", "discr")
+    print "-" * 50
+    for n in [100, 200, 400]:
+        f, g, h = random_poly(n), random_poly(n), random_poly(n//2)
+        fh, gh = f*h, g*h
+        for k in processes:
+            print "%6i %9s : %7.3f s %7.3f s %7.3f s" % (n, k,
+                timed(intpoly.gcd_multimodular, fh, gh, processes=k),
+                timed(intpoly.resultant, f, g, processes=k),
+                timed(intpoly.discriminant, f, processes=k))
+        if n <= 100:
+            print "%6i %9s : %7.3f s" % (n, "small p",
+                timed(intpoly.gcd_small_primes, fh, gh))
@@ -0,0 +1,46 @@
+# benchmark for the computation of plot vertices and colors
+#
+# The plots are created without a window; the vertices and colors are
+# computed once more in the main thread after the background calculation
+# has finished. Wall clock time is measured, since the plots with the
+# "processes" option do their work in other processes.
+
+import sys
+sys.path.insert(0, '..')
+
+from time import time, sleep
+from sympy import *
+
+x, y = symbols('xy')
+
+def wait(mode):
+    while not (mode.verts and mode.cverts) or \
+              mode._get_calculating_verts() or mode._get_calculating_cverts():
+        sleep(0.01)
+
+def bench(expr, *intervals):
+    p = Plot(expr, *intervals, **{'visible': False})
+    mode = p[0]
+    wait(mode)
+    t1 = time()
+    mode._on_calculate_verts()
+    t2 = time()
+    mode._on_calculate_cverts()
+    t3 = time()
+    return t2 - t1, t3 - t2
+
+tests = [
+    ("curve, 10000 steps", sin(x)*exp(-x**2), [x, -5, 5, 10000]),
+    ("surface, 100x100", sin(x*y)/(1 + x**2), [x, -5, 5, 100], [y, -5, 5, 100]),
+    ("surface, 400x400", sin(x*y)/(1 + x**2), [x, -5, 5, 400], [y, -5, 5, 400]),
+    ("surface, 400x400, 4 proc", sin(x*y)/(1 + x**2), [x, -5, 5, 400], [y, -5, 5, 400],
+     "processes=4"),
+    ("surface, adaptive 40000", sin(x*y)/(1 + x**2), [x, -5, 5, 50], [y, -5, 5, 50],
+     "adaptive=40000"),
+    ]
+
+if __name__ == '__main__':
+    print "%24s : %8s %8s" % ("", "verts", "colors")
+    print "-" * 44
+    for test in tests:
+        print "%24s : %6.3f s %6.3f s" % ((test[0],) + bench(*test[1:]))
@@ -0,0 +1,51 @@
+# benchmark for the Polynomial class
+#
+# Conversion of expanded expressions into coefficient tuples,
+# arithmetic with the coefficient tuples, attribute access and the
+# multivariate division and Groebner basis algorithms built on them.
+
+import sys
+sys.path.insert(0, '..')
+
+from time import clock
+from sympy import *
+from sympy.polynomials import div_, groebner_
+
+x, y, z = symbols('xyz')
+
+def timed(f, *args):
+    t1 = clock()
+    f(*args)
+    return clock() - t1
+
+def attributes(f, n):
+    for i in xrange(n):
+        f.coeffs, f.var, f.order, f.sympy_expr
+
+def mul_repeated(f, g, n):
+    for i in xrange(n):
+        f*g
+
+if __name__ == '__main__':
+    e = ((x + y + z + 1)**6).expand()
+    e_rat = ((x/2 + y/3 + z + 1)**6).expand()
+    f = Polynomial(e, var=[x, y, z])
+    g = Polynomial(((x - 2*y + 3*z - 1)**4).expand(), var=[x, y, z])
+    small = Polynomial(x*y + 2*z - 1)
+    cases = [
+        ("construct deg 6", timed, Polynomial, e),
+        ("construct deg 6 rational", timed, Polynomial, e_rat),
+        ("construct lex", timed,
+         lambda e: Polynomial(e, var=[x, y, z], order='lex'), e),
+        ("attributes (10**5)", timed, attributes, f, 10**5),
+        ("mul 84 x 35 terms", timed, f.__mul__, g),
+        ("mul 3 x 3 terms (1000)", timed, mul_repeated, small, small, 1000),
+        ("add", timed, f.__add__, g),
+        ("div", timed, div_.div, f, [Polynomial(x*y - 1, var=[x, y, z]),
+                                     Polynomial(z**2 - x, var=[x, y, z])]),
+        ("groebner", timed, groebner_.groebner,
+         [x**2 + y*z - 2, y**2 + x*z - 3, z**2 + x*y - 5], [x, y, z]),
+        ]
+    for name, bench, function, args in [(c[0], c[1], c[2], c[3:])
+                                        for c in cases]:
+        print "%24s : %6.3f s" % (name, bench(function, *args))
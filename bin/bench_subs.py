@@ -0,0 +1,43 @@
+# benchmark for substituting many symbols at once into a large expression
+
+import sys
+sys.path.insert(0, '..')
+
+from time import clock
+from sympy import *
+from sympy.core.cache import clear_cache
+
+K = 40      # number of substituted symbols
+N = 400     # number of terms
+
+x = Symbol('x')
+params = [Symbol('p%s' % i) for i in xrange(K)]
+
+def make_expr():
+    terms = []
+    for i in xrange(N):
+        p = params[i % K]
+        q = params[(7*i) % K]
+        terms.append(p*x**i + sin(q*x)*p)
+    return Add(*terms)
+
+def bench(name, e, values):
+    clear_cache()
+    t1 = clock()
+    if name == 'subs':
+        r = e
+        for old, new in values.items():
+            r = r.subs(old, new)
+    else:
+        r = getattr(e, name)(values)
+    return clock() - t1
+
+if __name__ == '__main__':
+    e = make_expr()
+    values = dict([(p, Rational(i+1, 3)) for i, p in enumerate(params)])
+    print "K =", K, " N =", N
+    print "-" * 40
+    for name in ['subs', 'subs_dict', 'xreplace']:
+        if not hasattr(e, name) and name != 'subs':
+            continue
+        print "%24s : %6.3f s" % (name, bench(name, e, values))
@@ -20,14 +20,32 @@ from functions import *
 from simplify import *
 from solvers import *
 from matrices import *
-from geometry import *
 from polynomials import *
 from utilities import *
-from integrals import *
-from plotting import Plot, textplot
-from printing import pretty, pretty_print, pprint, pprint_use_unicode
 
 import abc
 
+# These subpackages are imported when one of their names is first used
+# (see sympy.utilities.lazy), which saves their import time for programs
+# that do not need them. "from sympy import *" imports them all.
+_lazy = {
+    'geometry': None, 'integrals': None, 'plotting': None,
+    'printing': None, 'statistics': None, 'physics': None,
+}
+for _n in ['Point', 'Line', 'Ray', 'Segment', 'Ellipse', 'Circle', 'Polygon',
+           'RegularPolygon', 'Triangle', 'intersection', 'convex_hull',
+           'are_similar', 'GeometryError']:
+    _lazy[_n] = 'sympy.geometry'
+for _n in ['integrate', 'Integral', 'risch_norman']:
+    _lazy[_n] = 'sympy.integrals'
+for _n in ['Plot', 'textplot']:
+    _lazy[_n] = 'sympy.plotting'
+for _n in ['pretty', 'pretty_print', 'pprint', 'pprint_use_unicode']:
+    _lazy[_n] = 'sympy.printing'
+
+from sympy.utilities.lazy import make_lazy as _make_lazy
+_make_lazy(__name__, _lazy, [_n for _n in _lazy
+                             if _n not in ['statistics', 'physics']])
+
 #for _n, _cls in Basic.singleton.items():
 #    exec '%s = _cls()' % (_n)
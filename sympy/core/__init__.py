@@ -11,12 +11,13 @@ from relational import Equality, Inequality, Unequality, StrictInequality
 from function import Lambda, WildFunction, Derivative, diff, FunctionClass, \
     Function, SingleValuedFunction
 from interval import Interval
+from cache import clear_cache, set_cache_size, cache_info
 
 # set repr output to pretty output:
 Basic.set_repr_level(1)
 
 # expose singletons like exp, log, oo, I, etc.
 for _n, _cls in Basic.singleton.items():
-    exec '%s = _cls()' % (_n)
+    globals()[_n] = _cls()
 
 sympify = Basic.sympify
@@ -5,6 +5,8 @@ from methods import RelMeths, ArithMeths
 
 class Add(AssocOp, RelMeths, ArithMeths):
 
+    __slots__ = []
+
     precedence = Basic.Add_precedence
 
     @classmethod
@@ -14,8 +16,12 @@ class Add(AssocOp, RelMeths, ArithMeths):
         coeff = Basic.Zero()
         lambda_args = None
         order_factors = []
-        while seq:
-            o = seq.pop(0)
+        # seq is processed as a stack (the next term at the end), so that
+        # nested sums are flattened in linear time
+        stack = list(seq)
+        stack.reverse()
+        while stack:
+            o = stack.pop()
             #if isinstance(o, Basic.Function):
             #    if o.nofargs is not None:
             #        o, lambda_args = o.with_dummy_arguments(lambda_args)
@@ -32,7 +38,7 @@ class Add(AssocOp, RelMeths, ArithMeths):
                 coeff += o
                 continue
             if o.__class__ is cls:
-                seq = list(o[:]) + seq
+                stack.extend(reversed(o[:]))
                 continue
             if isinstance(o, Basic.Mul):
                 c = o[0]
@@ -80,11 +86,68 @@ class Add(AssocOp, RelMeths, ArithMeths):
                     newseq2.append(t)
             newseq = newseq2 + order_factors
 
-        newseq.sort(Basic.compare)
+        newseq.sort(key=Basic.compare_key)
         if noncommutative:
             return [],newseq,lambda_args,None
         return newseq,[],lambda_args,None
 
+    @classmethod
+    def from_terms(cls, terms):
+        """ Construct a sum from an already collected mapping of terms to
+        their coefficients, without flattening the terms again.
+
+        The terms should be neither sums nor numbers and should not carry
+        a numerical coefficient themselves; the constant part is stored
+        with the key One:
+
+        >>> from sympy import *
+        >>> x, y = symbols('xy')
+        >>> Add.from_terms({x: 2, y: 1, S.One: 3})
+        3 + y + 2*x
+
+        Otherwise the sum is flattened as usual:
+
+        >>> Add.from_terms({2*x: 3, x + 1: 1})
+        1 + 7*x
+        """
+        newseq = []
+        noncommutative = False
+        coeff = None
+        for s, c in terms.items():
+            c = Basic.sympify(c)
+            if isinstance(c, Basic.Zero):
+                continue
+            s = Basic.sympify(s)
+            if isinstance(s, Basic.One):
+                coeff = c
+                continue
+            if isinstance(s, (Basic.Number, Basic.Add)) or \
+                   (isinstance(s, Basic.Mul) and
+                    isinstance(s[0], Basic.Number)):
+                # s is not a term of a sum
+                return cls(*[Basic.Mul(c, s) for s, c in terms.items()])
+            if isinstance(c, Basic.One):
+                newseq.append(s)
+            elif isinstance(c, Basic.Rational) and s.is_commutative:
+                # s carries no coefficient (checked above), so c*s needs
+                # no flattening
+                if isinstance(s, Basic.Mul):
+                    newseq.append(Basic.Mul._from_factors((c,) + s[:]))
+                else:
+                    newseq.append(Basic.Mul._from_factors((c, s)))
+            else:
+                newseq.append(Basic.Mul(c, s))
+            noncommutative = noncommutative or not s.is_commutative
+        if coeff is not None:
+            newseq.append(coeff)
+        if not newseq:
+            return Basic.Zero()
+        if len(newseq) == 1:
+            return newseq[0]
+        newseq.sort(key=Basic.compare_key)
+        return Basic.__new__(cls, *newseq,
+                             **{'commutative': not noncommutative})._intern()
+
     def tostr(self, level=0):
         coeff, rest = self.as_coeff_factors()
         l = []
@@ -270,6 +333,8 @@ class Add(AssocOp, RelMeths, ArithMeths):
                         return Add(*([coeff1-coeff2]+factors1[:i]+[new]+factors1[i+l2:]))
         return self.__class__(*[s.subs(old, new) for s in self])
 
+    _xreplace = Basic._seq_xreplace
+
     def _eval_oseries(self, order):
         return Add(*[f.oseries(order) for f in self])
 
@@ -1,4 +1,10 @@
 
+class SharedAssumptions(dict):
+    """ Assumption dictionary shared by all objects of a class that were
+    created with the same assumptions. AssumeMeths.assume() replaces it
+    with a private copy before modifying it.
+    """
+
 class AssumeMeths(object):
     """ Define default assumption methods.
     
@@ -48,6 +54,12 @@ class AssumeMeths(object):
     Implementation note: assumption values are stored in
     ._assumption dictionary or are returned by getter methods (with
     property decorators) or are attributes of objects/classes.
+    Objects created with equal assumptions share one dictionary
+    (see _init_assumptions) until an assumption is changed. A value
+    found by an _eval_is_<name> method is recorded together with the
+    facts it implies, which are compiled once into _assume_closures;
+    the evaluation methods of each class are looked up once when the
+    class is created (see assumption_evaluators).
 
     Examples:
     
@@ -65,6 +77,8 @@ class AssumeMeths(object):
 
     """
 
+    __slots__ = ['_assumptions']
+
     _assume_aliases = {} # aliases, "a key means values"
     _assume_aliases['nni'] = ('integer','nonnegative')
     _assume_aliases['npi'] = ('integer','nonpositive')
@@ -126,43 +140,78 @@ class AssumeMeths(object):
                        'nni','pi',
                        'evaluate')
 
+    def _init_assumptions(self, assumptions):
+        """ Set assumptions of a newly created object.
+
+        The result of assume() depends only on the class and the given
+        assumptions, so it is computed once and the dictionary is shared
+        by all objects of the class created with the same assumptions.
+        """
+        items = assumptions.items()
+        items.sort()
+        key = tuple(items)
+        shared = self.__class__._shared_assumptions
+        try:
+            d = shared[key]
+        except KeyError:
+            self.assume(**assumptions)
+            d = shared[key] = SharedAssumptions(self._assumptions)
+        except TypeError:
+            # unhashable assumption values
+            self.assume(**assumptions)
+            return
+        self._assumptions = d
+
     def _get_assumption(self, name):
         k = name[3:]
-        if k in self._assume_defined:
-            assumptions = self._assumptions
-            try: return assumptions[k]
-            except KeyError: pass
-
-            # First try the assumption evaluation function if it exists
-            if hasattr(self, '_eval_is_'+k):
-                a = getattr(self,'_eval_is_'+k)()
-                if a is not None:
-                    self.assume(**{k:a})
-                    return getattr(self, name)
-
-            # Try the negative assumption evaluation function
-            ik = ''
-            if k in self._assume_negs:
-                ik = self._assume_negs[k]
-            elif k in self._assume_inegs:
-                ik = self._assume_inegs[k]
-            if hasattr(self, '_eval_is_'+ik):
-                a = getattr(self,'_eval_is_'+ik)()
-                if a is not None:
-                    self.assume(**{ik:a})
-                    return getattr(self, name)
-
-            # No result, return None
-            return None
-        elif k in self._assume_aliases:
-            for p in self._assume_aliases[k]:
-                v = getattr(self, 'is_' + p)
-                if v is None:
-                    return None
-                elif v is False:
-                    return False
-            return True
-        raise AttributeError('undefined assumption %r' % (k))
+        try:
+            evaluate, ik, evaluate_negation = self._assume_evaluators[k]
+        except KeyError:
+            if k in self._assume_aliases:
+                for p in self._assume_aliases[k]:
+                    v = getattr(self, 'is_' + p)
+                    if v is None:
+                        return None
+                    elif v is False:
+                        return False
+                return True
+            raise AttributeError('undefined assumption %r' % (k))
+        assumptions = self._assumptions
+        try: return assumptions[k]
+        except KeyError: pass
+
+        # First try the assumption evaluation function if it exists
+        if evaluate is not None:
+            a = evaluate(self)
+            if a is not None:
+                self._learn_assumption(k, a)
+                return self._assumptions.get(k)
+
+        # Try the negative assumption evaluation function
+        if evaluate_negation is not None:
+            a = evaluate_negation(self)
+            if a is not None:
+                self._learn_assumption(ik, a)
+                return self._assumptions.get(k)
+
+        # No result, return None
+        return None
+
+    def _learn_assumption(self, name, value):
+        """ Record the fact name=value found by an evaluation method
+        together with all facts implied by it, as assume() would.
+
+        The implied facts are looked up in _assume_closures instead of
+        being derived from the rules again.
+        """
+        d = self._assumptions
+        if d.__class__ is SharedAssumptions:
+            d = self._assumptions = dict(d)
+        default_assumptions = self.__class__.default_assumptions
+        for k, v in _assume_closures[name, bool(value)]:
+            if v is None and k in default_assumptions:
+                continue
+            self._change_assumption(d, k, v)
 
     def _change_assumption(self, d, name, value, extra_msg = ''):
         default_assumptions = self.__class__.default_assumptions
@@ -195,7 +244,9 @@ class AssumeMeths(object):
                     raise TypeError("%s: assumption %r is fixed to %r for this class." \
                                     % (self.__class__.__name__,k,v))
             assumptions[k] = v
-        d = self._assumptions = getattr(self, '_assumptions', {})
+        d = getattr(self, '_assumptions', None)
+        if d is None or d.__class__ is SharedAssumptions:
+            d = self._assumptions = dict(d or {})
 
         ###
         if "negative" in assumptions:
@@ -306,15 +357,59 @@ class AssumeMeths(object):
         return tuple([(k+'=', d[k]) for k in keys])
 
     def _eval_is_nonnegative(self):
+        evaluators = self._assume_evaluators
         a = None
-        if hasattr(self, '_eval_is_zero'):
+        if evaluators['zero'][0] is not None:
             a = self._eval_is_zero()
 
         b = None
-        if hasattr(self, '_eval_is_positive'):
+        if evaluators['positive'][0] is not None:
             b = self._eval_is_positive()
 
         if a == True or b == True:
             return True
         elif a == False and b == False:
-            return False
\ No newline at end of file
+            return False
+
+
+class _Facts(AssumeMeths):
+    """ Object without default assumptions that records the changes
+    made by assume(), used to derive the facts implied by single
+    assumptions.
+    """
+    __slots__ = ['changes']
+    default_assumptions = {}
+
+    def _change_assumption(self, d, name, value, extra_msg = ''):
+        AssumeMeths._change_assumption(self, d, name, value, extra_msg)
+        self.changes.append((name, value))
+
+def _compile_closures():
+    closures = {}
+    for k in AssumeMeths._assume_defined:
+        if k == 'order':
+            continue
+        for v in [True, False]:
+            facts = _Facts()
+            facts.changes = []
+            facts.assume(**{k: v})
+            closures[k, v] = tuple(facts.changes)
+    return closures
+
+# (name, value) -> the facts (name, value or None) set by assume(name=value)
+_assume_closures = _compile_closures()
+
+def assumption_evaluators(cls):
+    """ Return the table of the evaluation methods of cls, used by
+    _get_assumption: it maps each assumption name to the method
+    _eval_is_<name>, the name of the negated assumption and the method
+    _eval_is_<negated name>, where missing methods are None.
+    """
+    negs = AssumeMeths._assume_negs
+    inegs = AssumeMeths._assume_inegs
+    table = {}
+    for k in AssumeMeths._assume_defined:
+        ik = negs.get(k) or inegs.get(k, '')
+        table[k] = (getattr(cls, '_eval_is_' + k, None), ik,
+                    getattr(cls, '_eval_is_' + ik, None))
+    return table
@@ -3,7 +3,9 @@
 type_class = type
 
 import decimal
+import weakref
 from basic_methods import BasicMeths, cache_it, cache_it_immutable, BasicType
+from cache import cache_manager
 
 class MemoizerArg:
     """ See Memoizer.
@@ -77,6 +79,7 @@ class Memoizer:
       - arguments must be immutable
       - when function values are mutable then one must use return_value_converter to
         deep copy the returned values
+      - cached values are subject to the entry budgets of sympy.core.cache
 
     Ref: http://en.wikipedia.org/wiki/Memoization
     """
@@ -108,8 +111,9 @@ class Memoizer:
         have_been_here[i] = True
 
     def __call__(self, func):
-        cache = {}
-        value_cache = {}
+        name = '%s.%s' % (func.__module__, func.func_name)
+        cache = cache_manager.new_cache(name)
+        value_cache = cache_manager.new_cache(name + ':values')
         def wrapper(*args, **kw_args):
             kw_items = tuple(kw_args.items())
             try:
@@ -138,8 +142,14 @@ class Memoizer:
                     pass
                 cache[new_args, new_kw_items] = cache[args, kw_items] = r
                 return self.return_value_converter(r)
+        wrapper._cache_it_cache = cache
         return wrapper
 
+# Canonical instances of interned expressions, keyed by class, hashable
+# content and assumptions, see Basic.set_interning.
+_intern_table = weakref.WeakValueDictionary()
+_intern_flag = [False]
+
 #####
 
 class Basic(BasicMeths):
@@ -175,13 +185,59 @@ class Basic(BasicMeths):
 
     """
 
+    __slots__ = []
+
     def __new__(cls, *args, **assumptions):
         obj = object.__new__(cls)
-        obj.assume(**assumptions)
+        obj._init_assumptions(assumptions)
         obj._mhash = None # will be set by BasicMeths.__hash__ method.
+        obj._mkey = None  # will be set by BasicMeths.compare_key method.
+        obj._atomset = None   # will be set by Basic._atom_set method.
+        obj._symbolset = None # will be set by Basic._symbol_set.
+        obj._typeset = None   # will be set by Basic._type_set method.
         obj._args = args  # all items in args must be Basic objects
         return obj
 
+    @staticmethod
+    def set_interning(flag=None):
+        """
+        Enable or disable interning (hash-consing) of expressions and
+        return the previous setting.
+
+        When interning is enabled, Symbol, Integer, Rational, Add, Mul,
+        Pow and applied functions return a single canonical instance for
+        every distinct structure, so that identical subtrees built in
+        different places share memory and compare equal by identity.
+        Canonical instances are held in a weak-value table, so they are
+        released as soon as no expression refers to them.
+
+        Notes:
+        ======
+            - interned instances are shared, so their assumptions must
+              not be modified in-situ with .assume()
+            - disabling interning clears the table of canonical instances
+        """
+        old_flag = _intern_flag[0]
+        if flag is not None:
+            _intern_flag[0] = bool(flag)
+            if not flag:
+                _intern_table.clear()
+        return old_flag
+
+    def _intern(self):
+        """Return the canonical instance for self if interning is enabled,
+        otherwise return self. Must be called after all attributes that
+        _hashable_content depends on have been set.
+        """
+        if not _intern_flag[0]:
+            return self
+        key = (self.__class__,) + self._hashable_content() + self._assume_hashable_content()
+        obj = _intern_table.get(key)
+        if obj is None:
+            _intern_table[key] = self
+            return self
+        return obj
+
     @staticmethod
     def sympify(a, sympify_lists=False):
         """Converts an arbitrary expression to a type that can be used
@@ -259,7 +315,6 @@ class Basic(BasicMeths):
                 pass
         raise ValueError("%r is NOT a valid SymPy expression" % a)
 
-    @Memoizer('Basic', MemoizerArg((type, type(None), tuple), name='type'), return_value_converter = lambda obj: obj.copy())
     def atoms(self, type=None):
         """Returns the atoms that form current object.
 
@@ -267,29 +322,78 @@ class Basic(BasicMeths):
         >>> from sympy import *
         >>> x = Symbol('x')
         >>> y = Symbol('y')
-        >>> (x+y**2+ 2*x*y).atoms()
-        set([2, x, y])
+        >>> (x+y**2+ 2*x*y).atoms() == set([Integer(2), x, y])
+        True
 
         You can also filter the results by a given type(s) of object
-        >>> (x+y+2+y**2*sin(x)).atoms(type=Symbol)
-        set([x, y])
+        >>> (x+y+2+y**2*sin(x)).atoms(type=Symbol) == set([x, y])
+        True
 
         >>> (x+y+2+y**2*sin(x)).atoms(type=Number)
         set([2])
 
-        >>> (x+y+2+y**2*sin(x)).atoms(type=(Symbol, Number))
-        set([2, x, y])
+        >>> (x+y+2+y**2*sin(x)).atoms(type=(Symbol, Number)) \\
+        ...     == set([Integer(2), x, y])
+        True
         """
-        result = set()
-        if type is not None and not isinstance(type, (type_class, tuple)):
+        atoms = self._atom_set()
+        if type is None:
+            return set(atoms)
+        if not isinstance(type, (type_class, tuple)):
             type = Basic.sympify(type).__class__
-        if isinstance(self, Atom):
-            if type is None or isinstance(self, type):
-                result.add(self)
-        else:
-            for obj in self:
-                result = result.union(obj.atoms(type=type))
-        return result
+        return set([a for a in atoms if isinstance(a, type)])
+
+    def _atom_set(self):
+        """Returns the frozenset of atoms of self.
+
+        The set is computed once from the atom sets of the arguments
+        and stored on the object, so that it must not be modified.
+        """
+        atoms = self._atomset
+        if atoms is None:
+            atoms = self._atomset = _union_of_args(self._args,
+                                                    lambda obj: obj._atom_set())
+        return atoms
+
+    def _symbol_set(self):
+        """Returns the frozenset of symbols contained in self.
+
+        These are the same symbols as returned by atoms(Symbol), bound
+        variables (e.g. of an Integral) included. Like the atom set, it is
+        computed once and stored on the object.
+        """
+        symbols = self._symbolset
+        if symbols is None:
+            symbols = self._symbolset = \
+                      _union_of_args(self._args, lambda obj: obj._symbol_set())
+        return symbols
+
+    def _type_set(self):
+        """Returns the frozenset of the classes of self and of all objects
+        contained in self, including their base classes and classes given
+        as arguments (like functions). So self contains an instance of cls
+        if and only if cls is in the set.
+
+        The set is computed once from the type sets of the arguments and
+        stored on the object, so that it must not be modified.
+        """
+        types = self._typeset
+        if types is None:
+            types = _mro_set(self.__class__)
+            if self._args:
+                types = set(types)
+                stack = list(self._args)
+                while stack:
+                    obj = stack.pop()
+                    if isinstance(obj, Basic):
+                        types.update(obj._type_set())
+                    elif isinstance(obj, BasicType):
+                        types.update(_mro_set(obj))
+                    elif isinstance(obj, (tuple, list)):
+                        stack.extend(obj)
+                types = frozenset(types)
+            self._typeset = types
+        return types
 
     def is_hypergeometric(self, arg):
         from sympy.simplify import hypersimp
@@ -299,7 +403,7 @@ class Basic(BasicMeths):
     def is_number(self):
         """Returns True if self is a number (like 1, or 1+log(2)), and False
         otherwise (e.g. 1+x).""" 
-        return len(self.atoms(Basic.Symbol)) == 0
+        return not self._symbol_set()
 
     def is_fraction(self, syms):
         p, q = self.as_numer_denom()
@@ -317,7 +421,7 @@ class Basic(BasicMeths):
         if syms:
             syms = map(Basic.sympify, syms)
         else:
-            syms = list(self.atoms(type=Basic.Symbol))
+            syms = list(self._symbol_set())
 
         if not syms: # constant polynomial
             return True
@@ -376,14 +480,9 @@ class Basic(BasicMeths):
             raise TypeError("has() requires at least 1 argument (got none)")
         p = Basic.sympify(patterns[0])
         if isinstance(p, Basic.Symbol) and not isinstance(p, Basic.Wild): # speeds up
-            return p in self.atoms(p.__class__)
+            return p in self._symbol_set()
         if isinstance(p, BasicType):
-            #XXX hack, this is very fragile:
-            if str(self).find(str(p.__name__)) == -1:
-                #didn't find p in self
-                return False
-            else:
-                return True
+            return p in self._type_set()
         if p.matches(self) is not None:
             return True
         if not False:
@@ -441,11 +540,92 @@ class Basic(BasicMeths):
         return c(self)
 
     def subs_dict(self, old_new_dict):
+        """Substitutes all pairs old -> new of the given dictionary.
+
+        If all old expressions are symbols, the substitutions are done
+        simultaneously in a single traversal (see xreplace), otherwise
+        subs() is applied to each pair in turn.
+        """
+        for old in old_new_dict:
+            if not isinstance(old, Basic.Symbol):
+                break
+        else:
+            return self.xreplace(old_new_dict)
         r = self
         for old,new in old_new_dict.items():
             r = r.subs(old,new)
         return r
 
+    def xreplace(self, rule):
+        """Replaces subexpressions equal to a key of rule by its value.
+
+        All replacements are done simultaneously in a single traversal of
+        the expression tree, unchanged subexpressions are reused and no
+        results are cached. Unlike subs(), only exact occurrences of the
+        keys are replaced:
+
+        >>> from sympy import *
+        >>> x, y, z = symbols('xyz')
+        >>> (x + 2*y).xreplace({x: y, y: z})
+        y + 2*z
+        >>> (x*y*z).xreplace({x*y: 2})
+        x*y*z
+        """
+        new_rule = {}
+        for old, new in rule.items():
+            old = Basic.sympify(old)
+            if not isinstance(old, Basic):
+                # e.g. function classes, which only subs() can replace
+                return self.subs_dict(rule)
+            new_rule[old] = Basic.sympify(new)
+        return self._xreplace(new_rule, {})
+
+    def _xreplace(self, rule, memo):
+        # Classes which can be rebuilt from their arguments use
+        # _seq_xreplace instead; for all others the pairs that occur in
+        # self are substituted with subs(). To keep the substitutions
+        # simultaneous, each old expression is first replaced by a dummy
+        # symbol and the dummies by the new expressions afterwards.
+        try:
+            return rule[self]
+        except KeyError:
+            pass
+        if not self._args:
+            return self
+        pairs = [(old, new) for old, new in rule.items() if self.has(old)]
+        if len(pairs) == 1:
+            return self.subs(*pairs[0])
+        r = self
+        dummies = []
+        for old, new in pairs:
+            d = Basic.Symbol('x', dummy=True)
+            r = r.subs(old, d)
+            dummies.append((d, new))
+        for d, new in dummies:
+            r = r.subs(d, new)
+        return r
+
+    def _seq_xreplace(self, rule, memo):
+        try:
+            return rule[self]
+        except KeyError:
+            pass
+        args = []
+        changed = False
+        for a in self._args:
+            if isinstance(a, Basic):
+                try:
+                    b = memo[a]
+                except KeyError:
+                    b = memo[a] = a._xreplace(rule, memo)
+                if b is not a:
+                    changed = True
+                a = b
+            args.append(a)
+        if not changed:
+            return self
+        return self.__class__(*args)
+
     #@classmethod
     def matches(pattern, expr, repl_dict={}, evaluate=False):
         """
@@ -964,6 +1144,21 @@ class Basic(BasicMeths):
         else:
             raise ValueError("Symbolic value, can't compute")
 
+    def evaluate_many(self, symbols, points):
+        """Evaluate self numerically at many points.
+
+        points is a sequence of tuples of values for symbols (or a NumPy
+        array), the result is an array of floats. See
+        sympy.utilities.lambdify.evaluate_many:
+
+        >>> from sympy import *
+        >>> x, y = symbols('xy')
+        >>> list((x*y + 1).evaluate_many([x, y], [(1, 2), (3, 4)]))
+        [3.0, 13.0]
+        """
+        from sympy.utilities.lambdify import evaluate_many
+        return evaluate_many(self, symbols, points)
+
     def evalf(self, precision=None):
         if precision is None:
             r = self._eval_evalf()
@@ -1151,10 +1346,64 @@ class Basic(BasicMeths):
     ##################### END OF BASIC CLASS #################################
     ##########################################################################
 
+_mro_sets = {}
+
+def _mro_set(cls):
+    """ Frozenset of cls and its base classes, shared by all type sets
+    of atoms of the same class.
+    """
+    types = _mro_sets.get(cls)
+    if types is None:
+        types = _mro_sets[cls] = frozenset(cls.__mro__)
+    return types
+
+def _union_of_args(args, get_set):
+    """ Union of the sets get_set(obj) of all Basic objects in args as a
+    frozenset. Tuples and lists in args (like the limits of integrals)
+    are searched recursively.
+    """
+    sets = []
+    for obj in args:
+        if isinstance(obj, Basic):
+            s = get_set(obj)
+            if s:
+                sets.append(s)
+        elif isinstance(obj, (tuple, list)):
+            s = _union_of_args(obj, get_set)
+            if s:
+                sets.append(s)
+    if not sets:
+        return frozenset()
+    if len(sets) == 1:
+        return sets[0]
+    result = set(sets[0])
+    for s in sets[1:]:
+        result.update(s)
+    return frozenset(result)
+
+
 class Atom(Basic):
 
+    __slots__ = []
+
     precedence = Basic.Atom_precedence
 
+    def _atom_set(self):
+        atoms = self._atomset
+        if atoms is None:
+            atoms = self._atomset = frozenset([self])
+        return atoms
+
+    def _symbol_set(self):
+        symbols = self._symbolset
+        if symbols is None:
+            if isinstance(self, Basic.Symbol):
+                symbols = frozenset([self])
+            else:
+                symbols = frozenset()
+            self._symbolset = symbols
+        return symbols
+
     def _eval_derivative(self, s):
         if self==s: return Basic.One()
         return Basic.Zero()
@@ -1201,6 +1450,8 @@ class Singleton(Basic):
     """ Singleton object.
     """
 
+    __slots__ = []
+
     def __new__(cls, *args, **assumptions):
         # if you need to overload __new__, then
         # use the same code as below to ensure
@@ -2,7 +2,8 @@
 """
 
 import decimal
-from assumptions import AssumeMeths
+from assumptions import AssumeMeths, assumption_evaluators
+from cache import cache_manager
 
 # used for canonical ordering of symbolic sequences
 # via __cmp__ method:
@@ -64,6 +65,11 @@ ordering_of_classes = [
     'Equality', 'Unequality', 'StrictInequality', 'Inequality',
     ]
 
+# class name -> position in ordering_of_classes, classes that are not
+# listed get the rank UNKNOWN_CLASS_RANK
+class_ranks = dict([(n, i) for i, n in enumerate(ordering_of_classes)])
+UNKNOWN_CLASS_RANK = len(ordering_of_classes)+1
+
 #
 
 def repr_level(flag=None, _cache=[1]):
@@ -84,8 +90,11 @@ def mycopy(obj, level=0):
     return obj
 
 
+def _new_cache(func):
+    return cache_manager.new_cache('%s.%s' % (func.__module__, func.func_name))
+
 def cache_it_fast(func):
-    func._cache_it_cache = func_cache_it_cache = {}
+    func._cache_it_cache = func_cache_it_cache = _new_cache(func)
     def wrapper(*args, **kw_args):
         if kw_args:
             keys = kw_args.keys()
@@ -103,10 +112,11 @@ def cache_it_fast(func):
         if cache_flag:
             func_cache_it_cache[k] = r
         return mycopy(r)
+    wrapper._cache_it_cache = func_cache_it_cache
     return wrapper
 
 def cache_it_immutable(func):
-    func._cache_it_cache = func_cache_it_cache = {}
+    func._cache_it_cache = func_cache_it_cache = _new_cache(func)
     def wrapper(*args, **kw_args):
         if kw_args:
             keys = kw_args.keys()
@@ -121,10 +131,11 @@ def cache_it_immutable(func):
             pass
         func_cache_it_cache[k] = r = func(*args, **kw_args)
         return r
+    wrapper._cache_it_cache = func_cache_it_cache
     return wrapper
 
 def cache_it_debug(func):
-    func._cache_it_cache = func_cache_it_cache = {}
+    func._cache_it_cache = func_cache_it_cache = _new_cache(func)
     func._cache_it_cache_repr = func_cache_it_cache_repr = {}
     def wrapper(*args, **kw_args):
         if kw_args:
@@ -153,13 +164,14 @@ def cache_it_debug(func):
             # check that cache values have not changed
             assert new_s==s,`func,s,r, args[0].__class__`
         return mycopy(r)
+    wrapper._cache_it_cache = func_cache_it_cache
     return wrapper
 
 cache_it = cache_it_fast
 #cache_it = cache_it_debug # twice slower
 
 def cache_it_nondummy(func):
-    func._cache_it_cache = func_cache_it_cache = {}
+    func._cache_it_cache = func_cache_it_cache = _new_cache(func)
     def wrapper(*args, **kw_args):
         if kw_args:
             try:
@@ -180,6 +192,7 @@ def cache_it_nondummy(func):
             pass
         func_cache_it_cache[k] = r = func(*args, **kw_args)
         return r
+    wrapper._cache_it_cache = func_cache_it_cache
     return wrapper
 
 class BasicType(type):
@@ -200,16 +213,25 @@ class MetaBasicMeths(BasicType):
             print 'Ignoring redefinition of %s: %s defined earlier than %s' % (n, c, cls)
         type.__init__(cls, *args, **kws)
 
-        # initialize default_assumptions dictionary
+        # initialize default_assumptions dictionary from the is_*
+        # attributes, taking each one from the first class of the mro
+        # that defines it
+        attributes = {}
+        for c in cls.__mro__:
+            for k, v in c.__dict__.items():
+                if k.startswith('is_') and k not in attributes:
+                    attributes[k] = v
         default_assumptions = {}
-        for k in dir(cls):
-            if not k.startswith('is_'):
-                continue
-            v = getattr(cls, k)
-            k = k[3:]
+        for k, v in attributes.items():
             if isinstance(v,(bool,int,long)):
-                default_assumptions[k] = bool(v)
+                default_assumptions[k[3:]] = bool(v)
         cls.default_assumptions = default_assumptions
+        # evaluation methods by assumption name, see AssumeMeths
+        cls._assume_evaluators = assumption_evaluators(cls)
+        # assumption dictionaries shared by instances, see AssumeMeths
+        cls._shared_assumptions = {}
+        # position in ordering_of_classes, used for sorting
+        cls._class_rank = class_ranks.get(n, UNKNOWN_CLASS_RANK)
 
     def __getattr__(cls, name):
         try: return MetaBasicMeths.classnamespace[name]
@@ -222,29 +244,22 @@ class MetaBasicMeths(BasicType):
         n2 = other.__name__
         c = cmp(n1,n2)
         if not c: return 0
+        # classes that are not in ordering_of_classes come last and are
+        # sorted by their names
+        return cmp(cls._class_rank, getattr(other, '_class_rank', UNKNOWN_CLASS_RANK)) or c
 
-        UNKNOWN = len(ordering_of_classes)+1
-        try:
-            i1 = ordering_of_classes.index(n1)
-        except ValueError:
-            #print 'Add',n1,'to basic_methods.ordering_of_classes list'
-            #return c
-            i1 = UNKNOWN
-        try:
-            i2 = ordering_of_classes.index(n2)
-        except ValueError:
-            #print 'Add',n2,'to basic_methods.ordering_of_classes list'
-            #return c
-            i2 = UNKNOWN
-        if i1 == UNKNOWN and i2 == UNKNOWN:
-            return c
-        return cmp(i1,i2)
+    def _class_key(cls):
+        # cmp(c1._class_key(), c2._class_key()) == cmp(c1, c2)
+        return (cls._class_rank, cls.__name__)
 
 
 class BasicMeths(AssumeMeths):
 
     __metaclass__ = MetaBasicMeths
 
+    __slots__ = ['_args', '_mhash', '_mkey', '_atomset', '_symbolset',
+                 '_typeset', '__weakref__']
+
     Lambda_precedence = 1
     Add_precedence = 40
     Mul_precedence = 50
@@ -276,7 +291,13 @@ class BasicMeths(AssumeMeths):
         # occurs as hash is needed for setting cache dictionary keys
         h = self._mhash
         if h is None:
-            a = self._assume_hashable_content()
+            # assumptions of compound objects follow from their arguments
+            # and are filled in lazily when queried, so they must not
+            # change the hash (compare() ignores them as well)
+            if self._args:
+                a = ()
+            else:
+                a = self._assume_hashable_content()
             self._mhash = h = hash((self.__class__.__name__,) + self._hashable_content() + a)
         return h
 
@@ -373,21 +394,32 @@ class BasicMeths(AssumeMeths):
         If the object is of different type from other then their classes
         are ordered according to sorted_classes list.
         """
-        # all redefinitions of __cmp__ method should start with the
-        # following three lines:
         if self is other: return 0
-        c = cmp(self.__class__, other.__class__)
-        if c: return c
-        #
-        st = self._hashable_content()
-        ot = other._hashable_content()
-        c = cmp(len(st),len(ot))
-        if c: return c
-        Basic = self.__class__.Basic
-        for l,r in zip(st,ot):
-            if isinstance(l, Basic):
-                c = l.compare(r)
-            else:
-                c = cmp(l, r)
-            if c: return c
-        return 0
+        if not isinstance(other, BasicMeths):
+            return cmp(self.__class__, other.__class__)
+        return cmp(self.compare_key(), other.compare_key())
+
+    def compare_key(self):
+        """
+        Return the sort key of the object, such that
+
+          cmp(a.compare_key(), b.compare_key()) == a.compare(b)
+
+        The key consists of the class position in ordering_of_classes, the
+        class name, the length of _hashable_content() and its items, where
+        the items that are sympy objects (or classes) are replaced by their
+        keys. It is computed once per object, so comparing objects does not
+        walk the expression trees again.
+        """
+        k = self._mkey
+        if k is None:
+            st = self._hashable_content()
+            l = [self.__class__._class_key(), len(st)]
+            for a in st:
+                if isinstance(a, BasicMeths):
+                    a = a.compare_key()
+                elif isinstance(a, MetaBasicMeths):
+                    a = a._class_key()
+                l.append(a)
+            self._mkey = k = tuple(l)
+        return k
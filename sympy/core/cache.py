@@ -0,0 +1,231 @@
+""" Bounded caches with least-recently-used eviction.
+
+All caches used by the cache_it family of decorators (see basic_methods.py)
+are created through the global cache_manager instance. The manager keeps
+track of the total number of cached entries and enforces two limits:
+
+  - a global entry budget shared by all caches; when it is exceeded the
+    least recently used entries of the largest cache are evicted, until
+    1/64 of the budget is free again
+  - an optional per-function entry budget; when it is exceeded the least
+    recently used entry of that function's cache is evicted
+
+The budgets can be changed at runtime with set_cache_size() or through
+the SYMPY_CACHE_SIZE environment variable (global budget in entries,
+"none" or "0" means unbounded).
+
+Usage:
+
+  >>> from sympy.core.cache import clear_cache, cache_info
+  >>> clear_cache()        # drop all cached results
+
+  cache_info() returns a list of CacheInfo objects holding hit, miss and
+  eviction counters for each cache, which is useful for sizing the
+  budgets of long running processes.
+"""
+
+import os
+
+# indices into the entries of the doubly linked list used by LRUCache
+PREV, NEXT, KEY, VALUE = 0, 1, 2, 3
+
+DEFAULT_CACHE_SIZE = 500000
+
+
+class CacheInfo:
+    """ Statistics of a single cache, see cache_info().
+    """
+
+    def __init__(self, name, hits, misses, evictions, size, maxsize):
+        self.name = name
+        self.hits = hits
+        self.misses = misses
+        self.evictions = evictions
+        self.size = size
+        self.maxsize = maxsize
+
+    def __repr__(self):
+        return '%s(name=%r, hits=%s, misses=%s, evictions=%s, size=%s, maxsize=%s)' \
+               % (self.__class__.__name__, self.name, self.hits, self.misses,
+                  self.evictions, self.size, self.maxsize)
+
+
+class LRUCache(object):
+    """ Mapping with bounded size that evicts the least recently used
+    entries first.
+
+    Entries are kept in a circular doubly linked list ordered from the
+    least recently used (root[NEXT]) to the most recently used
+    (root[PREV]), so that lookups, insertions and evictions are O(1).
+
+    Lookups of missing keys raise KeyError like dictionaries do.
+    """
+
+    def __init__(self, name, manager=None, maxsize=None):
+        self.name = name
+        self.manager = manager
+        self.maxsize = maxsize
+        self.hits = self.misses = self.evictions = 0
+        self._map = {}
+        root = []
+        root[:] = [root, root, None, None]
+        self._root = root
+
+    def __len__(self):
+        return len(self._map)
+
+    def __contains__(self, key):
+        return key in self._map
+
+    def __getitem__(self, key):
+        link = self._map.get(key)
+        if link is None:
+            self.misses += 1
+            raise KeyError(key)
+        self._move_to_end(link)
+        self.hits += 1
+        return link[VALUE]
+
+    def _move_to_end(self, link):
+        # move link to the most recently used position
+        link_prev, link_next = link[PREV], link[NEXT]
+        link_prev[NEXT] = link_next
+        link_next[PREV] = link_prev
+        root = self._root
+        last = root[PREV]
+        last[NEXT] = root[PREV] = link
+        link[PREV] = last
+        link[NEXT] = root
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key, value):
+        link = self._map.get(key)
+        if link is not None:
+            link[VALUE] = value
+            self._move_to_end(link)
+            return
+        root = self._root
+        last = root[PREV]
+        link = [last, root, key, value]
+        last[NEXT] = root[PREV] = self._map[key] = link
+        if self.manager is not None:
+            self.manager.size += 1
+        if self.maxsize is not None and len(self._map) > self.maxsize:
+            self.evict()
+        if self.manager is not None:
+            self.manager.check_budget()
+
+    def evict(self, n=1):
+        """ Remove n least recently used entries.
+        """
+        root = self._root
+        d = self._map
+        while n > 0 and d:
+            link = root[NEXT]
+            link_next = link[NEXT]
+            root[NEXT] = link_next
+            link_next[PREV] = root
+            del d[link[KEY]]
+            self.evictions += 1
+            if self.manager is not None:
+                self.manager.size -= 1
+            n -= 1
+
+    def resize(self, maxsize):
+        """ Change the maximal number of entries, None means unbounded.
+        """
+        self.maxsize = maxsize
+        if maxsize is not None and len(self._map) > maxsize:
+            self.evict(len(self._map) - maxsize)
+
+    def clear(self):
+        if self.manager is not None:
+            self.manager.size -= len(self._map)
+        self._map.clear()
+        root = self._root
+        root[:] = [root, root, None, None]
+
+    def info(self):
+        return CacheInfo(self.name, self.hits, self.misses, self.evictions,
+                         len(self._map), self.maxsize)
+
+
+class CacheManager:
+    """ Creates bounded caches and enforces the global entry budget
+    over all of them.
+    """
+
+    def __init__(self, maxsize=None, func_maxsize=None):
+        self.caches = []
+        self.maxsize = maxsize
+        self.func_maxsize = func_maxsize
+        self.size = 0
+
+    def new_cache(self, name):
+        cache = LRUCache(name, self, self.func_maxsize)
+        self.caches.append(cache)
+        return cache
+
+    def check_budget(self):
+        maxsize = self.maxsize
+        if maxsize is None or self.size <= maxsize:
+            return
+        # Finding the largest cache takes a pass over all caches, so a
+        # fraction of the budget is freed at once to keep the cost per
+        # insertion constant.
+        target = maxsize - maxsize // 64
+        while self.size > target:
+            largest = self.caches[0]
+            for cache in self.caches:
+                if len(cache) > len(largest):
+                    largest = cache
+            largest.evict(min(len(largest), self.size - target))
+
+    def set_budget(self, maxsize=None, func_maxsize=None):
+        """ Set the global and per-function entry budgets, None means
+        unbounded. Entries exceeding the new budgets are evicted.
+        """
+        self.maxsize = maxsize
+        self.func_maxsize = func_maxsize
+        for cache in self.caches:
+            cache.resize(func_maxsize)
+        self.check_budget()
+
+    def clear(self):
+        for cache in self.caches:
+            cache.clear()
+
+    def info(self):
+        return [cache.info() for cache in self.caches]
+
+
+def _get_default_cache_size():
+    size = os.environ.get('SYMPY_CACHE_SIZE')
+    if size is None:
+        return DEFAULT_CACHE_SIZE
+    if size.lower() in ('', 'none', '0'):
+        return None
+    return int(size)
+
+cache_manager = CacheManager(_get_default_cache_size())
+
+def clear_cache():
+    """ Remove all entries from the caches of cache_it decorated functions.
+    """
+    cache_manager.clear()
+
+def set_cache_size(maxsize=DEFAULT_CACHE_SIZE, func_maxsize=None):
+    """ Set the global entry budget of all caches (maxsize) and the budget
+    of every single cache (func_maxsize). None means unbounded.
+    """
+    cache_manager.set_budget(maxsize, func_maxsize)
+
+def cache_info():
+    """ Return a list of CacheInfo instances, one for each cache.
+    """
+    return cache_manager.info()
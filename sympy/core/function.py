@@ -92,6 +92,8 @@ class Function(Basic, RelMeths):
 
     __metaclass__ = FunctionClass
 
+    __slots__ = []
+
     precedence = Basic.Apply_precedence
 
     nofargs = None
@@ -135,7 +137,7 @@ class Function(Basic, RelMeths):
             pass
         elif not isinstance(r, tuple):
             args = (r,)
-        return Basic.__new__(cls, *args, **options)
+        return Basic.__new__(cls, *args, **options)._intern()
 
     @property
     def is_comparable(self):
@@ -585,6 +587,10 @@ class SingleValuedFunction(ArithMeths, Function):
     Single-valued functions.
     """
 
+    __slots__ = []
+
+    _xreplace = Basic._seq_xreplace
+
     @classmethod
     def _eval_apply_evalf(cls, arg):
         arg = arg.evalf()
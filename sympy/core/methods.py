@@ -11,6 +11,8 @@ def _no_binary_operation(op, obj1, obj2):
 
 class ArithMeths(object):
 
+    __slots__ = []
+
     def __pos__(self):
         return self
     def __neg__(self):
@@ -52,7 +54,9 @@ class ArithMeths(object):
         return None
 
 class NoArithMeths(object):
-    
+
+    __slots__ = []
+
     def __pos__(self):
         raise TypeError, _no_unary_operation('+', self)
     def __neg__(self):
@@ -81,7 +85,9 @@ class NoArithMeths(object):
         return None
 
 class RelMeths(object):
-    
+
+    __slots__ = []
+
     def __eq__(self, other):
         try:
             r = Basic.Equality(self, other)
@@ -105,6 +111,8 @@ class RelMeths(object):
 
 class NoRelMeths(object):
 
+    __slots__ = []
+
     def __eq__(self, other):
         return Basic.Equality(self, other)
     def __ne__(self, other):
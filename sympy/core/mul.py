@@ -2,9 +2,12 @@
 from basic import Basic, S, cache_it, cache_it_immutable
 from operations import AssocOp
 from methods import RelMeths, ArithMeths
+import sparsepoly
 
 class Mul(AssocOp, RelMeths, ArithMeths):
 
+    __slots__ = []
+
     @classmethod
     def flatten(cls, seq):
         from function import FunctionClass
@@ -12,15 +15,18 @@ class Mul(AssocOp, RelMeths, ArithMeths):
         c_part = []
         nc_part = []
         coeff = Basic.One()
+        # c_seq and nc_seq are processed as stacks (the next factor at the
+        # end), so that nested products are flattened in linear time
         c_seq = []
-        nc_seq = seq
+        nc_seq = list(seq)
+        nc_seq.reverse()
         c_powers = {}
         lambda_args = None
         order_symbols = None
         while c_seq or nc_seq:
             if c_seq:
                 # first process commutative objects
-                o = c_seq.pop(0)
+                o = c_seq.pop()
                 if isinstance(o, FunctionClass):
                     if o.nofargs is not None:
                         o, lambda_args = o.with_dummy_arguments(lambda_args)
@@ -28,7 +34,7 @@ class Mul(AssocOp, RelMeths, ArithMeths):
                     o, order_symbols = o.as_expr_symbols(order_symbols)
                 if o.__class__ is cls:
                     # associativity
-                    c_seq = list(o[:]) + c_seq
+                    c_seq.extend(reversed(o[:]))
                     continue
                 if isinstance(o, Basic.Number):
                     coeff *= o
@@ -51,7 +57,7 @@ class Mul(AssocOp, RelMeths, ArithMeths):
                 else:
                     c_powers[b] = e
             else:
-                o = nc_seq.pop(0)
+                o = nc_seq.pop()
                 if isinstance(o, Basic.WildFunction):
                     pass
                 elif isinstance(o, FunctionClass):
@@ -66,7 +72,7 @@ class Mul(AssocOp, RelMeths, ArithMeths):
                     continue
                 if o.__class__ is cls:
                     # associativity
-                    nc_seq = list(o[:]) + nc_seq
+                    nc_seq.extend(reversed(o[:]))
                     continue
                 if not nc_part:
                     nc_part.append(o)
@@ -76,7 +82,7 @@ class Mul(AssocOp, RelMeths, ArithMeths):
                 b1,e1 = o1.as_base_exp()
                 b2,e2 = o.as_base_exp()
                 if b1==b2:
-                    nc_seq.insert(0, b1 ** (e1 + e2))
+                    nc_seq.append(b1 ** (e1 + e2))
                 else:
                     nc_part.append(o1)
                     nc_part.append(o)
@@ -120,13 +126,23 @@ class Mul(AssocOp, RelMeths, ArithMeths):
         elif not isinstance(coeff, Basic.One):
             c_part.insert(0, coeff)
 
-        c_part.sort(Basic.compare)
+        c_part.sort(key=Basic.compare_key)
         if len(c_part)==2 and isinstance(c_part[0], Basic.Number) and isinstance(c_part[1], Basic.Add):
             # 2*(1+a) -> 2 + 2 * a
             coeff = c_part[0]
             c_part = [Basic.Add(*[coeff*f for f in c_part[1]])]
         return c_part, nc_part, lambda_args, order_symbols
 
+    @classmethod
+    def _from_factors(cls, factors):
+        """ Product of commutative factors that need no flattening: no
+        products, no two factors with the same base and at most one
+        number, which must be a rational other than 0 and 1.
+        """
+        factors = list(factors)
+        factors.sort(key=Basic.compare_key)
+        return Basic.__new__(cls, *factors, **{'commutative': True})._intern()
+
     def _eval_power(b, e):
         if isinstance(e, Basic.Number):
             if b.is_commutative:
@@ -233,12 +249,10 @@ class Mul(AssocOp, RelMeths, ArithMeths):
         for a in left:
             for b in right:
                 terms.append(Mul(a,b)._eval_expand_basic())
-            added = Basic.Add(*terms)
-            if isinstance(added, Basic.Add):
-                terms = list(added)
-            else:
-                terms = [added]
-        return terms
+        added = Basic.Add(*terms)
+        if isinstance(added, Basic.Add):
+            return list(added)
+        return [added]
 
     def _eval_expand_basic(self, *args):
         plain = Basic.Rational(1)
@@ -250,6 +264,12 @@ class Mul(AssocOp, RelMeths, ArithMeths):
             else:
                 plain = Mul(plain, factor)
         if sums:
+            if isinstance(plain, Basic.One):
+                result = sparsepoly.expand_product(sums)
+            else:
+                result = sparsepoly.expand_product([plain] + sums)
+            if result is not None:
+                return result
             terms = Mul._expandsums(sums)
             return Basic.Add(*(Mul(plain, term) for term in terms), **self._assumptions)
         else:
@@ -420,6 +440,8 @@ class Mul(AssocOp, RelMeths, ArithMeths):
                     return Mul(*([coeff1/coeff2,m1,new,m2]))
         return self.__class__(*[s.subs(old, new) for s in self])
 
+    _xreplace = Basic._seq_xreplace
+
     def _eval_oseries(self, order):
         x = order.symbols[0]
         l = []
@@ -5,15 +5,22 @@ from basic import Basic, Atom, Singleton, S, Memoizer, MemoizerArg
 from methods import NoRelMeths, RelMeths, ArithMeths
 from power import integer_nthroot
 
-@Memoizer((int, long), (int, long))
-def gcd(a, b):
+def igcd(a, b):
     """
-    Returns the Greatest Common Divisor, implementing Euclid's algorithm.
+    Returns the Greatest Common Divisor of two Python integers, implementing
+    Euclid's algorithm. Unlike gcd(), the result is not cached.
     """
     while a:
         a, b = b%a, a
     return b
 
+@Memoizer((int, long), (int, long))
+def gcd(a, b):
+    """
+    Returns the Greatest Common Divisor, implementing Euclid's algorithm.
+    """
+    return igcd(a, b)
+
 @Memoizer((int, long), return_value_converter = lambda d: d.copy())
 def factor_trial_division(n):
     """
@@ -66,6 +73,9 @@ class Number(Atom, RelMeths, ArithMeths):
 
     Rational(1) + sqrt(Rational(2))
     """
+
+    __slots__ = []
+
     is_commutative = True
     is_comparable = True
     is_bounded = True
@@ -177,6 +187,8 @@ class Real(Number):
     ======
         - Real(x) with x being a Python int/long will return Integer(x)
     """
+    __slots__ = ['num']
+
     is_real = True
     is_irrational = False
     is_integer = False
@@ -362,6 +374,39 @@ def _parse_rational(s):
             return p, 10**-expt
 
 
+# Pools of frequently used numbers that are returned by Integer() and
+# Rational() without allocation. They are filled on first use of each
+# number (not at import time): the integers in _pooled_integers and the
+# fractions p/q (not necessarily in lowest terms) with abs(p) <=
+# _pooled_numerators and 1 <= q <= _pooled_denominators.
+_integer_pool = {}
+_rational_pool = {}
+_pooled_integers = (-256, 1024)
+_pooled_numerators = 32
+_pooled_denominators = 16
+
+def _rational_reduced(p, q):
+    """
+    Return Rational(p, q) for coprime p and q > 0, skipping the gcd
+    normalization.
+    """
+    if q == 1:
+        return Integer(p)
+    if p == 1 and q == 2:
+        return S.Half
+    try:
+        return _rational_pool[p, q]
+    except KeyError:
+        pass
+    obj = Basic.__new__(Rational)
+    obj.p = p
+    obj.q = q
+    obj = obj._intern()
+    if type(p) is int and -_pooled_numerators <= p <= _pooled_numerators and \
+           q <= _pooled_denominators:
+        _rational_pool[p, q] = obj
+    return obj
+
 class Rational(Number):
     """Represents integers and rational numbers (p/q) of any size.
 
@@ -386,12 +431,35 @@ class Rational(Number):
         >>> float(Rational(1193,990))
         1.2050505050505051
     """
+    __slots__ = ['p', 'q']
+
     is_real = True
     is_integer = False
     is_rational = True
 
-    @Memoizer(type, (int, long, str), MemoizerArg((int, long, type(None)), name="q"))
     def __new__(cls, p, q = None):
+        try:
+            if q is None:
+                return _integer_pool[p]
+            return _rational_pool[p, q]
+        except (KeyError, TypeError):
+            pass
+        if isinstance(q, (int, long)) and q < 0:
+            # p/-q is pooled as -p/q
+            p, q = -p, -q
+        obj = Rational._new(cls, p, q)
+        if q is not None and type(p) is int and type(q) is int and \
+               -_pooled_numerators <= p <= _pooled_numerators and \
+               1 <= q <= _pooled_denominators:
+            if obj.__class__ is Rational:
+                # share the instance of p/q in lowest terms
+                obj = _rational_pool.setdefault((obj.p, obj.q), obj)
+            _rational_pool[p, q] = obj
+        return obj
+
+    @staticmethod
+    @Memoizer(type, (int, long, str), MemoizerArg((int, long, type(None)), name="q"))
+    def _new(cls, p, q = None):
         if q is None:
             if isinstance(p, str):
                 p, q = _parse_rational(p)
@@ -413,7 +481,7 @@ class Rational(Number):
         obj = Basic.__new__(cls)
         obj.p = p
         obj.q = q
-        return obj
+        return obj._intern()
 
     def _hashable_content(self):
         return (self.p, self.q)
@@ -438,7 +506,10 @@ class Rational(Number):
     def _eval_is_zero(self):
         return self.p == 0
 
-    def __neg__(self): return Rational(-self.p, self.q)
+    def __neg__(self):
+        if self.q:
+            return _rational_reduced(-self.p, self.q)
+        return Rational(-self.p, self.q)
 
     def __mul__(self, other):
         other = Basic.sympify(other)
@@ -447,6 +518,14 @@ class Rational(Number):
         if isinstance(other, Real):
             return Real(self._as_decimal() * other.num)
         if isinstance(other, Rational):
+            if self.q == 1 and other.q == 1:
+                return Integer(self.p * other.p)
+            if self.q and other.q:
+                # cancel crosswise, the result is then in lowest terms
+                g1 = igcd(abs(self.p), other.q)
+                g2 = igcd(abs(other.p), self.q)
+                return _rational_reduced((self.p // g1) * (other.p // g2),
+                                         (self.q // g2) * (other.q // g1))
             return Rational(self.p * other.p, self.q * other.q)
         return Number.__mul__(self, other)
 
@@ -457,6 +536,11 @@ class Rational(Number):
         if isinstance(other, Real):
             return Real(self._as_decimal() + other.num)
         if isinstance(other, Rational):
+            # p/q + n and n + p/q are in lowest terms when p/q is
+            if other.q == 1 and self.q:
+                return _rational_reduced(self.p + other.p * self.q, self.q)
+            if self.q == 1 and other.q:
+                return _rational_reduced(self.p * other.q + other.p, other.q)
             if self.is_unbounded:
                 if other.is_bounded:
                     return self
@@ -604,11 +688,24 @@ class Rational(Number):
 
 class Integer(Rational):
 
+    __slots__ = []
+
     q = 1
     is_integer = True
 
-    @Memoizer(type, (int, long))
     def __new__(cls, i):
+        try:
+            return _integer_pool[i]
+        except (KeyError, TypeError):
+            pass
+        obj = Integer._new(cls, i)
+        if type(i) is int and _pooled_integers[0] <= i <= _pooled_integers[1]:
+            _integer_pool[i] = obj
+        return obj
+
+    @staticmethod
+    @Memoizer(type, (int, long))
+    def _new(cls, i):
         if isinstance(i, Integer):
             return i
         if i==0: return S.Zero
@@ -616,7 +713,7 @@ class Integer(Rational):
         if i==-1: return S.NegativeOne
         obj = Basic.__new__(cls)
         obj.p = i
-        return obj
+        return obj._intern()
 
     def _eval_is_odd(self):
         return bool(self.p % 2)
@@ -1119,3 +1216,4 @@ Basic.singleton['zoo'] = ComplexInfinity
 Basic.singleton['GoldenRatio'] = GoldenRatio
 Basic.singleton['EulerGamma'] = EulerGamma
 Basic.singleton['Catalan'] = Catalan
+
@@ -10,6 +10,8 @@ class AssocOp(Basic):
     Base class for Add and Mul.
     """
 
+    __slots__ = []
+
     @cache_it_immutable
     def __new__(cls, *args, **assumptions):
         if len(args)==0:
@@ -23,7 +25,7 @@ class AssocOp(Basic):
             else: obj = cls.identity()
         else:
             assumptions['commutative'] = not nc_part
-            obj = Basic.__new__(cls, *(c_part + nc_part), **assumptions)
+            obj = Basic.__new__(cls, *(c_part + nc_part), **assumptions)._intern()
         if order_symbols is not None:
             obj = Basic.Order(obj, *order_symbols)
         if lambda_args is not None:
@@ -42,11 +44,15 @@ class AssocOp(Basic):
     @classmethod
     def flatten(cls, seq):
         # apply associativity, no commutativity property is used
+        # seq is processed as a stack (the next item at the end), so that
+        # nested arguments can be pushed in linear time
         new_seq = []
-        while seq:
-            o = seq.pop(0)
+        stack = list(seq)
+        stack.reverse()
+        while stack:
+            o = stack.pop()
             if o.__class__ is cls: # classes must match exactly
-                seq = list(o[:]) + seq
+                stack.extend(reversed(o[:]))
                 continue
             new_seq.append(o)
         return [], new_seq, None, None
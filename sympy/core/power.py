@@ -1,6 +1,7 @@
 
 from basic import Basic, S, cache_it, cache_it_immutable
 from methods import ArithMeths, RelMeths, NoRelMeths
+import sparsepoly
 
 
 def integer_nthroot(y, n):
@@ -46,6 +47,8 @@ def integer_nthroot(y, n):
 
 class Pow(Basic, ArithMeths, RelMeths):
 
+    __slots__ = []
+
     precedence = Basic.Pow_precedence
 
     @cache_it_immutable
@@ -58,7 +61,7 @@ class Pow(Basic, ArithMeths, RelMeths):
             return a
         obj = a._eval_power(b)
         if obj is None:
-            obj = Basic.__new__(cls, a, b, **assumptions)
+            obj = Basic.__new__(cls, a, b, **assumptions)._intern()
         return obj
 
     @property
@@ -203,6 +206,8 @@ class Pow(Basic, ArithMeths, RelMeths):
             if terms1==terms2: return new ** (coeff1/coeff2) # (x**(2*y)).subs(exp(3*y*log(x)),z) -> z**(2/3*y)
         return self.base.subs(old, new) ** self.exp.subs(old, new)
 
+    _xreplace = Basic._seq_xreplace
+
     def as_powers_dict(self):
         return { self.base : self.exp }
 
@@ -256,6 +261,9 @@ class Pow(Basic, ArithMeths, RelMeths):
                 return Basic.Mul(*[t**exponent for t in base])
             if exponent.is_positive and isinstance(base, Basic.Add):
                 m = int(exponent)
+                result = sparsepoly.expand_power(base, m)
+                if result is not None:
+                    return result
                 if base.is_commutative:
                     p = []
                     order_terms = []
@@ -0,0 +1,207 @@
+""" Sparse polynomials used by expand().
+
+A polynomial is stored as a dictionary mapping tuples of exponents to
+numerical coefficients (ints or sympy Numbers), together with the list
+of its generators. The generators are the bases that Mul uses to combine
+factors, so that every monomial corresponds to exactly one Mul of powers
+of the generators and the terms can be handed to Add.from_terms()
+without flattening them again.
+
+Expressions that cannot be represented this way (non-commutative
+factors, Order terms, symbolic or floating point exponents, powers of
+numbers or of exp) make from_expr() return None, expand() then uses the
+general algorithm.
+"""
+
+from basic import Basic
+
+def _factor_base_exp(f):
+    # returns (base, exponent) of a factor of a monomial or None
+    if not f.is_commutative:
+        return None
+    if isinstance(f, (Basic.Add, Basic.Order, Basic.exp,
+                      Basic.ImaginaryUnit)):
+        return None
+    if isinstance(f, Basic.Pow):
+        b, e = f.base, f.exp
+        if not isinstance(e, Basic.Rational):
+            return None
+        if isinstance(b, (Basic.Number, Basic.Exp1, Basic.exp)):
+            return None
+        if isinstance(b, Basic.Add):
+            # positive powers of sums are expanded, negative ones stay
+            if not (isinstance(e, Basic.Integer) and e.is_negative):
+                return None
+        if isinstance(e, Basic.Integer):
+            e = e.p
+        return b, e
+    if isinstance(f, (Basic.Number, Basic.Exp1)):
+        return None
+    return f, 1
+
+def from_expr(expr, gens=None):
+    """ Convert an expanded expression to a sparse polynomial.
+
+    Returns (poly, gens) where gens is the list of generators, extended
+    in place when given. Returns None if expr is not a polynomial in the
+    sense of this module.
+    """
+    if gens is None:
+        gens = []
+    index = dict([(g, i) for i, g in enumerate(gens)])
+    if isinstance(expr, Basic.Add):
+        terms = expr[:]
+    else:
+        terms = [expr]
+    monomials = []
+    for term in terms:
+        if isinstance(term, Basic.Mul):
+            factors = term[:]
+        else:
+            factors = [term]
+        coeff = 1
+        powers = {}
+        for f in factors:
+            if isinstance(f, Basic.Number):
+                if isinstance(f, (Basic.Infinity, Basic.NegativeInfinity,
+                                  Basic.NaN)):
+                    return None
+                if isinstance(f, Basic.Integer):
+                    f = f.p
+                coeff = coeff * f
+                continue
+            be = _factor_base_exp(f)
+            if be is None:
+                return None
+            b, e = be
+            i = index.get(b)
+            if i is None:
+                i = index[b] = len(gens)
+                gens.append(b)
+            powers[i] = powers.get(i, 0) + e
+        monomials.append((coeff, powers))
+    n = len(gens)
+    poly = {}
+    zero = (0,) * n
+    for coeff, powers in monomials:
+        m = list(zero)
+        for i, e in powers.items():
+            m[i] = e
+        m = tuple(m)
+        if m in poly:
+            poly[m] = poly[m] + coeff
+        else:
+            poly[m] = coeff
+    return poly, gens
+
+def _pad(poly, n):
+    # extend all monomials of poly to n generators
+    result = {}
+    for m, c in poly.items():
+        if len(m) < n:
+            m = m + (0,) * (n - len(m))
+        result[m] = c
+    return result
+
+def _int_exponents(m):
+    # integer exponents are stored as ints, so that equal monomials
+    # are equal tuples
+    l = []
+    for e in m:
+        if isinstance(e, Basic.Integer):
+            e = e.p
+        l.append(e)
+    return tuple(l)
+
+def _is_integral(poly):
+    for m in poly:
+        for e in m:
+            if not isinstance(e, (int, long)):
+                return False
+    return True
+
+def mul(p, q):
+    """ Product of two sparse polynomials over the same generators.
+    """
+    result = {}
+    get = result.get
+    integral = _is_integral(p) and _is_integral(q)
+    for m1, c1 in p.items():
+        for m2, c2 in q.items():
+            m = tuple([a + b for a, b in zip(m1, m2)])
+            if not integral:
+                m = _int_exponents(m)
+            c = get(m)
+            if c is None:
+                result[m] = c1 * c2
+            else:
+                result[m] = c + c1 * c2
+    return result
+
+def power(p, n):
+    """ n-th power of a sparse polynomial, n a positive integer.
+    """
+    result = p
+    for i in xrange(n - 1):
+        result = mul(result, p)
+    return result
+
+def to_expr(poly, gens):
+    """ Convert a sparse polynomial back to an expression.
+
+    Returns None if a power of a generator does not remain a power of
+    that generator.
+    """
+    terms = {}
+    for m, c in poly.items():
+        if isinstance(c, (int, long)):
+            if not c:
+                continue
+        elif isinstance(c, Basic.Zero):
+            continue
+        factors = []
+        for g, e in zip(gens, m):
+            if e == 1:
+                factors.append(g)
+            elif e != 0:
+                f = Basic.Pow(g, e)
+                if not (isinstance(f, Basic.Pow) and f.base == g):
+                    # the power was simplified, e.g. abs(x)**2 -> x**2
+                    return None
+                factors.append(f)
+        if not factors:
+            terms[Basic.One()] = c
+        elif len(factors) == 1:
+            terms[factors[0]] = c
+        else:
+            terms[Basic.Mul._from_factors(factors)] = c
+    return Basic.Add.from_terms(terms)
+
+def expand_product(factors):
+    """ Expand the product of the given expanded factors.
+
+    Returns None if they cannot be handled as sparse polynomials.
+    """
+    gens = []
+    polys = []
+    for f in factors:
+        r = from_expr(f, gens)
+        if r is None:
+            return None
+        polys.append(r[0])
+    n = len(gens)
+    result = _pad(polys[0], n)
+    for p in polys[1:]:
+        result = mul(result, _pad(p, n))
+    return to_expr(result, gens)
+
+def expand_power(base, n):
+    """ Expand base**n for an expanded base and a positive integer n.
+
+    Returns None if base cannot be handled as a sparse polynomial.
+    """
+    r = from_expr(base)
+    if r is None:
+        return None
+    poly, gens = r
+    return to_expr(power(poly, n), gens)
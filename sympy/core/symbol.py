@@ -17,6 +17,8 @@ class Symbol(Atom, RelMeths, ArithMeths):
        True
     """
 
+    __slots__ = ['name', 'dummy_index']
+
     is_comparable = False
     dummycount = 0
 
@@ -43,7 +45,7 @@ class Symbol(Atom, RelMeths, ArithMeths):
             obj.dummy_index = Symbol.dummycount
         assert isinstance(name, str),`type(name)`
         obj.name = name
-        return obj
+        return obj._intern()
 
     def _hashable_content(self):
         if self.is_dummy:
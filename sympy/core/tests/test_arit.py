@@ -863,3 +863,65 @@ def test_Pow_is_nonpositive_nonnegative():
     assert ((-k)**x).is_nonpositive == None
     assert ((-k)**n).is_nonpositive == None
     assert ((-k)**m).is_nonpositive == True
+
+def test_flatten_nested():
+    from sympy import Add, Mul
+    x = Symbol('x')
+    y = Symbol('y')
+    z = Symbol('z')
+    assert Add(x, Add(y, Add(x, 3)), 2) == 2*x + y + 5
+    assert Mul(x, Mul(y, Mul(x, 3)), 2) == 6*x**2*y
+    A = Symbol('A', commutative=False)
+    B = Symbol('B', commutative=False)
+    # the order of noncommutative factors is kept
+    e = Mul(A, Mul(A, B), Mul(B, x), A)
+    assert e == x*A**2*B**2*A
+    assert Mul(A, Mul(B, A), A) == A*B*A**2
+    # deeply nested sums
+    e = x
+    for i in range(200):
+        e = Add(e, Symbol('t%s' % i))
+    assert len(e[:]) == 201
+
+def test_add_from_terms():
+    from sympy import Add, Basic
+    x = Symbol('x')
+    y = Symbol('y')
+    assert Add.from_terms({x: 2, y: 1, Basic.One(): 3}) == 2*x + y + 3
+    assert Add.from_terms({x: 0, y: Rational(1, 2)}) == y/2
+    assert Add.from_terms({x: 0}) == 0
+    assert Add.from_terms({}) == 0
+    assert Add.from_terms({x*y: -1, x: 1}) == x - x*y
+    # keys which are not terms of a sum
+    assert Add.from_terms({2*x: 1, x: 1}) == 3*x
+    assert Add.from_terms({x + 1: 2, Basic.One(): 3}) == 2*x + 5
+    assert Add.from_terms({Rational(2): 3, x: 1}) == x + 6
+    # coefficients of the keys are multiplied out
+    assert Add.from_terms({2*x: 3}) == 6*x
+    assert Add.from_terms({2*x*y: Rational(1, 2), y: 1}) == x*y + y
+    assert Add.from_terms({-x: 3, y: 1}) == y - 3*x
+
+def test_expand_sparse():
+    from sympy import Add, I, abs
+    x = Symbol('x')
+    y = Symbol('y')
+    z = Symbol('z')
+    e = ((x+y)**6).expand()
+    assert isinstance(e, Add) and len(e[:]) == 7
+    assert e == x**6 + 6*x**5*y + 15*x**4*y**2 + 20*x**3*y**3 + \
+                15*x**2*y**4 + 6*x*y**5 + y**6
+    assert ((1+x+y+z)**4).expand().subs_dict({x: 2, y: 3, z: 5}) == 11**4
+    assert len(((1+x+y+z)**4).expand()[:]) == 35
+    assert ((x+1)*(x-1)).expand() == x**2 - 1
+    assert ((x/2+y/3)**2).expand() == x**2/4 + x*y/3 + y**2/9
+    assert ((sqrt(x)+1)**2).expand() == x + 2*sqrt(x) + 1
+    assert ((x+sin(y))**2).expand() == x**2 + 2*x*sin(y) + sin(y)**2
+    # negative powers of sums are kept as they are
+    assert ((x+y)*(x+1/(x+1))).expand() == x**2 + x*y + x/(x+1) + y/(x+1)
+    # expressions the sparse representation does not handle
+    assert ((abs(x)+1)**2).expand() == abs(x)**2 + 2*abs(x) + 1
+    assert ((exp(x)+1)**2).expand() == exp(2*x) + 2*exp(x) + 1
+    assert ((x+I)**2).expand() == x**2 + 2*I*x - 1
+    A = Symbol('A', commutative=False)
+    B = Symbol('B', commutative=False)
+    assert ((A+B)**2).expand() == A**2 + A*B + B*A + B**2
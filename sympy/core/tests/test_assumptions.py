@@ -317,3 +317,23 @@ def test_other_symbol():
     assert x.is_nonpositive == True
 
     py.test.raises(AttributeError, "x.is_real = False")
+
+def test_learned_assumptions():
+    # facts found by _eval_is_* methods imply what assume() implies
+    for k in ['positive', 'negative', 'nonnegative', 'integer', 'real',
+              'zero', 'odd', 'even', 'prime', 'bounded', 'irrational']:
+        for v in [True, False]:
+            x = Symbol('x')
+            y = Symbol('y')
+            x.assume(**{k: v})
+            y._learn_assumption(k, v)
+            assert x._assumptions == y._assumptions
+
+def test_assumption_evaluators():
+    x = Symbol('x', positive=True)
+    assert (x + 1).is_positive == True
+    assert Basic.Add._assume_evaluators['real'][0] is not None
+    assert Basic.Symbol._assume_evaluators['real'][0] is None
+    assert Basic.Symbol._assume_evaluators['negative'][1] == 'nonnegative'
+    assert Integer(3).is_odd == True
+    assert Integer(3).is_even == False
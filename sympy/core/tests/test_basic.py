@@ -66,6 +66,42 @@ def test_atoms():
    assert list(Rational(1,2).atoms()) == [Rational(1,2)]
    assert list(Rational(1,2).atoms(type=type(oo))) == []
 
+def test_atom_set():
+    x = Symbol('x')
+    y = Symbol('y')
+    e = x + y*cos(x) + 2
+    assert e._atom_set() is e._atom_set()
+    assert e._atom_set() == frozenset([x, y, Rational(2)])
+    assert e._symbol_set() == frozenset([x, y])
+    assert Rational(2)._symbol_set() == frozenset()
+    # atoms() returns a fresh set that can be modified
+    a = e.atoms()
+    a.add(Symbol('z'))
+    assert e.atoms() == set([x, y, Rational(2)])
+    assert e.has(x) and not e.has(Symbol('z'))
+    assert Integral(x*y, x)._symbol_set() == frozenset([x, y])
+
+def test_has_class():
+    from sympy import sin, asin, O, Derivative
+    x = Symbol('x')
+    y = Symbol('y')
+    e = x + asin(x)*cos(y)
+    assert e.has(asin) and e.has(cos)
+    assert not e.has(sin)           # asin is not sin
+    assert e.has(Basic.Symbol) and e.has(Basic.Function)
+    assert e._type_set() is e._type_set()
+    assert (x + O(x**2)).has(Basic.Order)
+    assert not (x + y).has(Basic.Order)
+    assert Integral(sin(x), x).has(sin)
+
+def test_hash_ignores_derived_assumptions():
+    x = Symbol('x', positive=True)
+    y = Symbol('y', positive=True)
+    e1 = Basic.__new__(Basic.Add, x, y)
+    e2 = Basic.__new__(Basic.Add, x, y)
+    assert e1.is_positive == True
+    assert hash(e1) == hash(e2)
+
 def test_is_polynomial():
     x, y, z = map(Symbol, 'xyz')
 
@@ -136,6 +172,17 @@ def test_ordering():
     assert str(cc2*Rational(2)*cc1) == '2*CustomClass1()*CustomClass2()'
     assert str(cc1*Rational(2)*cc2) == '2*CustomClass1()*CustomClass2()'
 
+def test_compare_key():
+    x, y = symbols('xy')
+    l = [Rational(1,2), Rational(3), x, y, x**2, x*y, x+y, x**y, cos(x),
+         cos(y), exp(x), y*cos(x), x+cos(y)]
+    for a in l:
+        for b in l:
+            c = a.compare(b)
+            assert c == cmp(a.compare_key(), b.compare_key())
+            assert c == -b.compare(a)
+            assert (c == 0) == (a is b)
+
 def test_len():
     x, y, z = symbols("xyz")
     e = x*y
@@ -161,3 +208,17 @@ def test_is_number():
     assert (8+log(2)).is_number
     assert not (8+log(2)+x).is_number
     assert (1+x**2/x-x).is_number
+
+def test_interning():
+    old = Basic.set_interning(True)
+    try:
+        x = Symbol('x')
+        assert Symbol('x') is x
+        assert Symbol('x', real=True) is not x
+        assert Rational(3, 7) is Rational(6, 14)
+        assert (x+1)**2 is Symbol('x').__add__(1)**2
+        assert cos(x*exp(x)) is cos(Symbol('x')*exp(Symbol('x')))
+        assert Symbol('x', dummy=True) is not Symbol('x', dummy=True)
+    finally:
+        Basic.set_interning(old)
+    assert Symbol('x') is not Symbol('x')
@@ -0,0 +1,77 @@
+from sympy import *
+from sympy.core.cache import LRUCache, CacheManager, cache_manager
+from sympy.core.basic_methods import cache_it_immutable
+
+def test_lru_eviction():
+    c = LRUCache('test', maxsize=2)
+    c[1] = 'a'
+    c[2] = 'b'
+    assert c[1] == 'a'      # 1 is now the most recently used entry
+    c[3] = 'c'
+    assert 2 not in c
+    assert 1 in c and 3 in c
+    assert len(c) == 2
+    info = c.info()
+    assert (info.hits, info.misses, info.evictions) == (1, 0, 1)
+    try:
+        c[2]
+        assert False
+    except KeyError:
+        pass
+    assert c.info().misses == 1
+    # overwriting an entry makes it the most recently used one
+    c[1] = 'A'
+    c[4] = 'd'
+    assert 3 not in c
+    assert c[1] == 'A' and 4 in c
+
+def test_manager_budget():
+    m = CacheManager(maxsize=3)
+    c1 = m.new_cache('c1')
+    c2 = m.new_cache('c2')
+    c1[1] = c1[2] = c1[3] = 0
+    c2[1] = 0
+    assert m.size == 3
+    assert len(c1) == 2 and len(c2) == 1
+    m.set_budget(None, 1)
+    assert len(c1) == 1 and len(c2) == 1
+    m.clear()
+    assert m.size == 0
+    assert len(c1) == 0 and len(c2) == 0
+
+def test_manager_budget_batch():
+    # a fraction of the budget is freed at once from the largest cache
+    m = CacheManager(maxsize=640)
+    c1 = m.new_cache('c1')
+    c2 = m.new_cache('c2')
+    for i in range(600):
+        c1[i] = 0
+    for i in range(40):
+        c2[i] = 0
+    assert m.size == 640
+    c2[40] = 0
+    assert m.size == 630
+    assert len(c1) == 589 and len(c2) == 41
+    assert 10 not in c1 and 11 in c1
+
+def test_cache_it_bounded():
+    calls = []
+    def f(x):
+        calls.append(x)
+        return x
+    f = cache_it_immutable(f)
+    f._cache_it_cache.resize(2)
+    f(1); f(2); f(1)
+    assert calls == [1, 2]
+    f(3); f(2)
+    assert calls == [1, 2, 3, 2]
+    assert f._cache_it_cache.info().evictions == 2
+    assert f._cache_it_cache in cache_manager.caches
+
+def test_clear_cache():
+    x = Symbol('x')
+    e = (x+1)**2
+    clear_cache()
+    assert cache_manager.size == 0
+    assert (x+1)**2 == e
+    assert cache_manager.size > 0
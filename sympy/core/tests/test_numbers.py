@@ -173,3 +173,44 @@ def test_pi_Pi():
     "Test, that pi (instance) is imported, but Pi (class) is not"
     from sympy import pi
     py.test.raises(ImportError, "from sympy import Pi")
+
+def test_number_pools():
+    from sympy import Integer
+    assert Integer(7) is Integer(7)
+    assert Rational(7) is Integer(7)
+    assert Rational(2, 6) is Rational(1, 3)
+    assert Rational(-3, 6) is Rational(1, -2)
+    from sympy.core.cache import clear_cache
+    clear_cache()
+    assert Rational(1, -2) is Rational(-1, 2)
+    assert Rational(-2, -4) is Rational(1, 2)
+    assert Rational(2, 4) is Rational(1, 2)
+    assert isinstance(Rational(4, 2), Integer)
+
+def test_half_singleton():
+    from sympy.core.basic import S
+    from sympy.core.cache import clear_cache
+    from sympy.core.numbers import _rational_pool
+    # the arithmetic fast paths must not pool another instance of 1/2,
+    # whichever creates it first
+    clear_cache()
+    _rational_pool.pop((1, 2), None)
+    assert -Rational(-1, 2) is S.Half
+    assert Rational(1, 6) + Rational(1, 3) is S.Half
+    assert Rational(3, 2) * Rational(1, 3) is S.Half
+    assert Rational(1, 2) is S.Half
+    assert Rational(2, 4) is S.Half
+
+def test_rational_arithmetic_fast_paths():
+    from sympy import Integer
+    assert Rational(2, 3) + 1 == Rational(5, 3)
+    assert 1 + Rational(2, 3) == Rational(5, 3)
+    assert Integer(2) + Integer(3) == 5
+    assert Rational(1, 6) + Rational(1, 3) == Rational(1, 2)
+    assert Rational(2, 3) * Rational(9, 4) == Rational(3, 2)
+    assert Rational(-3, 7) * Rational(-7, 3) == 1
+    assert Rational(10**30, 7) * Rational(21, 10**29) == 30
+    assert Rational(2, 3) * 0 == 0
+    assert -Rational(5, 10**6) == Rational(-1, 200000)
+    assert (oo + 1, oo * 2, -oo) == (oo, oo, Rational(-1, 0))
+    assert Rational(1, 2) * oo == oo
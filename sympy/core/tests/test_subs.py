@@ -77,3 +77,39 @@ def test_deriv_sub_bug3():
     pat = Derivative(f(x), x, x)
     assert pat.subs(y, y**2) == Derivative(f(x), x, x)
     assert pat.subs(y, y**2) != Derivative(f(x), x)
+
+def test_xreplace():
+    x = Symbol('x')
+    y = Symbol('y')
+    z = Symbol('z')
+    e = sin(x)**2 + x*y + exp(y)*z
+    # simultaneous: x -> y does not make the new y subject to y -> z
+    assert e.xreplace({x: y, y: z}) == sin(y)**2 + y*z + exp(z)*z
+    assert e.xreplace({x: 2, y: 3, z: 0}) == sin(2)**2 + 6
+    # unchanged subtrees are reused
+    assert e.xreplace({Symbol('t'): 1}) is e
+    s = sin(y)*exp(y)
+    assert [a for a in (x + s).xreplace({x: z})[:] if a is s]
+    # only exact occurrences are replaced
+    assert (x*y*z).xreplace({x*y: 2}) == x*y*z
+    assert (x*y*z).subs(x*y, 2) == 2*z
+    assert (x + sin(x*y)).xreplace({x*y: z}) == x + sin(z)
+
+def test_subs_dict_simultaneous():
+    x = Symbol('x')
+    y = Symbol('y')
+    e = x**2 + 2*y
+    assert e.subs_dict({x: y, y: x}) == y**2 + 2*x
+    assert e.subs_dict({x: 1, y: 2}) == 5
+    assert e.subs_dict({x**2: y}) == 3*y
+
+def test_xreplace_order():
+    x = Symbol('x')
+    y = Symbol('y')
+    # Order is not rebuilt from its arguments, but the swap is still
+    # simultaneous
+    assert g.Order(x*y**2).xreplace({x: y, y: x}) == g.Order(y*x**2)
+    assert (x + g.Order(x**2*y)).xreplace({x: y, y: x}) \
+           == y + g.Order(y**2*x)
+    assert (x + g.Order(x**2*y)).subs_dict({x: y, y: x}) \
+           == y + g.Order(y**2*x)
@@ -0,0 +1,90 @@
+"""
+Adaptive refinement of the samples of plot modes.
+
+Starting from the uniform samples of a PlotInterval, the segments
+between neighbouring samples are subdivided where the vertices
+deviate most from a straight line, i.e. where linear interpolation
+between the samples (which is what gets drawn) is worst. The error
+at a sample is the distance of its vertex from the chord between
+the vertices of its two neighbours; a segment takes the larger
+error of its two ends. Segments next to an invalid vertex (a
+discontinuity or a hole in the domain) are refined as well.
+
+The error tolerance is relative to the size of the plot (the
+largest extent of its bounds), so it approximates an error in
+screen space. The modes refine in rounds, splitting every segment
+above the tolerance until the evaluation budget is used up.
+"""
+
+# error of segments between a valid and an invalid vertex
+invalid_error = 1e300
+
+def plot_scale(bounds):
+    """
+    Largest extent of the (unfinished) bounds of a plot,
+    or 1.0 if no extent is known.
+    """
+    scale = 0.0
+    for b_min, b_max in [b[:2] for b in bounds]:
+        try: d = float(b_max - b_min)
+        except (TypeError, ValueError): continue
+        if scale < d < invalid_error:
+            scale = d
+    if scale == 0.0:
+        return 1.0
+    return scale
+
+def vertex_error(t0, t1, t2, p0, p1, p2):
+    """
+    Distance of p1, the vertex at t1, from the point at t1
+    on the chord from p0 (at t0) to p2 (at t2).
+    """
+    w = (t1 - t0) / (t2 - t0)
+    d = 0.0
+    for axis in xrange(3):
+        e = p1[axis] - (p0[axis] + w * (p2[axis] - p0[axis]))
+        d += e * e
+    return d ** 0.5
+
+def segment_errors(t_set, lines):
+    """
+    Errors of the segments between consecutive samples of
+    t_set. lines is a list of sequences of vertices (or None)
+    sampled at t_set; the error of a segment is the largest
+    error of its ends on any line, or invalid_error if only
+    one of its ends is valid on some line.
+    """
+    n = len(t_set)
+    point_errors = [0.0] * n
+    for line in lines:
+        for i in xrange(1, n-1):
+            p0, p1, p2 = line[i-1], line[i], line[i+1]
+            if p0 is None or p1 is None or p2 is None:
+                continue
+            e = vertex_error(t_set[i-1], t_set[i], t_set[i+1], p0, p1, p2)
+            if e > point_errors[i]:
+                point_errors[i] = e
+    errors = [max([point_errors[i], point_errors[i+1]]) for i in xrange(n-1)]
+    for line in lines:
+        for i in xrange(n-1):
+            if (line[i] is None) != (line[i+1] is None):
+                errors[i] = invalid_error
+    return errors
+
+def select_segments(t_set, errors, tolerance, min_width, count):
+    """
+    Returns the indices of at most count segments with the
+    largest errors above tolerance which are wider than
+    min_width, in descending order (so that the samples can
+    be inserted from the back without shifting the others).
+    """
+    candidates = []
+    for i in xrange(len(errors)):
+        if errors[i] > tolerance and t_set[i+1] - t_set[i] > min_width:
+            candidates.append((errors[i], i))
+    candidates.sort()
+    candidates.reverse()
+    split = [i for e, i in candidates[:max([count, 0])]]
+    split.sort()
+    split.reverse()
+    return split
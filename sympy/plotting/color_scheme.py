@@ -1,4 +1,5 @@
 from sympy import Basic, Symbol, symbols, lambdify
+from sympy.utilities.lambdify import function_source
 from util import interpolate, rinterpolate, interpolate_color, create_bounds, update_bounds
 
 class ColorGradient(object):
@@ -43,6 +44,7 @@ class ColorScheme(object):
     def __init__(self, *args, **kwargs):
         self.args = args
         self.f, self.gradient = None, ColorGradient()
+        self._f_exprs = None
 
         if len(args) == 1 and not isinstance(args[0],Basic) and callable(args[0]):
             self.f = args[0]
@@ -50,6 +52,7 @@ class ColorScheme(object):
             if args[0] in default_color_schemes:
                 cs = default_color_schemes[args[0]]
                 self.f, self.gradient = cs.f, cs.gradient.copy()
+                self._f_exprs = cs._f_exprs
             else:
                 self.f = lambdify(args[0], 'x,y,z,u,v')
         else:
@@ -77,11 +80,13 @@ class ColorScheme(object):
             fv = atoms[0]
             try: f = lambdify([fv,fv,fv], s)
             except: raise f_error
+            self._f_exprs = [fv,fv,fv], s
 
         elif len(atoms) == 3:
             fr, fg, fb = atoms
             try: f = lambdify([fr,fg,fb], s)
             except: raise f_error
+            self._f_exprs = [fr,fg,fb], s
 
         else: raise ValueError("A ColorScheme must provide 1 or 3 "
                                "functions in x, y, z, u, and/or v.")
@@ -200,17 +205,29 @@ class ColorScheme(object):
         except Exception, ie:
             pass # color function probably not valid at 0,0,0,0,0
 
+    def function_source(self):
+        """
+        Returns (source, namespace) of the compiled color
+        function (see sympy.utilities.lambdify.function_source),
+        or None if it is not given by expressions.
+        """
+        if self._f_exprs is None: return None
+        try: return function_source(*self._f_exprs)
+        except ValueError: return None
+
     def __call__(self, x,y,z,u,v):
         try:    return self.f(x,y,z,u,v)
         except Exception, e:
             #print e
             return None
 
-    def apply_to_curve(self, verts, u_set, set_len=None, inc_pos=None):
+    def apply_to_curve(self, verts, u_set, set_len=None, inc_pos=None, colors=None):
         """
         Apply this color scheme to a
         set of vertices over a single
-        independent variable u.
+        independent variable u. colors
+        may hold the already calculated
+        values of the color function.
         """
         bounds = create_bounds()
         cverts = list()
@@ -221,9 +238,12 @@ class ColorScheme(object):
             if verts[_u] is None:
                 cverts.append(None)
             else:
-                x,y,z = verts[_u]
-                u,v = u_set[_u], None
-                c = self(x,y,z,u,v)
+                if colors is not None:
+                    c = colors[_u]
+                else:
+                    x,y,z = verts[_u]
+                    u,v = u_set[_u], None
+                    c = self(x,y,z,u,v)
                 if c is not None:
                     c = list(c)
                     update_bounds(bounds, c)
@@ -240,11 +260,14 @@ class ColorScheme(object):
             if callable(inc_pos): inc_pos()
         return cverts
 
-    def apply_to_surface(self, verts, u_set, v_set, set_len=None, inc_pos=None):
+    def apply_to_surface(self, verts, u_set, v_set, set_len=None, inc_pos=None, colors=None):
         """
         Apply this color scheme to a
         set of vertices over two
         independent variables u and v.
+        colors may hold the already
+        calculated values of the color
+        function.
         """
         bounds = create_bounds()
         cverts = list()
@@ -257,9 +280,12 @@ class ColorScheme(object):
                 if verts[_u][_v] is None:
                     column.append(None)
                 else:
-                    x,y,z = verts[_u][_v]
-                    u,v = u_set[_u], v_set[_v]
-                    c = self(x,y,z,u,v)
+                    if colors is not None:
+                        c = colors[_u][_v]
+                    else:
+                        x,y,z = verts[_u][_v]
+                        u,v = u_set[_u], v_set[_v]
+                        c = self(x,y,z,u,v)
                     if c is not None:
                         c = list(c)
                         update_bounds(bounds, c)
@@ -0,0 +1,50 @@
+"""
+Evaluation of compiled plot functions in several processes.
+
+The functions are sent to the worker processes as source code
+and namespace (see sympy.utilities.lambdify.function_source),
+since compiled functions cannot be pickled. The points are split
+into tiles which are evaluated in a shared pool of processes; the
+results of each tile are returned as soon as it is completed.
+The pool is the one of sympy.utilities.parallel.
+"""
+
+from sympy.utilities.parallel import available, get_pool
+
+def tile_length(n, processes):
+    """
+    Number of consecutive items of n per tile, so that there
+    are a few tiles per process.
+    """
+    return max([1, n // (4*processes)])
+
+# functions compiled in a worker process, by source
+_functions = {}
+
+def _evaluate_tile(task):
+    source, namespace, start, points = task
+    f = _functions.get(source)
+    if f is None:
+        namespace = dict(namespace)
+        exec source in namespace
+        f = _functions[source] = namespace['f']
+    values = []
+    for p in points:
+        try: v = f(*p)
+        except: v = None
+        values.append(v)
+    return start, values
+
+def evaluate_tiles(function_source, points, processes, tile_size):
+    """
+    Evaluates the function given by function_source, a pair
+    (source, namespace), at all points (a list of argument
+    tuples). Yields pairs (start, values) for the tiles of
+    tile_size consecutive points in the order in which they
+    are completed, with None for the points where the
+    evaluation failed.
+    """
+    source, namespace = function_source
+    tasks = [(source, namespace, i, points[i:i+tile_size])
+             for i in xrange(0, len(points), tile_size)]
+    return get_pool(processes).imap_unordered(_evaluate_tile, tasks)
@@ -254,6 +254,14 @@ class Plot(object):
         """
         self._screenshot.save(outfile, format, size)
 
+    def export(self, outfile, format=None, **kwargs):
+        """
+        Writes the plot to an svg, png or obj file without
+        using a window. See plot_export.export().
+        """
+        from plot_export import export
+        export(self, outfile, format, **kwargs)
+
     ## Function List Interfaces
 
     def clear(self):
@@ -1,7 +1,8 @@
 from pyglet.gl import *
-from plot_mode_base import PlotModeBase
+from plot_mode_base import PlotModeBase, numpy
 from sympy.core.basic import S
-from util import scale_value, scale_value_list
+from util import scale_value, scale_value_list, update_bounds_all, finish_bounds
+from vertex_buffer import curve_buffer, curve_colors
 #from time import sleep
 
 class PlotCurve(PlotModeBase):
@@ -12,35 +13,96 @@ class PlotCurve(PlotModeBase):
         self.t_interval = self.intervals[0]
         self.t_set = list(self.t_interval.frange())
         self.bounds = [ [S.Infinity,-S.Infinity,0],[S.Infinity,-S.Infinity,0],[S.Infinity,-S.Infinity,0] ]
-        evaluate = self._get_evaluator()
 
         self._calculating_verts_pos = 0.0
         self._calculating_verts_len = float(self.t_interval.v_len)
 
-        self.verts = list()
-        b = self.bounds
-        for t in self.t_set:
-            try: _e = evaluate(t)   # calculate vertex
-            except: _e = None
-            if _e is not None: # update bounding box
-                for axis in xrange(3):
-                    b[axis][0] = min([b[axis][0], _e[axis]])
-                    b[axis][1] = max([b[axis][1], _e[axis]])
-            self.verts.append(_e)
-            self._calculating_verts_pos += 1.0
+        source = self._get_vertex_source()
+        evaluate = self._get_batch_evaluator()
+        if source is not None:
+            self.verts = self._calculate_verts_parallel(source)
+        elif evaluate is not None:
+            verts, valid = self._calculate_verts_batch(evaluate,
+                                                       numpy.array(self.t_set))
+            self.verts = verts.tolist()
+            for i in numpy.nonzero(~valid)[0]:
+                self.verts[i] = None
+            self._calculating_verts_pos = self._calculating_verts_len
+        else:
+            evaluate = self._get_evaluator()
+            self.verts = list()
+            for t in self.t_set:
+                try: _e = evaluate(t)   # calculate vertex
+                except: _e = None
+                self.verts.append(_e)
+                self._calculating_verts_pos += 1.0
+            update_bounds_all(self.bounds, self.verts)
+        if self.adaptive is not None:
+            self.t_set, self.verts = self._refine_verts()
+        finish_bounds(self.bounds)
 
-        for axis in xrange(3):
-            b[axis][2] = b[axis][1] - b[axis][0]
-            if b[axis][2] == 0.0: b[axis][2] = 1.0
+        self._push_verts(self.verts)
 
+    def _push_verts(self, verts):
+        self._buffer = curve_buffer(verts)
         self.push_wireframe(self.draw_verts(False))
 
+    def _refine_verts(self):
+        """
+        Returns refined copies of t_set and verts.
+        """
+        evaluate = self._get_evaluator()
+        min_width = self.t_interval.fstep() / 2**self.max_refinement_depth
+        t_set, verts = list(self.t_set), list(self.verts)
+        budget = self.adaptive - len(t_set)
+        def insert(i, t):
+            try: _e = evaluate(t)
+            except: _e = None
+            verts.insert(i, _e)
+            update_bounds_all(self.bounds, [_e])
+        while budget > 0:
+            n = self._refine_samples(t_set, [verts], min_width, budget, insert)
+            if n == 0: break
+            budget -= n
+        self._calculating_verts_pos = self._calculating_verts_len = float(len(t_set))
+        return t_set, verts
+
+    def _calculate_verts_parallel(self, source):
+        verts = [None]*len(self.t_set)
+        points = [(t,) for t in self.t_set]
+        def store(start, values):
+            verts[start:start+len(values)] = values
+            update_bounds_all(self.bounds, values)
+            self._calculating_verts_pos += len(values)
+        self._evaluate_tiles(source, points, store,
+                             lambda: self._push_verts(verts))
+        return verts
+
+    def _calculate_colors_parallel(self, source):
+        points, positions = [], []
+        for i in xrange(len(self.t_set)):
+            p = self.verts[i]
+            if p is not None:
+                points.append((p[0], p[1], p[2], self.t_set[i], None))
+                positions.append(i)
+        colors = [None]*len(self.t_set)
+        def store(start, values):
+            for i, c in zip(positions[start:start+len(values)], values):
+                colors[i] = c
+        self._evaluate_tiles(source, points, store)
+        return colors
+
     def _on_calculate_cverts(self):
         if not self.verts or not self.color: return
         def set_work_len(n): self._calculating_cverts_len = float(n)
         def inc_work_pos(): self._calculating_cverts_pos += 1.0
         set_work_len(1); self._calculating_cverts_pos = 0
-        self.cverts = self.color.apply_to_curve(self.verts, self.t_set, set_len=set_work_len, inc_pos=inc_work_pos)
+        source = self._get_color_source()
+        colors = None
+        if source is not None:
+            colors = self._calculate_colors_parallel(source)
+        self.cverts = self.color.apply_to_curve(self.verts, self.t_set, set_len=set_work_len, inc_pos=inc_work_pos,
+                                                colors=colors)
         self.push_wireframe(self.draw_verts(True))
 
     def calculate_one_cvert(self, t):
@@ -49,19 +111,12 @@ class PlotCurve(PlotModeBase):
                           self.t_set[t], None)
 
     def draw_verts(self, use_cverts):
-        def f():
-            glBegin(GL_LINE_STRIP)
-            for t in xrange( len(self.t_set) ):
-                p = self.verts[t]
-                if p is None:
-                    glEnd()
-                    glBegin(GL_LINE_STRIP)
-                    continue
-                if use_cverts:
-                    c = self.cverts[t]
-                    if c is None: c = (0, 0, 0)
-                    glColor3f(*c)
-                else: glColor3f(*self.default_wireframe_color)
-                glVertex3f(*p)
-            glEnd()
-        return f
+        colors = None
+        if use_cverts:
+            colors = curve_colors(self.verts, self.cverts)
+            # the colors may not be calculated yet for the current vertices
+            if len(colors) != 3*len(self._buffer):
+                colors = None
+        if colors is None:
+            colors = self.default_wireframe_color
+        return self._buffer.draw_function(colors)
@@ -0,0 +1,511 @@
+"""
+Headless export of plots to SVG, PNG and OBJ files.
+
+The vertices and colors of the plot modes, as packed into their
+VertexBuffers (see vertex_buffer.py), are written without opening
+a window or creating an OpenGL context:
+
+svg
+    A polyline per run of equally colored curve segments and a
+    polygon per surface quad, quads in back to front order.
+png
+    Rendered by a small software rasterizer with a depth buffer
+    and encoded with the pure Python PNG writer bundled with
+    pyglet.
+obj
+    A Wavefront mesh of the model coordinates with vertex colors,
+    lines for curves and faces for surfaces.
+
+The files are written while they are produced, so the memory needed
+is that of the plot's own vertex data and, for png, of the image and
+its depth buffer. export_plots() calculates and exports a sequence of
+plots one at a time, so that memory stays bounded however long the
+sequence is.
+"""
+
+from pyglet.gl import GL_LINES
+from pyglet.image.codecs.pypng import Writer
+from plot_mode import PlotMode
+import plot_modes
+from plot_camera import PlotCamera
+from vertex_buffer import curve_colors, surface_colors
+from array import array
+from math import sin, cos, pi
+
+formats = ['svg', 'png', 'obj']
+
+def calculate_mode(*args, **kwargs):
+    """
+    Returns the plot mode for args (the arguments of one function
+    of a Plot) with its vertices and colors calculated in this
+    thread.
+    """
+    kwargs['background'] = False
+    return PlotMode(*args, **kwargs)
+
+def _get_modes(plot):
+    # the modes of a Plot, a plot mode or a list of plot modes,
+    # once their calculations have finished
+    if isinstance(plot, PlotMode):
+        modes = [plot]
+    elif isinstance(plot, (list, tuple)):
+        modes = list(plot)
+    else:
+        keys = plot._functions.keys()
+        keys.sort()
+        modes = [plot[i] for i in keys]
+    for m in modes:
+        m.wait_for_calculations()
+    return modes
+
+def _mode_layers(mode):
+    """
+    Returns (kind, buffer, colors, outline) for mode, where kind is
+    'lines' or 'quads', colors is an array('f') with a color for
+    each vertex of the buffer, a single color or None (quads which
+    are not filled), and outline is the color of quad edges or None.
+    """
+    b = getattr(mode, '_buffer', None)
+    if b is None:
+        return None
+    if b.primitive == GL_LINES:
+        colors = None
+        if mode.cverts:
+            colors = curve_colors(mode.verts, mode.cverts)
+        if colors is None or len(colors) != 3*len(b):
+            colors = mode.default_wireframe_color
+        return 'lines', b, colors, None
+    if mode.style_override:
+        style = mode.styles[mode.style_override]
+    else:
+        style = mode.styles[mode.style]
+    colors, outline = None, None
+    if style & 2:
+        if mode.cverts:
+            colors = surface_colors(mode.verts, mode.cverts)
+        if colors is None or len(colors) != 3*len(b):
+            colors = mode.default_solid_color
+    if style & 1:
+        outline = mode.default_wireframe_color
+    return 'quads', b, colors, outline
+
+def _vertex_color(colors, i):
+    if isinstance(colors, array):
+        return colors[3*i:3*i+3]
+    return colors
+
+def _mean_color(colors, indices):
+    if not isinstance(colors, array):
+        return colors
+    c = [0.0, 0.0, 0.0]
+    for i in indices:
+        for k in xrange(3):
+            c[k] += colors[3*i+k]
+    return [v / len(indices) for v in c]
+
+def rgb8(color):
+    """
+    Converts a color with components from 0 to 1 to integers
+    from 0 to 255.
+    """
+    return tuple([int(min([max([c, 0.0]), 1.0])*255.0 + 0.5) for c in color[:3]])
+
+def hex_color(color):
+    return '#%02x%02x%02x' % rgb8(color)
+
+def plot_bounds(modes):
+    """
+    The union of the finite bounds of modes, as a list of
+    [min, max] for each axis.
+    """
+    bounds = [[None, None], [None, None], [None, None]]
+    for m in modes:
+        for axis in xrange(3):
+            try:
+                lo, hi = float(m.bounds[axis][0]), float(m.bounds[axis][1])
+            except (TypeError, ValueError, AttributeError):
+                continue
+            if not (-1e300 < lo <= hi < 1e300):
+                continue
+            if bounds[axis][0] is None or lo < bounds[axis][0]:
+                bounds[axis][0] = lo
+            if bounds[axis][1] is None or hi > bounds[axis][1]:
+                bounds[axis][1] = hi
+    for b in bounds:
+        if b[0] is None:
+            b[0], b[1] = 0.0, 0.0
+    return bounds
+
+def _axis_rotation(angle, axis):
+    a = angle * pi / 180.0
+    c, s = cos(a), sin(a)
+    if axis == 0:
+        return [[1.0, 0.0, 0.0], [0.0, c, -s], [0.0, s, c]]
+    if axis == 1:
+        return [[c, 0.0, s], [0.0, 1.0, 0.0], [-s, 0.0, c]]
+    return [[c, -s, 0.0], [s, c, 0.0], [0.0, 0.0, 1.0]]
+
+def rotation_matrix(preset):
+    """
+    The rotation of the model for a camera preset name or a tuple
+    of angles in degrees about the x, y and z axes, composed like
+    PlotCamera.set_rot_preset() does.
+    """
+    if isinstance(preset, str):
+        try: preset = PlotCamera.rot_presets[preset]
+        except KeyError:
+            raise ValueError("%s is not a valid rotation preset." % preset)
+    m = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
+    for axis in xrange(3):
+        r = _axis_rotation(preset[axis], axis)
+        m = [[sum([m[i][k]*r[k][j] for k in xrange(3)]) for j in xrange(3)]
+             for i in xrange(3)]
+    return m
+
+class Projection(object):
+    """
+    Orthographic projection of model coordinates to image
+    coordinates: x to the right, y down and the depth towards
+    the viewer, all in pixels. The rotated bounds are fitted
+    into the image with the same scale in both directions.
+    """
+
+    def __init__(self, bounds, size, preset='xy', margin=0.05):
+        self.width, self.height = size
+        self.rotation = rotation_matrix(preset)
+        corners = [self.rotate((x, y, z)) for x in bounds[0]
+                   for y in bounds[1] for z in bounds[2]]
+        lo = [min([c[i] for c in corners]) for i in xrange(3)]
+        hi = [max([c[i] for c in corners]) for i in xrange(3)]
+        self.center = [(lo[i] + hi[i]) / 2.0 for i in xrange(3)]
+        scales = []
+        if hi[0] > lo[0]:
+            scales.append(self.width * (1.0 - 2*margin) / (hi[0] - lo[0]))
+        if hi[1] > lo[1]:
+            scales.append(self.height * (1.0 - 2*margin) / (hi[1] - lo[1]))
+        if scales:
+            self.scale = min(scales)
+        else:
+            self.scale = 1.0
+
+    def rotate(self, p):
+        m = self.rotation
+        return [m[i][0]*p[0] + m[i][1]*p[1] + m[i][2]*p[2] for i in xrange(3)]
+
+    def __call__(self, p):
+        x, y, z = self.rotate(p)
+        s, c = self.scale, self.center
+        return (self.width / 2.0 + (x - c[0]) * s,
+                self.height / 2.0 - (y - c[1]) * s,
+                (z - c[2]) * s)
+
+    def project_buffer(self, b):
+        """
+        Returns the projections of the vertices of the
+        VertexBuffer b.
+        """
+        v = b.vertices
+        return [self((v[i], v[i+1], v[i+2])) for i in xrange(0, len(v), 3)]
+
+def _svg_lines(write, points, indices, colors):
+    def flush(run, color):
+        if len(run) > 1:
+            write('<polyline fill="none" stroke="%s" points="%s"/>\n' %
+                  (color, ' '.join(['%.2f,%.2f' % p[:2] for p in run])))
+    run, color, last = [], None, None
+    for k in xrange(0, len(indices), 2):
+        a, b = indices[k], indices[k+1]
+        c = hex_color(_vertex_color(colors, a))
+        if a != last or c != color:
+            flush(run, color)
+            run, color = [points[a]], c
+        run.append(points[b])
+        last = b
+    flush(run, color)
+
+def _svg_quads(write, points, indices, colors, outline):
+    order = []
+    for k in xrange(0, len(indices), 4):
+        depth = 0.0
+        for i in indices[k:k+4]:
+            depth += points[i][2]
+        order.append((depth, k))
+    order.sort()
+    for depth, k in order:
+        q = indices[k:k+4]
+        coords = ' '.join(['%.2f,%.2f' % points[i][:2] for i in q])
+        if colors is None:
+            write('<polygon points="%s" fill="none" stroke="%s"/>\n' %
+                  (coords, hex_color(outline)))
+        elif outline is None:
+            fill = hex_color(_mean_color(colors, q))
+            write('<polygon points="%s" fill="%s" stroke="%s" stroke-width="0.5"/>\n' %
+                  (coords, fill, fill))
+        else:
+            write('<polygon points="%s" fill="%s" stroke="%s"/>\n' %
+                  (coords, hex_color(_mean_color(colors, q)), hex_color(outline)))
+
+def write_svg(modes, outfile, size=(600, 500), preset=None, background=(1.0, 1.0, 1.0)):
+    """
+    Writes the calculated modes to the file object outfile as
+    an SVG image.
+    """
+    layers = [l for l in [_mode_layers(m) for m in modes] if l is not None]
+    projection = _projection(modes, size, preset)
+    w, h = size
+    write = outfile.write
+    write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    write('<svg xmlns="http://www.w3.org/2000/svg" version="1.1" '
+          'width="%i" height="%i" viewBox="0 0 %i %i">\n' % (w, h, w, h))
+    write('<rect width="100%%" height="100%%" fill="%s"/>\n' % hex_color(background))
+    for kind, b, colors, outline in layers:
+        points = projection.project_buffer(b)
+        if kind == 'lines':
+            _svg_lines(write, points, b.indices, colors)
+        else:
+            _svg_quads(write, points, b.indices, colors, outline)
+    write('</svg>\n')
+
+def _clip_line(p0, p1, width, height):
+    # clips the segment p0-p1 to the image (Liang-Barsky),
+    # returns the parameters (t0, t1) of the visible part or None
+    x0, y0 = p0[0], p0[1]
+    dx, dy = p1[0] - x0, p1[1] - y0
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, x0), (dx, width - 1e-6 - x0),
+                 (-dy, y0), (dy, height - 1e-6 - y0)):
+        if p == 0:
+            if q < 0:
+                return None
+            continue
+        t = q / p
+        if p < 0:
+            if t > t1: return None
+            if t > t0: t0 = t
+        else:
+            if t < t0: return None
+            if t < t1: t1 = t
+    return t0, t1
+
+class Raster(object):
+    """
+    An RGB image with a depth buffer, into which lines and flat
+    shaded triangles given in image coordinates (see Projection)
+    are rendered.
+    """
+
+    def __init__(self, size, background=(1.0, 1.0, 1.0)):
+        self.width, self.height = size
+        n = self.width * self.height
+        self.pixels = array('B', rgb8(background)) * n
+        self.depth = array('d', [-1e300]) * n
+
+    def line(self, p0, p1, c0, c1, bias=0.0):
+        """
+        Draws the line from p0 to p1 with colors interpolated
+        from c0 to c1 (rgb8 colors). bias is added to the depth.
+        """
+        for v in p0 + p1:
+            if not (-1e15 < v < 1e15):
+                return
+        clip = _clip_line(p0, p1, self.width, self.height)
+        if clip is None:
+            return
+        a, b = clip
+        d = [p1[i] - p0[i] for i in xrange(3)]
+        q0 = [p0[i] + a*d[i] for i in xrange(3)]
+        q1 = [p0[i] + b*d[i] for i in xrange(3)]
+        n = int(max([abs(q1[0] - q0[0]), abs(q1[1] - q0[1])])) + 1
+        w, pixels, depth = self.width, self.pixels, self.depth
+        for k in xrange(n + 1):
+            t = float(k) / n
+            x = int(q0[0] + t*(q1[0] - q0[0]))
+            y = int(q0[1] + t*(q1[1] - q0[1]))
+            z = q0[2] + t*(q1[2] - q0[2]) + bias
+            i = y*w + x
+            if z >= depth[i]:
+                depth[i] = z
+                s = a + t*(b - a)
+                pixels[3*i] = int(c0[0] + s*(c1[0] - c0[0]))
+                pixels[3*i+1] = int(c0[1] + s*(c1[1] - c0[1]))
+                pixels[3*i+2] = int(c0[2] + s*(c1[2] - c0[2]))
+
+    def triangle(self, p0, p1, p2, color):
+        """
+        Fills the triangle p0, p1, p2 with color (an rgb8 color),
+        testing the pixel centers.
+        """
+        (x0, y0, z0), (x1, y1, z1), (x2, y2, z2) = p0, p1, p2
+        area = (x1 - x0)*(y2 - y0) - (x2 - x0)*(y1 - y0)
+        if area == 0 or not (-1e15 < area < 1e15):
+            return
+        w, h = self.width, self.height
+        x_min = max([int(min([x0, x1, x2])), 0])
+        x_max = min([int(max([x0, x1, x2])), w - 1])
+        y_min = max([int(min([y0, y1, y2])), 0])
+        y_max = min([int(max([y0, y1, y2])), h - 1])
+        r, g, b = color
+        pixels, depth = self.pixels, self.depth
+        eps = -1e-9
+        for y in xrange(y_min, y_max + 1):
+            py = y + 0.5
+            for x in xrange(x_min, x_max + 1):
+                px = x + 0.5
+                w0 = ((x1 - px)*(y2 - py) - (x2 - px)*(y1 - py)) / area
+                if w0 < eps: continue
+                w1 = ((x2 - px)*(y0 - py) - (x0 - px)*(y2 - py)) / area
+                if w1 < eps: continue
+                w2 = 1.0 - w0 - w1
+                if w2 < eps: continue
+                z = w0*z0 + w1*z1 + w2*z2
+                i = y*w + x
+                if z >= depth[i]:
+                    depth[i] = z
+                    pixels[3*i] = r
+                    pixels[3*i+1] = g
+                    pixels[3*i+2] = b
+
+    def scanlines(self):
+        row = 3 * self.width
+        for y in xrange(self.height):
+            yield self.pixels[y*row:(y+1)*row]
+
+    def write_png(self, outfile):
+        Writer(self.width, self.height).write(outfile, self.scanlines())
+
+# depth added to quad edges, so that they are drawn on top of
+# their faces (like glPolygonOffset in the plot window)
+outline_bias = 1.0
+
+def write_png(modes, outfile, size=(600, 500), preset=None, background=(1.0, 1.0, 1.0)):
+    """
+    Renders the calculated modes and writes the image to the
+    file object outfile as PNG.
+    """
+    layers = [l for l in [_mode_layers(m) for m in modes] if l is not None]
+    projection = _projection(modes, size, preset)
+    raster = Raster(size, background)
+    for kind, b, colors, outline in layers:
+        points = projection.project_buffer(b)
+        indices = b.indices
+        if kind == 'lines':
+            for k in xrange(0, len(indices), 2):
+                a, c = indices[k], indices[k+1]
+                raster.line(points[a], points[c],
+                            rgb8(_vertex_color(colors, a)),
+                            rgb8(_vertex_color(colors, c)))
+            continue
+        for k in xrange(0, len(indices), 4):
+            q = indices[k:k+4]
+            p = [points[i] for i in q]
+            if colors is not None:
+                color = rgb8(_mean_color(colors, q))
+                raster.triangle(p[0], p[1], p[2], color)
+                raster.triangle(p[0], p[2], p[3], color)
+            if outline is not None:
+                c = rgb8(outline)
+                for e in xrange(4):
+                    raster.line(p[e], p[(e+1) % 4], c, c, outline_bias)
+    raster.write_png(outfile)
+
+def write_obj(modes, outfile):
+    """
+    Writes the vertices and elements of the calculated modes to
+    the file object outfile as a Wavefront OBJ mesh, one object
+    per mode. Vertex colors follow the coordinates.
+    """
+    write = outfile.write
+    write('# plot exported by sympy\n')
+    offset = 1
+    for n in xrange(len(modes)):
+        layer = _mode_layers(modes[n])
+        if layer is None:
+            continue
+        kind, b, colors, outline = layer
+        write('o plot%i\n' % n)
+        v = b.vertices
+        for i in xrange(len(b)):
+            coords = ' '.join(['%.7g' % c for c in v[3*i:3*i+3]])
+            if isinstance(colors, array):
+                coords += ' ' + ' '.join(['%.4g' % c for c in colors[3*i:3*i+3]])
+            write('v %s\n' % coords)
+        if kind == 'lines':
+            tag, step = 'l', 2
+        else:
+            tag, step = 'f', 4
+        indices = b.indices
+        for k in xrange(0, len(indices), step):
+            write('%s %s\n' % (tag, ' '.join([str(i + offset) for i in indices[k:k+step]])))
+        offset += len(b)
+
+def _projection(modes, size, preset):
+    if preset is None:
+        preset = 'xy'
+        if modes:
+            preset = modes[0].default_rot_preset
+    return Projection(plot_bounds(modes), size, preset)
+
+def export(plot, outfile, format=None, size=(600, 500), preset=None,
+           background=(1.0, 1.0, 1.0)):
+    """
+    Writes plot (a Plot, a plot mode or a list of plot modes)
+    to outfile, a path or a file object, as 'svg', 'png' or 'obj'.
+    If format is not given, it is taken from the extension of
+    the path. size (in pixels), preset (a camera preset name or
+    rotation angles, by default that of the first mode) and
+    background apply to images.
+    """
+    if format is None:
+        if not isinstance(outfile, str):
+            raise ValueError("The format is required for file objects.")
+        format = outfile.split('.')[-1]
+    format = format.lower()
+    if format not in formats:
+        raise ValueError("Cannot export plots as '%s', use one of %s."
+                         % (format, ', '.join(formats)))
+    modes = _get_modes(plot)
+    opened = isinstance(outfile, str)
+    if opened:
+        outfile = open(outfile, 'wb')
+    try:
+        if format == 'obj':
+            write_obj(modes, outfile)
+        elif format == 'svg':
+            write_svg(modes, outfile, size, preset, background)
+        else:
+            write_png(modes, outfile, size, preset, background)
+    finally:
+        if opened:
+            outfile.close()
+
+def export_plots(jobs, format=None, **kwargs):
+    """
+    Calculates and exports plots one at a time. jobs is an
+    iterable of pairs (functions, outfile), where functions are
+    the arguments of one function of a plot (a tuple, or a single
+    expression) or a list of those, for plots of several functions.
+    The other arguments are passed to export(). Returns the
+    number of exported plots.
+
+    >>> from sympy import Symbol, sin
+    >>> from sympy.plotting.plot_export import export_plots
+    >>> from StringIO import StringIO
+    >>> x = Symbol('x')
+    >>> files = [StringIO() for i in xrange(3)]
+    >>> jobs = ((sin(n*x), files[n]) for n in xrange(3))
+    >>> export_plots(jobs, 'svg')
+    3
+    """
+    count = 0
+    for functions, outfile in jobs:
+        if not isinstance(functions, list):
+            functions = [functions]
+        modes = []
+        for f in functions:
+            if not isinstance(f, tuple):
+                f = (f,)
+            modes.append(calculate_mode(*f))
+        export(modes, outfile, format, **kwargs)
+        del modes
+        count += 1
+    return count
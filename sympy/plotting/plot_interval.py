@@ -159,7 +159,25 @@ class PlotInterval(object):
             yield a, b
             a = b
 
+    @require_all_args
     def frange(self):
-        for i in self.vrange():
-            yield float(i.evalf())
+        """
+        Yields v_steps+1 floats ranging from v_min
+        to v_max (computed in floating point).
+        """
+        v_min = float(self.v_min.evalf())
+        v_max = float(self.v_max.evalf())
+        n = int(self.v_steps)
+        for i in xrange(n):
+            yield v_min + (v_max - v_min) * i / n
+        yield v_max
+
+    @require_all_args
+    def fstep(self):
+        """
+        Width of the steps of frange() as a float.
+        """
+        v_min = float(self.v_min.evalf())
+        v_max = float(self.v_max.evalf())
+        return (v_max - v_min) / int(self.v_steps)
 
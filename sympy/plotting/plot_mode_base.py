@@ -3,7 +3,15 @@ from plot_mode import PlotMode
 from threading import Thread, Event, RLock
 from color_scheme import ColorScheme
 from sympy.core.basic import S
-from time import sleep
+from sympy.utilities.lambdify import lambdify, compile_function, function_source
+from time import sleep, time
+from adaptive import segment_errors, select_segments, plot_scale
+import parallel
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 class PlotModeBase(PlotMode):
     """
@@ -98,6 +106,27 @@ class PlotModeBase(PlotMode):
     default_solid_color = (0.6,0.6,0.9)
     default_rot_preset = 'xy'
 
+    """
+    partial_render_interval
+        Minimum time in seconds between the renderings of
+        partially calculated vertices, when the vertices
+        are calculated in several processes.
+    """
+    partial_render_interval = 0.5
+
+    """
+    default_tolerance
+        Error tolerance of the adaptive refinement
+        (option "adaptive=<evaluation budget>"),
+        relative to the size of the plot. Can be
+        changed with the option "tolerance".
+    max_refinement_depth
+        Number of times the uniform steps of an
+        interval can be halved by the refinement.
+    """
+    default_tolerance = 0.002
+    max_refinement_depth = 8
+
     ##
     ## Instance-Level Attributes
     ##
@@ -116,9 +145,128 @@ class PlotModeBase(PlotMode):
     def _get_sympy_evaluator(self):
         raise NotImplementedError()
 
+    def _get_vertex_exprs(self):
+        """
+        Returns ([fx, fy, fz], [i_var, ...]), the expressions
+        of the vertex coordinates in the independent variables.
+        """
+        raise NotImplementedError()
+
     def _get_lambda_evaluator(self):
+        exprs, args = self._get_vertex_exprs()
+        return lambdify(exprs, args)
+
+    def _get_batch_evaluator(self):
+        """
+        Returns a function which computes the vertex coordinates
+        for NumPy arrays of the independent variables at once
+        (returning a tuple of three arrays or numbers), or None if
+        NumPy is not available or the expressions cannot be
+        compiled.
+        """
+        if numpy is None or not self.use_lambda_eval:
+            return None
+        try:
+            exprs, args = self._get_vertex_exprs()
+            return compile_function(exprs, args, 'numpy')
+        except (ValueError, NotImplementedError):
+            return None
+
+    def _refine_samples(self, t_set, lines, min_width, count, insert):
+        """
+        One round of adaptive refinement of the samples
+        t_set of one parameter (see adaptive.py). lines
+        are the sequences of vertices along t_set. Up to
+        count segments with too large errors are split;
+        insert(i, t) is called after the new sample t is
+        inserted at index i of t_set. Returns the number
+        of inserted samples.
+        """
+        errors = segment_errors(t_set, lines)
+        tolerance = self.tolerance * plot_scale(self.bounds)
+        split = select_segments(t_set, errors, tolerance, min_width, count)
+        for i in split:
+            t = (t_set[i] + t_set[i+1]) / 2.0
+            t_set.insert(i+1, t)
+            insert(i+1, t)
+        return len(split)
+
+    def _use_processes(self):
+        return (parallel.available and self.use_lambda_eval and
+                self.processes is not None and self.processes > 1)
+
+    def _get_vertex_source(self):
+        """
+        Returns (source, namespace) of the compiled vertex
+        function (see sympy.utilities.lambdify.function_source)
+        if the vertices are to be calculated in several
+        processes and the expressions can be compiled,
+        otherwise None.
+        """
+        if not self._use_processes():
+            return None
+        try:
+            exprs, args = self._get_vertex_exprs()
+            return function_source(exprs, args)
+        except (ValueError, NotImplementedError):
+            return None
+
+    def _get_color_source(self):
+        """
+        Like _get_vertex_source, for the color function.
+        """
+        if not self._use_processes():
+            return None
+        return self.color.function_source()
+
+    def _evaluate_tiles(self, source, points, store, partial=None):
+        """
+        Evaluates source at points in self.processes
+        processes, calling store(start, values) for
+        every completed tile. partial(), if given, is
+        called at most every partial_render_interval
+        seconds while tiles are being completed.
+        """
+        tile_size = parallel.tile_length(len(points), self.processes)
+        last = time()
+        for start, values in parallel.evaluate_tiles(source, points,
+                                                     self.processes, tile_size):
+            store(start, values)
+            if callable(partial) and time() - last >= self.partial_render_interval:
+                partial()
+                last = time()
+
+    def _push_verts(self, verts):
         raise NotImplementedError()
 
+    def _calculate_verts_batch(self, evaluate, *values):
+        """
+        Computes the vertices for the arrays values of the
+        independent variables, which all have the same shape.
+        Returns an array of that shape with an additional axis
+        of length 3 for the coordinates, and a boolean array
+        marking the valid (finite) vertices. The coordinates
+        of invalid vertices are NaN. Updates self.bounds.
+        """
+        shape = values[0].shape
+        old_settings = numpy.seterr(all='ignore')
+        try:
+            coords = evaluate(*values)
+            verts = numpy.empty(shape + (3,))
+            for axis in xrange(3):
+                verts[..., axis] = coords[axis]
+            valid = numpy.isfinite(verts).all(axis=-1)
+            verts[~valid] = numpy.nan
+        finally:
+            numpy.seterr(**old_settings)
+        if valid.any():
+            v = verts[valid]
+            lo, hi = v.min(axis=0), v.max(axis=0)
+            for axis in xrange(3):
+                self.bounds[axis][0] = float(lo[axis])
+                self.bounds[axis][1] = float(hi[axis])
+        return verts, valid
+
     def _on_calculate_verts(self):
         raise NotImplementedError()
 
@@ -140,6 +288,7 @@ class PlotModeBase(PlotMode):
         self._calculating_verts_len = 0.0
         self._calculating_cverts_pos = 0.0
         self._calculating_cverts_len = 0.0
+        self._calculation_thread = None
 
         self._max_render_stack_size = 3
         self._draw_wireframe = [-1]
@@ -151,7 +300,15 @@ class PlotModeBase(PlotMode):
         self.predraw = []
         self.postdraw = []
 
+        self.background = kwargs.pop('background', True)
         self.use_lambda_eval = self.options.pop('use_sympy_eval', None) is None
+        self.processes = self.options.pop('processes', None)
+        if self.processes is not None:
+            self.processes = int(self.processes)
+        self.adaptive = self.options.pop('adaptive', None)
+        if self.adaptive is not None:
+            self.adaptive = int(self.adaptive)
+        self.tolerance = float(self.options.pop('tolerance', self.default_tolerance))
         self.style = self.options.pop('style', '')
         self.color = self.options.pop('color', 'rainbow')
         self.bounds_callback = kwargs.pop('bounds_callback', None)
@@ -250,10 +407,34 @@ class PlotModeBase(PlotMode):
             if callable(f): f()
 
     def _on_change_color(self, color):
-        Thread(target=self._calculate_cverts).start()
+        self._run_calculation(self._calculate_cverts)
 
     def _on_calculate(self):
-        Thread(target=self._calculate_all).start()
+        self._run_calculation(self._calculate_all)
+
+    def _run_calculation(self, f):
+        """
+        Runs f in a new thread, which is kept in
+        _calculation_thread, or in this thread if
+        the mode was created with background=False.
+        """
+        if self._use_processes():
+            # create the pool here rather than in the new thread
+            parallel.get_pool(self.processes)
+        if self.background:
+            self._calculation_thread = Thread(target=f)
+            self._calculation_thread.start()
+        else:
+            f()
+
+    def wait_for_calculations(self):
+        """
+        Waits for the calculation running in the
+        background to finish.
+        """
+        t = self._calculation_thread
+        if t is not None:
+            t.join()
 
     def _calculate_all(self):
         self._calculate_verts()
@@ -2,7 +2,7 @@ from plot_curve import PlotCurve
 from plot_surface import PlotSurface
 from util import scale_value
 
-from sympy import pi, lambdify
+from sympy import pi
 from sympy.functions import sin, cos
 from math import sin as p_sin
 from math import cos as p_cos
@@ -27,10 +27,10 @@ class Cartesian2D(PlotCurve):
             return ( _x, fy.subs(x, _x), 0.0 )
         return e
 
-    def _get_lambda_evaluator(self):
+    def _get_vertex_exprs(self):
         fy = self.d_vars[0]
         x  = self.t_interval.v
-        return lambdify([x, fy, 0.0], [x])
+        return [x, fy, 0.0], [x]
 
 class Cartesian3D(PlotSurface):
     i_vars, d_vars = 'xy', 'z'
@@ -47,11 +47,11 @@ class Cartesian3D(PlotSurface):
             return ( _x, _y, fz.subs(x, _x).subs(y, _y) )
         return e
 
-    def _get_lambda_evaluator(self):
+    def _get_vertex_exprs(self):
         fz = self.d_vars[0]
         x  = self.u_interval.v
         y  = self.v_interval.v
-        return lambdify([x,y,fz], [x,y])
+        return [x,y,fz], [x,y]
 
 class ParametricCurve2D(PlotCurve):
     i_vars, d_vars = 't', 'xy'
@@ -69,10 +69,10 @@ class ParametricCurve2D(PlotCurve):
                      0.0 )
         return e
 
-    def _get_lambda_evaluator(self):
+    def _get_vertex_exprs(self):
         fx, fy = self.d_vars
         t  = self.t_interval.v
-        return lambdify([fx,fy,0.0], [t])
+        return [fx,fy,0.0], [t]
 
 class ParametricCurve3D(PlotCurve):
     i_vars, d_vars = 't', 'xyz'
@@ -90,10 +90,10 @@ class ParametricCurve3D(PlotCurve):
                      fz.subs(t, _t) )
         return e
 
-    def _get_lambda_evaluator(self):
+    def _get_vertex_exprs(self):
         fx, fy, fz = self.d_vars
         t  = self.t_interval.v
-        return lambdify([fx,fy,fz], [t])
+        return [fx,fy,fz], [t]
 
 class ParametricSurface(PlotSurface):
     i_vars, d_vars = 'uv', 'xyz'
@@ -112,11 +112,11 @@ class ParametricSurface(PlotSurface):
                      fz.subs(u, _u).subs(v, _v) )
         return e
 
-    def _get_lambda_evaluator(self):
+    def _get_vertex_exprs(self):
         fx, fy, fz = self.d_vars
         u  = self.u_interval.v
         v  = self.v_interval.v
-        return lambdify([fx, fy, fz], [u,v])
+        return [fx, fy, fz], [u,v]
 
 class Polar(PlotCurve):
     i_vars, d_vars = 't', 'r'
@@ -132,11 +132,11 @@ class Polar(PlotCurve):
             return ( _r*p_cos(_t), _r*p_sin(_t), 0.0 )
         return e
 
-    def _get_lambda_evaluator(self):
+    def _get_vertex_exprs(self):
         fr = self.d_vars[0]
         t  = self.t_interval.v
         fx, fy = fr*cos(t), fr*sin(t)
-        return lambdify([fx,fy,0.0], [t])
+        return [fx,fy,0.0], [t]
 
 class Cylindrical(PlotSurface):
     i_vars, d_vars = 'th', 'r'
@@ -153,12 +153,12 @@ class Cylindrical(PlotSurface):
             return ( _r*p_cos(_t), _r*p_sin(_t), _h )
         return e
 
-    def _get_lambda_evaluator(self):
+    def _get_vertex_exprs(self):
         fr = self.d_vars[0]
         t  = self.u_interval.v
         h  = self.v_interval.v
         fx, fy = fr*cos(t), fr*sin(t)
-        return lambdify([fx,fy,h], [t,h])
+        return [fx,fy,h], [t,h]
 
 class Spherical(PlotSurface):
     i_vars, d_vars = 'tp', 'r'
@@ -177,14 +177,14 @@ class Spherical(PlotSurface):
                      _r*p_cos(_p) )
         return e
 
-    def _get_lambda_evaluator(self):
+    def _get_vertex_exprs(self):
         fr = self.d_vars[0]
         t  = self.u_interval.v
         p  = self.v_interval.v
         fx = fr*cos(t)*sin(p)
         fy = fr*sin(t)*sin(p)
         fz = fr*cos(p)
-        return lambdify([fx,fy,fz], [t,p])
+        return [fx,fy,fz], [t,p]
 
 Cartesian2D._register()
 Cartesian3D._register()
@@ -1,7 +1,8 @@
 from pyglet.gl import *
-from plot_mode_base import PlotModeBase
+from plot_mode_base import PlotModeBase, numpy
 from sympy.core.basic import S
-from util import scale_value, scale_value_list
+from util import scale_value, scale_value_list, update_bounds_all, finish_bounds
+from vertex_buffer import surface_buffer, surface_colors
 #from time import sleep
 
 class PlotSurface(PlotModeBase):
@@ -14,41 +15,132 @@ class PlotSurface(PlotModeBase):
         self.v_interval = self.intervals[1]
         self.v_set = list(self.v_interval.frange())
         self.bounds = [ [S.Infinity,-S.Infinity,0],[S.Infinity,-S.Infinity,0],[S.Infinity,-S.Infinity,0] ]
-        evaluate = self._get_evaluator()
 
         self._calculating_verts_pos = 0.0
         self._calculating_verts_len = float(self.u_interval.v_len*self.v_interval.v_len)
 
+        source = self._get_vertex_source()
+        evaluate = self._get_batch_evaluator()
+        if source is not None:
+            verts = self._calculate_grid_parallel(source)
+        elif evaluate is not None:
+            verts = self._calculate_grid_batch(evaluate)
+        else:
+            verts = self._calculate_grid(self._get_evaluator())
+        if self.adaptive is not None:
+            self.u_set, self.v_set, verts = self._refine_grid(verts)
+        finish_bounds(self.bounds)
+
+        self.verts = verts
+        self._push_verts(verts)
+
+    def _push_verts(self, verts):
+        self._buffer = surface_buffer(verts)
+        self.push_wireframe(self.draw_verts(False, False))
+        self.push_solid(self.draw_verts(False, True))
+
+    def _calculate_grid(self, evaluate):
         verts = list()
-        b = self.bounds
         for u in self.u_set:
             column = list()
             for v in self.v_set:
                 try: _e = evaluate(u, v) # calculate vertex
                 except: _e = None
-                if _e is not None:  # update bounding box
-                    for axis in xrange(3):
-                        b[axis][0] = min([b[axis][0], _e[axis]])
-                        b[axis][1] = max([b[axis][1], _e[axis]])
                 column.append(_e)
-                self._calculating_verts_pos += 1.0
-
+            update_bounds_all(self.bounds, column)
+            self._calculating_verts_pos += len(column)
             verts.append(column)
-        for axis in xrange(3):
-            b[axis][2] = b[axis][1] - b[axis][0]
-            if b[axis][2] == 0.0: b[axis][2] = 1.0
+        return verts
 
-        self.verts = verts
-        self.push_wireframe(self.draw_verts(False, False))
-        self.push_solid(self.draw_verts(False, True))
+    def _calculate_grid_batch(self, evaluate):
+        u = numpy.array(self.u_set)
+        v = numpy.array(self.v_set)
+        u_grid = numpy.outer(u, numpy.ones(len(v)))
+        v_grid = numpy.outer(numpy.ones(len(u)), v)
+        grid, valid = self._calculate_verts_batch(evaluate, u_grid, v_grid)
+        verts = grid.tolist()
+        for i, j in numpy.transpose(numpy.nonzero(~valid)):
+            verts[i][j] = None
+        self._calculating_verts_pos = self._calculating_verts_len
+        return verts
+
+    def _refine_grid(self, verts):
+        """
+        Returns refined copies of u_set, v_set and verts.
+        Whole u and v lines are inserted, so that the
+        vertices stay a grid.
+        """
+        evaluate = self._get_evaluator()
+        u_set, v_set = list(self.u_set), list(self.v_set)
+        verts = [list(column) for column in verts]
+        u_width = self.u_interval.fstep() / 2**self.max_refinement_depth
+        v_width = self.v_interval.fstep() / 2**self.max_refinement_depth
+        budget = self.adaptive - len(u_set)*len(v_set)
+        def calculate(u, v):
+            try: return evaluate(u, v)
+            except: return None
+        def insert_column(i, u):
+            column = [calculate(u, v) for v in v_set]
+            verts.insert(i, column)
+            update_bounds_all(self.bounds, column)
+        def insert_row(j, v):
+            row = [calculate(u, v) for u in u_set]
+            for column, _e in zip(verts, row):
+                column.insert(j, _e)
+            update_bounds_all(self.bounds, row)
+        while budget > 0:
+            n_u, n_v = len(u_set), len(v_set)
+            rows = [[column[j] for column in verts] for j in xrange(n_v)]
+            # u lines may take half of the budget, v lines the rest
+            count = min([max([budget // (2*n_v), 1]), budget // n_v])
+            split_u = self._refine_samples(u_set, rows, u_width, count, insert_column)
+            budget -= split_u * n_v
+            split_v = self._refine_samples(v_set, verts, v_width, budget // (n_u + split_u), insert_row)
+            budget -= split_v * (n_u + split_u)
+            if split_u == 0 and split_v == 0: break
+        self._calculating_verts_pos = self._calculating_verts_len = float(len(u_set)*len(v_set))
+        return u_set, v_set, verts
+
+    def _calculate_grid_parallel(self, source):
+        n_v = len(self.v_set)
+        verts = [[None]*n_v for u in self.u_set]
+        points = [(u, v) for u in self.u_set for v in self.v_set]
+        def store(start, values):
+            for i in xrange(len(values)):
+                verts[(start+i) // n_v][(start+i) % n_v] = values[i]
+            update_bounds_all(self.bounds, values)
+            self._calculating_verts_pos += len(values)
+        self._evaluate_tiles(source, points, store,
+                             lambda: self._push_verts(verts))
+        return verts
+
+    def _calculate_colors_parallel(self, source):
+        points, positions = [], []
+        for i in xrange(len(self.u_set)):
+            for j in xrange(len(self.v_set)):
+                p = self.verts[i][j]
+                if p is not None:
+                    points.append((p[0], p[1], p[2], self.u_set[i], self.v_set[j]))
+                    positions.append((i, j))
+        colors = [[None]*len(self.v_set) for u in self.u_set]
+        def store(start, values):
+            for (i, j), c in zip(positions[start:start+len(values)], values):
+                colors[i][j] = c
+        self._evaluate_tiles(source, points, store)
+        return colors
 
     def _on_calculate_cverts(self):
         if not self.verts or not self.color: return
         def set_work_len(n): self._calculating_cverts_len = float(n)
         def inc_work_pos(): self._calculating_cverts_pos += 1.0
         set_work_len(1); self._calculating_cverts_pos = 0
+        source = self._get_color_source()
+        colors = None
+        if source is not None:
+            colors = self._calculate_colors_parallel(source)
         self.cverts = self.color.apply_to_surface(self.verts, self.u_set, self.v_set,
-                                                  set_len=set_work_len, inc_pos=inc_work_pos)
+                                                  set_len=set_work_len, inc_pos=inc_work_pos,
+                                                  colors=colors)
         self.push_solid(self.draw_verts(True, True))
 
     def calculate_one_cvert(self, u, v):
@@ -57,30 +149,15 @@ class PlotSurface(PlotModeBase):
                           self.u_set[u], self.v_set[v])
 
     def draw_verts(self, use_cverts, use_solid_color):
-        def f():
-            for u in xrange( 1, len(self.u_set) ):
-                glBegin(GL_QUAD_STRIP)
-                for v in xrange( len(self.v_set) ):
-                    pa = self.verts[u-1][v]
-                    pb = self.verts[u][v]
-                    if pa is None or pb is None:
-                        glEnd()
-                        glBegin(GL_QUAD_STRIP)
-                        continue
-                    if use_cverts:
-                        ca = self.cverts[u-1][v]
-                        cb = self.cverts[u][v]
-                        if ca is None:
-                            ca = (0,0,0)
-                        if cb is None:
-                            cb = (0,0,0)
-                    else:
-                        if use_solid_color: ca = cb = self.default_solid_color
-                        else: ca = cb = self.default_wireframe_color
-                    glColor3f(*ca)
-                    glVertex3f(*pa)
-                    glColor3f(*cb)
-                    glVertex3f(*pb)
-                glEnd()
-        return f
-
+        colors = None
+        if use_cverts:
+            colors = surface_colors(self.verts, self.cverts)
+            # the colors may not be calculated yet for the current vertices
+            if len(colors) != 3*len(self._buffer):
+                colors = None
+        if colors is None:
+            if use_cverts or use_solid_color:
+                colors = self.default_solid_color
+            else:
+                colors = self.default_wireframe_color
+        return self._buffer.draw_function(colors)
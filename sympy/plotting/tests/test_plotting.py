@@ -71,3 +71,138 @@ class TestPlotting:
         from sympy import Plot
         p=Plot(log(x), [x,0,6.282,4], 'mode=polar', visible=False)
         p.wait_for_calculations()
+
+    def _calculated_mode(self, p):
+        from time import sleep
+        m = p[0]
+        while not m.verts or m._get_calculating_verts():
+            sleep(0.01)
+        m._on_calculate_verts()
+        return m
+
+    def test_plot_2d_verts(self):
+        from sympy import Plot
+        m = self._calculated_mode(Plot(1/x, [x, -1, 1, 4], visible=False))
+        assert m.verts[2] is None
+        assert tuple(m.verts[1]) == (-0.5, -2.0, 0.0)
+        assert m.bounds == [[-1.0, 1.0, 2.0], [-2.0, 2.0, 4.0], [0.0, 0.0, 1.0]]
+
+    def test_plot_3d_verts(self):
+        from sympy import Plot
+        m = self._calculated_mode(Plot(1/x, [x, -1, 1, 2], [y, -1, 1, 1], visible=False))
+        assert m.verts[1] == [None, None]
+        assert tuple(m.verts[2][0]) == (1.0, -1.0, 1.0)
+        assert m.bounds == [[-1.0, 1.0, 2.0]]*3
+
+    def test_plot_processes(self):
+        from sympy import Plot
+        from sympy.plotting import parallel
+        if not parallel.available:
+            return
+        m = self._calculated_mode(Plot(x*y, [x, -1, 1, 3], [y, -1, 1, 2], visible=False))
+        mp = self._calculated_mode(Plot(x*y, [x, -1, 1, 3], [y, -1, 1, 2],
+                                        'processes=2', visible=False))
+        assert mp.processes == 2
+        assert [[tuple(p) for p in c] for c in mp.verts] == \
+               [[tuple(p) for p in c] for c in m.verts]
+        assert mp.bounds == m.bounds
+        m = self._calculated_mode(Plot(1/x, [x, -1, 1, 4], 'processes=2', visible=False))
+        assert m.verts[2] is None
+        assert tuple(m.verts[1]) == (-0.5, -2.0, 0.0)
+        colors = m._calculate_colors_parallel(m._get_color_source())
+        assert colors[2] is None
+        assert colors[1] == m.color(*(tuple(m.verts[1]) + (m.t_set[1], None)))
+
+    def test_adaptive_segments(self):
+        from sympy.plotting.adaptive import segment_errors, select_segments, invalid_error
+        t_set = [0.0, 1.0, 2.0, 3.0, 4.0]
+        line = [(0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (2.0, 1.0, 0.0), (3.0, 0.0, 0.0), None]
+        errors = segment_errors(t_set, [line])
+        assert errors[:3] == [0.5, 1.0, 1.0]
+        assert errors[3] == invalid_error
+        assert select_segments(t_set, errors, 0.75, 0.0, 2) == [3, 2]
+        assert select_segments(t_set, errors, 0.75, 1.0, 2) == []
+
+    def test_plot_adaptive(self):
+        from sympy import Plot
+        m = self._calculated_mode(Plot(1/x, [x, -1, 1, 4], 'adaptive=100', visible=False))
+        t_set = m.t_set
+        assert 5 < len(t_set) <= 100 and len(m.verts) == len(t_set)
+        assert t_set == sorted(t_set)
+        assert len([t for t in t_set if -0.5 < t < 0.5]) > len(t_set) // 2
+        for t, p in zip(t_set, m.verts):
+            if p is not None:
+                assert -1e-12 < p[1] - 1/t < 1e-12
+        m = self._calculated_mode(Plot(x**4 + y, [x, -1, 1, 4], [y, -1, 1, 4],
+                                       'adaptive=100', visible=False))
+        assert len(m.u_set) > 5 and len(m.v_set) == 5
+        assert len(m.u_set)*len(m.v_set) <= 100
+        assert len(m.verts) == len(m.u_set)
+        for u, column in zip(m.u_set, m.verts):
+            assert len(column) == len(m.v_set)
+            for v, p in zip(m.v_set, column):
+                assert -1e-12 < p[2] - (u**4 + v) < 1e-12
+
+    def test_export(self):
+        from sympy import Plot
+        from sympy.plotting.plot_export import export, export_plots, calculate_mode
+        from StringIO import StringIO
+        m = calculate_mode(x*y, [x, -1, 1, 2], [y, -1, 1, 1])
+        assert len(m.verts) == 3 and len(m.cverts) == 3
+        f = StringIO()
+        export(m, f, 'obj')
+        lines = f.getvalue().splitlines()
+        assert len([l for l in lines if l.startswith('v ')]) == 6
+        assert len([l for l in lines if l.startswith('f ')]) == 2
+        assert 'f 1 3 4 2' in lines
+        f = StringIO()
+        export(m, f, 'png', size=(20, 10))
+        assert f.getvalue().startswith('\x89PNG')
+        p = Plot(1/x, [x, -1, 1, 4], visible=False)
+        f = StringIO()
+        p.export(f, 'svg')
+        svg = f.getvalue()
+        assert svg.startswith('<?xml') and svg.endswith('</svg>\n')
+        assert svg.count('<polyline') == 2
+        files = [StringIO(), StringIO()]
+        jobs = [(sin(x), files[0]), ([(x, [x, 0, 1, 1]), (2*x,)], files[1])]
+        assert export_plots(jobs, 'obj') == 2
+        assert files[1].getvalue().count('\nl ') == 101
+
+    def test_interval_frange(self):
+        from sympy.plotting.plot_interval import PlotInterval
+        i = PlotInterval(x, 0, 2*pi, 7)
+        assert list(i.frange()) == [float(v.evalf()) for v in i.vrange()]
+
+    def test_surface_buffer(self):
+        from sympy import Plot
+        m = self._calculated_mode(Plot(x*y, [x, -1, 1, 2], [y, -1, 1, 1], visible=False))
+        b = m._buffer
+        assert len(b) == 6
+        assert list(b.vertices) == [-1.0, -1.0, 1.0, -1.0, 1.0, -1.0,
+                                    0.0, -1.0, 0.0, 0.0, 1.0, 0.0,
+                                    1.0, -1.0, -1.0, 1.0, 1.0, 1.0]
+        assert list(b.indices) == [0, 2, 3, 1, 2, 4, 5, 3]
+        # quads with an invalid corner are left out
+        m = self._calculated_mode(Plot(1/x, [x, -1, 1, 2], [y, -1, 1, 1], visible=False))
+        assert len(m._buffer) == 4 and len(m._buffer.indices) == 0
+
+    def test_curve_buffer(self):
+        from sympy import Plot
+        from sympy.plotting.vertex_buffer import curve_colors
+        m = self._calculated_mode(Plot(1/x, [x, -1, 1, 4], visible=False))
+        b = m._buffer
+        assert list(b.vertices) == [-1.0, -1.0, 0.0, -0.5, -2.0, 0.0,
+                                    0.5, 2.0, 0.0, 1.0, 1.0, 0.0]
+        assert list(b.indices) == [0, 1, 2, 3]
+        colors = curve_colors(m.verts, [(1, 0, 0), (0, 1, 0), None, None, (0, 0, 1)])
+        assert list(colors) == [1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 1]
+        # colors which do not match the vertices are not drawn
+        m.cverts = [(1, 0, 0), (0, 1, 0)]
+        assert len(curve_colors(m.verts, m.cverts)) == 6
+        m.draw_verts(True)
+        try:
+            b.draw_function(curve_colors(m.verts, m.cverts))
+            assert False
+        except ValueError:
+            pass
@@ -1,4 +1,5 @@
-from sympy import *
+from sympy.core.symbol import Symbol
+from sympy.utilities.lambdify import lambdify
 
 def textplot(expr, a, b, W=55, H=18):
     """
@@ -85,6 +85,28 @@ def update_bounds(b, v):
         b[axis][0] = min([b[axis][0], v[axis]])
         b[axis][1] = max([b[axis][1], v[axis]])
 
+def update_bounds_all(b, verts):
+    """
+    Updates the bounds b with all vertices in verts which
+    are not None, taking the minimum and maximum of each
+    axis at once.
+    """
+    verts = [v for v in verts if v is not None]
+    if not verts: return
+    for axis in xrange(3):
+        values = [v[axis] for v in verts]
+        b[axis][0] = min([b[axis][0], min(values)])
+        b[axis][1] = max([b[axis][1], max(values)])
+
+def finish_bounds(b):
+    """
+    Sets the range of each axis of the bounds b,
+    using 1.0 for empty ranges.
+    """
+    for axis in xrange(3):
+        b[axis][2] = b[axis][1] - b[axis][0]
+        if b[axis][2] == 0.0: b[axis][2] = 1.0
+
 def interpolate(a_min, a_max, a_ratio):
     return a_min + a_ratio * (a_max - a_min)
 
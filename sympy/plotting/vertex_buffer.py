@@ -0,0 +1,141 @@
+"""
+Vertices, colors and element indices of plot modes, packed
+into contiguous arrays and drawn with OpenGL vertex arrays
+(one glDrawElements call instead of a glVertex3f call per
+vertex). Building the arrays does not need an OpenGL context.
+"""
+
+from pyglet.gl import *
+from array import array
+
+# typecode of the array module matching GLuint
+if array('I').itemsize == 4:
+    index_typecode = 'I'
+else:
+    index_typecode = 'L'
+
+black = (0.0, 0.0, 0.0)
+
+class VertexBuffer(object):
+    """
+    The vertices of a plot mode and the indices of the
+    elements (lines or quads) connecting them.
+
+    vertices
+        array('f') with three coordinates per vertex
+    indices
+        array of GLuint, two (GL_LINES) or four (GL_QUADS)
+        vertex indices per element
+    """
+
+    def __init__(self, primitive):
+        self.primitive = primitive
+        self.vertices = array('f')
+        self.indices = array(index_typecode)
+
+    def __len__(self):
+        return len(self.vertices) // 3
+
+    def draw_function(self, colors):
+        """
+        Returns a function drawing the elements, colors
+        is either one (r,g,b) color or an array('f') with
+        a color for each vertex.
+        """
+        if isinstance(colors, array) and len(colors) != 3*len(self):
+            raise ValueError("%i colors given for %i vertices"
+                             % (len(colors) // 3, len(self)))
+        vertices, indices, primitive = self.vertices, self.indices, self.primitive
+        def f():
+            if not indices: return
+            glPushClientAttrib(GL_CLIENT_VERTEX_ARRAY_BIT)
+            glEnableClientState(GL_VERTEX_ARRAY)
+            glVertexPointer(3, GL_FLOAT, 0, vertices.buffer_info()[0])
+            if isinstance(colors, array):
+                glEnableClientState(GL_COLOR_ARRAY)
+                glColorPointer(3, GL_FLOAT, 0, colors.buffer_info()[0])
+            else:
+                glColor3f(*colors)
+            glDrawElements(primitive, len(indices), GL_UNSIGNED_INT,
+                           indices.buffer_info()[0])
+            glPopClientAttrib()
+        return f
+
+def curve_buffer(verts):
+    """
+    Packs the vertices of a curve (a list of vertices or None)
+    into a VertexBuffer of lines between consecutive valid
+    vertices.
+    """
+    b = VertexBuffer(GL_LINES)
+    coords = []
+    indices = []
+    n, previous = 0, False
+    for p in verts:
+        if p is None:
+            previous = False
+            continue
+        coords.extend(p)
+        if previous:
+            indices.extend((n-1, n))
+        previous = True
+        n += 1
+    b.vertices.extend(coords)
+    b.indices.extend(indices)
+    return b
+
+def curve_colors(verts, cverts):
+    """
+    Packs the colors of the valid vertices of a curve in the
+    order of curve_buffer(verts), using black for missing colors.
+    """
+    colors = []
+    for p, c in zip(verts, cverts):
+        if p is None: continue
+        if c is None: c = black
+        colors.extend(c)
+    return array('f', colors)
+
+def surface_buffer(verts):
+    """
+    Packs the vertices of a surface (a list of columns of
+    vertices or None) into a VertexBuffer of the quads whose
+    four corners are valid.
+    """
+    b = VertexBuffer(GL_QUADS)
+    coords = []
+    columns = []
+    n = 0
+    for column in verts:
+        column_indices = []
+        for p in column:
+            if p is None:
+                column_indices.append(-1)
+            else:
+                coords.extend(p)
+                column_indices.append(n)
+                n += 1
+        columns.append(column_indices)
+    indices = []
+    for u in xrange(1, len(columns)):
+        a, c = columns[u-1], columns[u]
+        for v in xrange(1, len(a)):
+            quad = (a[v-1], c[v-1], c[v], a[v])
+            if min(quad) >= 0:
+                indices.extend(quad)
+    b.vertices.extend(coords)
+    b.indices.extend(indices)
+    return b
+
+def surface_colors(verts, cverts):
+    """
+    Packs the colors of the valid vertices of a surface in the
+    order of surface_buffer(verts), using black for missing colors.
+    """
+    colors = []
+    for column, ccolumn in zip(verts, cverts):
+        for p, c in zip(column, ccolumn):
+            if p is None: continue
+            if c is None: c = black
+            colors.extend(c)
+    return array('f', colors)
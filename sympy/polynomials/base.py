@@ -59,6 +59,7 @@ class Polynomial(Basic):
         The SymPy expression of a Polynomial f can be accessed through
         f.sympy_expr. The coefficients and exponents are held in
         f.coeffs and f.var and f.order hold the respective arguments.
+        The exponents are Python ints, the coefficients SymPy objects.
 
     Notes:
     ======
@@ -102,7 +103,9 @@ class Polynomial(Basic):
 
     def __new__(cls, sympy_expr=None, coeffs=None, var=None, order=None,
                 **assumptions):
-        obj = Basic.__new__(cls)
+        # Basic.__new__ is not used, the data of Basic is the one of
+        # the SymPy expression.
+        obj = object.__new__(cls)
 
         if sympy_expr is None and coeffs is None:
             raise PolynomialException("No polynomial data given!")
@@ -130,6 +133,8 @@ class Polynomial(Basic):
             # This polynomial is constructed by its coeffs.
             # No sympify is used, all Terms are assumed to be
             # instances of Basic.
+            if len(coeffs[0]) > 1 and not isinstance(coeffs[0][1], int):
+                coeffs = integer_exponents(coeffs)
             obj.coeffs = coeffs
             if var is None:
                 raise PolynomialException("Ambiguous data, "
@@ -146,6 +151,8 @@ class Polynomial(Basic):
             # No sanity check done, which would be slower than just
             # giving one of them.
             obj.sympy_expr = sympy_expr
+            if len(coeffs[0]) > 1 and not isinstance(coeffs[0][1], int):
+                coeffs = integer_exponents(coeffs)
             obj.coeffs = coeffs
             if var is None:
                 var = list(sympy_expr.atoms(type=Symbol))
@@ -159,52 +166,23 @@ class Polynomial(Basic):
         return obj
 
 
-    def __getattribute__(self, name):
-        """Redirect most attributes to the underlying SymPy expression."""
-
-        # Check if the attribute belongs to the Polynomial itself:
-        if name not in ("__class__",
-                        "__dict__",
-                        "__new__",
-                        "__getattribute__",
-                        "__str__",
-                        "__repr__",
-                        "__eq__",
-                        "__ne__",
-                        "__pos__",
-                        "__neg__",
-                        "__add__",
-                        "__radd__",
-                        "__sub__",
-                        "__rsub__",
-                        "__mul__",
-                        "__rmul__",
-                        "__call__",
-                        "as_integer",
-                        "as_monic",
-                        "as_primitive",
-                        "content",
-                        "diff",
-                        "leading_coeff",
-                        "leading_term",
-                        "nth_coeff",
-                        "coeffs",
-                        "order",
-                        "degree",
-                        "as_basic",
-                        "sympy_expr",
-                        "var"):
-            try:
-                # This fails when the Polynomial is instantiated.
-                se = object.__getattribute__(self, "__dict__")["sympy_expr"]
-                # This uses the SymPy expressions' attributes
-                return object.__getattribute__(se, name)
-            except KeyError:
-                # The .sympy_expr doesn't yet exist.
-                pass
-
-        # This uses the Polynomial's attributes
-        return object.__getattribute__(self, name)
+    def __getattr__(self, name):
+        """Redirect the attributes not found here to the underlying
+        SymPy expression.
+
+        The attributes inherited from Basic are redirected by the
+        properties set up below the class, so that the attributes of
+        the Polynomial itself are looked up without any overhead.
+
+        """
+
+        try:
+            sympy_expr = self.__dict__["sympy_expr"]
+        except KeyError:
+            # The .sympy_expr doesn't yet exist.
+            raise AttributeError("'Polynomial' object has no attribute '%s'"
+                                 % name)
+        return getattr(sympy_expr, name)
 
 
     def __str__(self):
@@ -286,6 +264,7 @@ class Polynomial(Basic):
         # Merge the terms of self and other:
         result_list = []
         s, o = self.coeffs, other.coeffs
+        key = monomial_key(self.order)
         i, j = 0, 0
         while i < len(s) and j < len(o):
             if (s[i][1:] == o[j][1:]):
@@ -294,7 +273,7 @@ class Polynomial(Basic):
                     result_list.append((c,) + s[i][1:])
                 i += 1
                 j += 1
-            elif term_cmp(s[i], o[j], self.order) > 0:
+            elif key(s[i]) > key(o[j]):
                 result_list.append(s[i])
                 i += 1
             else:
@@ -362,16 +341,29 @@ class Polynomial(Basic):
 
         # Now we are going to do the multiplication using the coefficients.
         result_dict = {}
-        for self_term in self.coeffs:
-            for other_term in other.coeffs:
-                key = tuple([i+j for i,j in zip(self_term[1:], other_term[1:])])
-                if result_dict.has_key(key):
-                    result_dict[key] += (self_term[0]*other_term[0]).expand()
-                else:
-                    result_dict[key] = (self_term[0]*other_term[0]).expand()
-        result_list = [(result_dict[key],) + key for key in result_dict
-                       if result_dict[key] is not S.Zero]
-        result_list.sort(cmp=lambda x,y:term_cmp(x,y,self.order), reverse=True)
+        self_ints = integer_coefficients(self.coeffs)
+        other_ints = self_ints and integer_coefficients(other.coeffs)
+        if other_ints:
+            # Multiply integer coefficients as Python ints.
+            for c, self_term in zip(self_ints, self.coeffs):
+                self_exp = self_term[1:]
+                for d, other_term in zip(other_ints, other.coeffs):
+                    key = tuple([i+j for i,j in zip(self_exp, other_term[1:])])
+                    result_dict[key] = result_dict.get(key, 0) + c*d
+            result_list = [(Integer(c),) + key
+                           for key, c in result_dict.iteritems() if c]
+        else:
+            for self_term in self.coeffs:
+                for other_term in other.coeffs:
+                    key = tuple([i+j for i,j in zip(self_term[1:],
+                                                    other_term[1:])])
+                    if result_dict.has_key(key):
+                        result_dict[key] += (self_term[0]*other_term[0]).expand()
+                    else:
+                        result_dict[key] = (self_term[0]*other_term[0]).expand()
+            result_list = [(result_dict[key],) + key for key in result_dict
+                           if result_dict[key] is not S.Zero]
+        result_list.sort(key=monomial_key(self.order), reverse=True)
 
         return Polynomial(coeffs=tuple(result_list),
                           var=self.var,
@@ -612,13 +604,12 @@ class Polynomial(Basic):
                 break
         result_list = [((term[0]*term[i]).expand(),) + term[1:i]
                        + ((term[i]-1),) + term[i+1:]
-                       for term in self.coeffs if term[i].is_positive]
+                       for term in self.coeffs if term[i] > 0]
         if len(result_list) == 0:
             return Polynomial(sympy_expr=S.Zero, var=self.var,
                               order=self.order)
         else:
-            result_list.sort(cmp=lambda x,y:term_cmp(x,y,self.order),
-                             reverse=True)
+            result_list.sort(key=monomial_key(self.order), reverse=True)
             return Polynomial(coeffs=tuple(result_list), var=self.var,
                               order=self.order)
 
@@ -704,6 +695,31 @@ class Polynomial(Basic):
     def as_basic(self):
         return self.sympy_expr
 
+def _forward(name):
+    """A property redirecting an attribute to the SymPy expression."""
+    return property(lambda self: getattr(self.sympy_expr, name))
+
+def _forward_method(name):
+    """A special method redirected to the SymPy expression."""
+    def method(self, *args):
+        return getattr(self.sympy_expr, name)(*args)
+    method.__name__ = name
+    return method
+
+# Redirect what Polynomial inherits from Basic, except for the methods
+# overwritten by Polynomial and the special methods needed by any
+# Python object.
+for _name in dir(Basic):
+    if _name in Polynomial.__dict__:
+        continue
+    if _name in ("__contains__", "__float__", "__getitem__", "__hash__",
+                 "__len__", "__nonzero__"):
+        setattr(Polynomial, _name, _forward_method(_name))
+    elif not _name.startswith("__"):
+        setattr(Polynomial, _name, _forward(_name))
+del _name
+
+
 def sympy2coefficients(sympy_expr, var, order):
     """Return the tuple of coefficients and exponents.
 
@@ -732,6 +748,9 @@ def sympy2coefficients(sympy_expr, var, order):
 
     """
 
+    index = {}
+    for i, v in enumerate(var):
+        index[v] = i
     result_dict = {}
     if isinstance(sympy_expr, Add):
         terms = sympy_expr[:]
@@ -743,22 +762,25 @@ def sympy2coefficients(sympy_expr, var, order):
         else:
             factors = [term]
         c = S.One
-        exponents = [S.Zero]*len(var)
+        exponents = [0]*len(var)
         for factor in factors:
-            # Check if any of the variables occur.
-            if filter(lambda x:x in var, factor.atoms(type=Symbol)):
-                if isinstance(factor, Pow) \
-                   and isinstance(factor.base, Symbol) \
-                   and factor.exp.is_integer \
-                   and factor.exp.is_positive:
-                    exponents[var.index(factor.base)] += factor.exp
-                elif isinstance(factor, Symbol):
-                    exponents[var.index(factor)] += 1
-                else:
+            if isinstance(factor, Symbol) and factor in index:
+                exponents[index[factor]] += 1
+            elif isinstance(factor, Pow) and isinstance(factor.base, Symbol) \
+                     and factor.base in index:
+                if not isinstance(factor.exp, Integer) \
+                       or not factor.exp.is_positive:
                     raise PolynomialException("%s is not a polynomial!"
                                               % sympy_expr)
-            else: # The factor is relativly constant.
+                exponents[index[factor.base]] += int(factor.exp)
+            elif isinstance(factor, Number) \
+                     or not [x for x in factor.atoms(type=Symbol)
+                             if x in index]:
+                # The factor is relativly constant.
                 c *= factor
+            else:
+                raise PolynomialException("%s is not a polynomial!"
+                                          % sympy_expr)
         exponents = tuple(exponents)
         if result_dict.has_key(exponents):
             result_dict[exponents] += c
@@ -768,12 +790,59 @@ def sympy2coefficients(sympy_expr, var, order):
     coefficient_list = [(result_dict[key],) + key
                         for key in result_dict.keys()
                         if result_dict[key] is not S.Zero]
-    coefficient_list.sort(cmp=lambda x,y:term_cmp(x, y, order), reverse=True)
+    coefficient_list.sort(key=monomial_key(order), reverse=True)
     if len(coefficient_list) == 0:
-        coefficient_list = [tuple([S.Zero]*(len(var) + 1))]
+        coefficient_list = [(S.Zero,) + (0,)*len(var)]
     return tuple(coefficient_list)
 
 
+def integer_exponents(coeffs):
+    """Return the coeffs with the exponents converted to Python ints.
+
+    Usage:
+    ======
+        The exponents in the coeffs of a Polynomial are Python ints.
+        If coeffs given to the constructor hold SymPy Integers
+        instead, they are converted with this function.
+
+    Examples:
+    =========
+        >>> integer_exponents(((1, Integer(2)), (3, Integer(0))))
+        ((1, 2), (3, 0))
+
+    """
+
+    return tuple([(term[0],) + tuple([int(e) for e in term[1:]])
+                  for term in coeffs])
+
+
+def integer_coefficients(coeffs):
+    """Return the list of integer coefficients as Python ints.
+
+    Usage:
+    ======
+        When all coefficients in the coeffs of a Polynomial are
+        Integers, they are returned as Python ints for faster
+        arithmetic, otherwise None is returned.
+
+    Examples:
+    =========
+        >>> x = Symbol('x')
+        >>> integer_coefficients(((Integer(2), 1), (Integer(3), 0)))
+        [2, 3]
+        >>> print integer_coefficients(((x, 1), (Integer(3), 0)))
+        None
+
+    """
+
+    result = []
+    for term in coeffs:
+        if not isinstance(term[0], Integer):
+            return None
+        result.append(term[0].p)
+    return result
+
+
 def coefficients2sympy(coeffs, var):
     """Return the SymPy expression of given coefficients and exponents.
 
@@ -805,6 +874,22 @@ def coefficients2sympy(coeffs, var):
     elif len(coeffs[0]) != len(var) + 1:
         raise PolynomialException('Wrong number of var given.')
 
+    for term in coeffs:
+        if not isinstance(term[0], Number):
+            break
+    else:
+        for v in var:
+            if not isinstance(v, Symbol):
+                break
+        else:
+            # The monomials carry no coefficient, so the sum can be
+            # built directly from the collected terms.
+            terms = {}
+            for term in coeffs:
+                m = Mul(*[v**e for v, e in zip(var, term[1:])])
+                terms[m] = terms.get(m, 0) + term[0]
+            return Add.from_terms(terms)
+
     result = S.Zero
     for term in coeffs:
         c = term[0]
@@ -821,20 +906,43 @@ def reverse(t):
     return tuple([t[i] for i in range(len(t)-1, 0, -1)])
 
 
+def _lex_key(t):
+    return t[1:]
+
+def _grlex_key(t):
+    return (sum(t[1:]),) + t[1:]
+
+def _grevlex_key(t):
+    return (sum(t[1:]),) + tuple([-e for e in t[:0:-1]])
+
+def _elimination_key(t):
+    return (t[1], sum(t[2:])) + tuple([-e for e in t[:1:-1]])
+
+_monomial_keys = {'lex': _lex_key,
+                  'grlex': _grlex_key,
+                  'grevlex': _grevlex_key,
+                  '1-el': _elimination_key}
+
+def monomial_key(order):
+    """Return the sort key for tuples occuring in the Polynomial's
+    coeffs.
+
+    The keys of two terms compare like their monomials in the given
+    order, so lists of terms are sorted with
+        terms.sort(key=monomial_key(order), reverse=True)
+
+    """
+
+    try:
+        return _monomial_keys[order]
+    except KeyError:
+        raise PolynomialException(str(order) + 'is not an implemented order.')
+
+
 def term_cmp(a, b, order):
     """Compares tuples occuring in the Polynomial's coeffs."""
-    if order == 'lex':
-        return cmp(a[1:], b[1:])
-    elif order == 'grlex':
-        return cmp((sum(a[1:]),) + a[1:], (sum(b[1:]),) + b[1:])
-    elif order == 'grevlex':
-        return cmp((sum(a[1:]),) + reverse(map(lambda l:-l, a[1:])),
-                   (sum(b[1:]),) + reverse(map(lambda l:-l, b[1:])))
-    elif order == '1-el':
-        return cmp((a[1], sum(a[2:])) + reverse(map(lambda l:-l,a[2:])),
-                   (b[1], sum(b[2:])) + reverse(map(lambda l:-l,b[2:])))
-    else:
-        raise PolynomialException(str(order) + 'is not an implemented order.')
+    key = monomial_key(order)
+    return cmp(key(a), key(b))
 
 
 def term_mult(a, b):
@@ -868,7 +976,7 @@ def term_is_mult(a, b):
 
     """
 
-    return all([x.is_nonnegative for x in term_div(a, b)[1:]])
+    return all([x >= 0 for x in term_div(a, b)[1:]])
 
 
 def term_lcm(a, b):
@@ -982,7 +1090,7 @@ def IntPoly2Polynomial(f, var, order):
     exponents = f.coeffs.keys()
     exponents.sort(reverse=True)
     for exp in exponents:
-        coeffs.append((sympify(f[exp]), sympify(exp)))
+        coeffs.append((sympify(f[exp]), exp))
     return Polynomial(coeffs=tuple(coeffs), var=var, order=order)
 
                       
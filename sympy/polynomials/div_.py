@@ -98,7 +98,7 @@ def div(f, g, var=None, order=None, coeff=None):
             # divisibility, too.
             td = term_div(f.coeffs[0], g_i.coeffs[0])
             if (coeff != 'int' or isinstance(td[0], Integer)) \
-               and all([e.is_nonnegative for e in td[1:]]):
+               and all([e >= 0 for e in td[1:]]):
                 quot = Polynomial(coeffs=(td,), var=f.var, order=f.order)
                 q[g.index(g_i)] += quot
                 f -= quot*g_i
@@ -51,11 +51,11 @@ def sqf(f, var=None, order=None, coeff=None):
         f = Polynomial(f, var=var, order=order)
 
     # Check for constant polynomials:
-    if f.var == [] or f.coeffs[0][1] is S.Zero:
+    if f.var == [] or f.coeffs[0][1] == 0:
         return [f]
     
     f = [f]
-    while f[-1].coeffs[0][1] is not S.Zero:
+    while f[-1].coeffs[0][1] != 0:
         f.append(div_.gcd(f[-1], f[-1].diff(f[-1].var[0])))
     g = []
     for i in range(1, len(f)):
@@ -183,7 +183,7 @@ def factor(f, var=None, order=None):
     content, f = f.as_primitive()
     result = [Polynomial(content/denom, var=f.var, order=f.order)]
 
-    if len(f.var) == 0 or f.coeffs[0][1:] == tuple([S.Zero]*len(f.var)):
+    if len(f.var) == 0 or f.coeffs[0][1:] == (0,)*len(f.var):
         return result
     elif len(f.var) == 1:
         factors = fast.intpoly.factor(Polynomial2IntPoly(f))
@@ -262,7 +262,7 @@ def kronecker(f):
             
         # Filter out constant and non-integer polynomials!
         if not (len(cand.coeffs) == 1
-                and cand.coeffs[0][1] is S.Zero):
+                and cand.coeffs[0][1] == 0):
             if all(map(lambda t:t[0].is_integer, cand.coeffs)):
                 cands.append(cand)
 
@@ -368,7 +368,7 @@ def kronecker_mv(f):
             else:
                 tested.append(cand)
             # Check if f is constant.
-            if f.coeffs[0][1:] == tuple([S.Zero]*len(f.var)):
+            if f.coeffs[0][1:] == (0,)*len(f.var):
                 constant_factor = f
                 f = Polynomial(S.One, var=f.var, order=f.order)
                 break
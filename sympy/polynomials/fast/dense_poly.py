@@ -0,0 +1,241 @@
+"""Univariate polynomials in dense representation
+
+The functions work on lists of coefficients, the coefficient of x**i
+at position i, without trailing zeros. They are used by
+DensePolynomial and by SparsePolynomial for dense operands.
+"""
+
+# Below this length of the shorter factor, multiplication is classical.
+karatsuba_threshold = 32
+
+# Polynomials with at least this fraction of nonzero coefficients are
+# dense, see is_dense().
+density_threshold = 0.5
+
+def is_dense(coeffs, degree):
+    """Decide if the dictionary of coefficients of a polynomial of
+    the given degree is better handled as a list."""
+    return len(coeffs) >= density_threshold*(degree + 1)
+
+def from_dict(coeffs, degree, zero=0):
+    """Coefficient list of a polynomial given by a dictionary."""
+    result = [zero]*(degree + 1)
+    for e, c in coeffs.iteritems():
+        result[e] = c
+    return result
+
+def to_dict(f):
+    """Dictionary of the nonzero coefficients of a list."""
+    result_dict = {}
+    for e, c in enumerate(f):
+        if c:
+            result_dict[e] = c
+    return result_dict
+
+def strip(f):
+    """Remove the trailing zeros of f in place."""
+    while f and not f[-1]:
+        f.pop()
+    return f
+
+def add(f, g):
+    if len(f) < len(g):
+        f, g = g, f
+    result = list(f)
+    for i, c in enumerate(g):
+        result[i] += c
+    return strip(result)
+
+def sub(f, g):
+    result = list(f)
+    if len(g) > len(f):
+        result.extend([-c for c in g[len(f):]])
+    for i, c in enumerate(g[:len(f)]):
+        result[i] -= c
+    return strip(result)
+
+def mul_classical(f, g, zero=0):
+    """Schoolbook multiplication."""
+    if not f or not g:
+        return []
+    result = [zero]*(len(f) + len(g) - 1)
+    for i, a in enumerate(f):
+        if not a:
+            continue
+        k = i
+        for b in g:
+            result[k] += a*b
+            k += 1
+    return strip(result)
+
+def _add_shifted(result, f, shift):
+    for i, c in enumerate(f):
+        result[shift + i] += c
+
+def mul_karatsuba(f, g, zero=0):
+    """Karatsuba multiplication of lists of similar length.
+
+    f and g are split at half the length m of the longer one, then
+    f*g = z0 + (z1 - z0 - z2)*x**m + z2*x**(2*m) with z0 = f0*g0,
+    z2 = f1*g1 and z1 = (f0 + f1)*(g0 + g1), which needs three instead
+    of four multiplications of half the size.
+    """
+    if min(len(f), len(g)) < karatsuba_threshold:
+        return mul_classical(f, g, zero)
+    m = max(len(f), len(g)) // 2
+    f0, f1 = f[:m], f[m:]
+    g0, g1 = g[:m], g[m:]
+    z0 = mul_karatsuba(f0, g0, zero)
+    z2 = mul_karatsuba(f1, g1, zero)
+    z1 = mul_karatsuba(add(f0, f1), add(g0, g1), zero)
+    z1 = sub(sub(z1, z0), z2)
+    result = [zero]*(len(f) + len(g) - 1)
+    _add_shifted(result, z0, 0)
+    _add_shifted(result, z1, m)
+    _add_shifted(result, z2, 2*m)
+    return strip(result)
+
+def mul(f, g, zero=0):
+    """Product of two coefficient lists.
+
+    Uses Karatsuba multiplication if both are longer than
+    karatsuba_threshold; the longer factor is cut into pieces of the
+    length of the shorter one if their lengths differ a lot.
+    """
+    if len(f) < len(g):
+        f, g = g, f
+    n = len(g)
+    if n < karatsuba_threshold:
+        return mul_classical(f, g, zero)
+    if len(f) < 2*n:
+        return mul_karatsuba(f, g, zero)
+    result = [zero]*(len(f) + n - 1)
+    for i in xrange(0, len(f), n):
+        _add_shifted(result, mul_karatsuba(f[i:i+n], g, zero), i)
+    return strip(result)
+
+def div(f, g, lc_inverse):
+    """Division with remainder over a field, lc_inverse is the inverse
+    of the leading coefficient of g."""
+    r = list(f)
+    n = len(g) - 1
+    if len(r) <= n:
+        return [], r
+    q = [None]*(len(r) - n)
+    for k in xrange(len(r) - 1, n - 1, -1):
+        c = r[k]*lc_inverse
+        q[k - n] = c
+        if c:
+            for i in xrange(n + 1):
+                r[k - n + i] -= c*g[i]
+    del r[n:]
+    return strip(q), strip(r)
+
+def div_int(f, g):
+    """Division with remainder over the integers.
+
+    Coefficients of the quotient are computed from the top as long as
+    the leading coefficient of the remainder is divisible by the one
+    of g.
+    """
+    r = list(f)
+    n = len(g) - 1
+    lc = g[-1]
+    q = [0]*max(len(r) - n, 0)
+    k = len(r) - 1
+    while k >= n:
+        c = r[k]
+        if c:
+            if c % lc:
+                break
+            c /= lc
+            q[k - n] = c
+            for i in xrange(n + 1):
+                r[k - n + i] -= c*g[i]
+        k -= 1
+    del r[k+1:]
+    return strip(q), strip(r)
+
+
+class DensePolynomial(object):
+    """List-based polynomial representation. (abstract class)"""
+
+    coeff_type = int
+    zero = 0
+
+    def __init__(self, coeffs=[]):
+        self.coeffs = strip(list(coeffs))
+        self.degree = len(self.coeffs) - 1
+
+    @classmethod
+    def from_dict(cls, coeffs):
+        """Alternative construction, from a dictionary of coefficients."""
+        if not coeffs:
+            return cls()
+        return cls(from_dict(coeffs, max(coeffs.iterkeys()), cls.zero))
+
+    def to_dict(self):
+        return to_dict(self.coeffs)
+
+    def __repr__(self):
+        return "%s(%s)" % (self.__class__, repr(self.coeffs))
+
+    def __getitem__(self, item):
+        """Returns the nth coefficient."""
+        if 0 <= item <= self.degree:
+            return self.coeffs[item]
+        return self.zero
+
+    def __eq__(self, other):
+        return self.coeffs == other.coeffs
+
+    def __ne__(self, other):
+        return self.coeffs != other.coeffs
+
+    def __nonzero__(self):
+        return bool(self.coeffs)
+
+    def __pos__(self):
+        return self
+
+    def __neg__(self):
+        return self.__class__([-c for c in self.coeffs])
+
+    def scale(self, coefficient, exponent=0):
+        if not coefficient or not self.coeffs:
+            return self.__class__()
+        return self.__class__([self.zero]*exponent
+                              + [c*coefficient for c in self.coeffs])
+
+    def __add__(self, other):
+        return self.__class__(add(self.coeffs, other.coeffs))
+
+    def __sub__(self, other):
+        return self.__class__(sub(self.coeffs, other.coeffs))
+
+    def __mul__(self, other):
+        return self.__class__(mul(self.coeffs, other.coeffs, self.zero))
+
+    def __pow__(self, exponent):
+        """Repeated Squaring."""
+        assert isinstance(exponent, (int, long)) and exponent >= 0
+        result = self.__class__([self.coeff_type(1)])
+        power = self
+        while exponent:
+            if exponent % 2:
+                result *= power
+            exponent //= 2
+            if exponent:
+                power *= power
+        return result
+
+    def diff(self):
+        return self.__class__([c*self.coeff_type(e)
+                               for e, c in enumerate(self.coeffs)][1:])
+
+    def evaluate(self, point):
+        """Horner's scheme."""
+        result = self.zero
+        for c in reversed(self.coeffs):
+            result = result*point + c
+        return result
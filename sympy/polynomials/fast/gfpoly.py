@@ -1,63 +1,278 @@
-"""Univariate polynomials with galois field coefficients."""
+"""Univariate polynomials with galois field coefficients.
+
+The coefficients are stored as a list of Python integers 0 <= c < p,
+the coefficient of x**i at position i, and reduced modulo p once per
+operation. Coefficients are converted to ModularInteger instances only
+when they are handed out (by __getitem__, monic and factor).
+
+Multiplication and division of long polynomials use NumPy int64 arrays
+if NumPy is installed and p < 2**31.
+"""
 
 import random
 
 import modint
-import sparse_poly
+import dense_poly
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Shortest polynomial for which the NumPy algorithms are used.
+numpy_threshold = 64
+
+def use_numpy(n, p):
+    """Decide if polynomials of length n modulo p are handled with
+    NumPy int64 arrays."""
+    return numpy is not None and n >= numpy_threshold and p < 2**31
+
+def strip(f):
+    """Remove the trailing zeros of f in place."""
+    while f and not f[-1]:
+        f.pop()
+    return f
+
+def invert(a, p):
+    g, s, t = modint.xgcd(a, p)
+    assert g == 1, "Zero division!"
+    return s % p
+
+def mul_mod(f, g, p):
+    """Product of the coefficient lists f and g modulo p."""
+    if use_numpy(min(len(f), len(g)), p):
+        return _mul_numpy(f, g, p)
+    return strip([c % p for c in dense_poly.mul(f, g)])
+
+def _mul_numpy(f, g, p):
+    # Every coefficient c < 2**31 is split into c1*2**16 + c0, so that
+    # the convolutions of the halves cannot overflow int64.
+    f = numpy.array(f, dtype=numpy.int64)
+    g = numpy.array(g, dtype=numpy.int64)
+    f1, f0 = f >> 16, f & 0xffff
+    g1, g0 = g >> 16, g & 0xffff
+    c2 = numpy.convolve(f1, g1) % p
+    c1 = (numpy.convolve(f1, g0) + numpy.convolve(f0, g1)) % p
+    c0 = numpy.convolve(f0, g0) % p
+    result = (c2*(2**32 % p) % p + c1*2**16 % p + c0) % p
+    return strip(result.tolist())
+
+def div_mod(f, g, p):
+    """Division with remainder of the coefficient lists f and g
+    modulo p."""
+    n = len(g) - 1
+    if len(f) <= n:
+        return [], list(f)
+    lc_inverse = invert(g[-1], p)
+    q = [0]*(len(f) - n)
+    if use_numpy(n + 1, p):
+        r = numpy.array(f, dtype=numpy.int64)
+        gg = numpy.array(g, dtype=numpy.int64)
+        for k in xrange(len(f) - 1, n - 1, -1):
+            c = int(r[k])*lc_inverse % p
+            if c:
+                q[k - n] = c
+                r[k-n:k+1] = (r[k-n:k+1] - c*gg) % p
+        r = r[:n].tolist()
+    else:
+        r = list(f)
+        for k in xrange(len(f) - 1, n - 1, -1):
+            c = r[k]*lc_inverse % p
+            if c:
+                q[k - n] = c
+                for i in xrange(n):
+                    r[k - n + i] = (r[k - n + i] - c*g[i]) % p
+        del r[n:]
+    return strip(q), strip(r)
+
+def gcd_mod(f, g, p):
+    """Monic gcd of the coefficient lists f and g modulo p."""
+    while g:
+        f, g = g, div_mod(f, g, p)[1]
+    if not f:
+        return f
+    lc_inverse = invert(f[-1], p)
+    return [c*lc_inverse % p for c in f]
+
+def resultant_mod(f, g, p):
+    """Resultant of the coefficient lists f and g modulo p.
+
+    Uses res(f, g) == (-1)**(m*n) * lc(g)**(m - k) * res(g, r) for
+    the remainder r of f by g, where m, n and k are the degrees of f,
+    g and r.
+    """
+    if not f or not g:
+        return 0
+    result = 1
+    while True:
+        m, n = len(f) - 1, len(g) - 1
+        if n == 0:
+            return result*pow(g[0], m, p) % p
+        r = div_mod(f, g, p)[1]
+        if not r:
+            return 0
+        if m*n % 2:
+            result = -result
+        result = result*pow(g[-1], m - len(r) + 1, p) % p
+        f, g = g, r
+
+
+class GFPolynomial(object):
+    """Polynomial over the integers modulo a prime. (abstract class,
+    see GFPolyFactory)"""
+
+    modulus = 0
+    coeff_type = None
+
+    def __init__(self, coeffs=[]):
+        """coeffs is a list of integers 0 <= c < modulus."""
+        self.coeffs = strip(list(coeffs))
+        self.degree = len(self.coeffs) - 1
+
+    def __repr__(self):
+        return "%s(%s)" % (self.__class__, repr(self.coeffs))
+
+    @classmethod
+    def from_int_dict(cls, int_dict):
+        """Alternative construction, through integers."""
+        if not int_dict:
+            return cls()
+        p = cls.modulus
+        coeffs = [0]*(max(int_dict.iterkeys()) + 1)
+        for e, c in int_dict.iteritems():
+            coeffs[e] = c % p
+        return cls(coeffs)
+
+    def to_int_dict(self):
+        """Returns the dictionaries of integer representators."""
+        return dense_poly.to_dict(self.coeffs)
+
+    def to_sym_int_dict(self):
+        """Returns the dictionaries of symmetric integer representators."""
+        p = self.modulus
+        result_dict = {}
+        for e, c in enumerate(self.coeffs):
+            if c:
+                if c > p/2:
+                    c -= p
+                result_dict[e] = c
+        return result_dict
+
+    @classmethod
+    def random(cls, min_degree, max_degree, monic=True):
+        """Generate random polynomial in given degree range."""
+        degree = random.randrange(min_degree, max_degree + 1)
+        p = cls.modulus
+        coeffs = [random.randrange(p) for e in xrange(degree + 1)]
+        if monic:
+            coeffs[degree] = 1
+        return cls(coeffs)
+
+    def __getitem__(self, item):
+        """Returns the nth coefficient."""
+        if 0 <= item <= self.degree:
+            return self.coeff_type(self.coeffs[item])
+        return self.coeff_type(0)
+
+    def __eq__(self, other):
+        return self.coeffs == other.coeffs
+
+    def __ne__(self, other):
+        return self.coeffs != other.coeffs
+
+    def __nonzero__(self):
+        return bool(self.coeffs)
+
+    def __pos__(self):
+        return self
+
+    def __neg__(self):
+        p = self.modulus
+        return self.__class__([-c % p for c in self.coeffs])
+
+    def scale(self, coefficient, exponent=0):
+        """Multiplication by coefficient*x**exponent, where coefficient
+        is an integer or a ModularInteger."""
+        p = self.modulus
+        c = int(coefficient) % p
+        if not c or not self.coeffs:
+            return self.__class__()
+        return self.__class__([0]*exponent + [a*c % p for a in self.coeffs])
+
+    def __add__(self, other):
+        p = self.modulus
+        f, g = self.coeffs, other.coeffs
+        if len(f) < len(g):
+            f, g = g, f
+        result = list(f)
+        for i, c in enumerate(g):
+            result[i] = (result[i] + c) % p
+        return self.__class__(result)
+
+    def __sub__(self, other):
+        p = self.modulus
+        f, g = self.coeffs, other.coeffs
+        result = f + [0]*(len(g) - len(f))
+        for i, c in enumerate(g):
+            result[i] = (result[i] - c) % p
+        return self.__class__(result)
+
+    def __mul__(self, other):
+        if not self.coeffs or not other.coeffs:
+            return self.__class__()
+        return self.__class__(mul_mod(self.coeffs, other.coeffs,
+                                      self.modulus))
+
+    def __pow__(self, exponent):
+        """Repeated Squaring."""
+        assert isinstance(exponent, (int, long)) and exponent >= 0
+        result = self.__class__([1])
+        power = self
+        while exponent:
+            if exponent % 2:
+                result *= power
+            exponent //= 2
+            if exponent:
+                power *= power
+        return result
+
+    def diff(self):
+        p = self.modulus
+        return self.__class__([e*c % p for e, c in enumerate(self.coeffs)][1:])
+
+    def evaluate(self, point):
+        p = self.modulus
+        point = int(point)
+        result = 0
+        for c in reversed(self.coeffs):
+            result = (result*point + c) % p
+        return self.coeff_type(result)
+
+    def monic(self):
+        if not self:
+            return self.coeff_type(0), self
+        lc = self.coeffs[-1]
+        return self.coeff_type(lc), self.scale(invert(lc, self.modulus))
+
+_gf_poly_classes = {}
 
 def GFPolyFactory(p):
-    """Create custom class for specific coefficient type."""
+    """Create custom class for specific coefficient type.
+
+    The class is created once for each modulus p.
+    """
+    try:
+        return _gf_poly_classes[p]
+    except KeyError:
+        pass
     coefficient_type = modint.ModularIntegerFactory(p)
-    class newClass(sparse_poly.SparsePolynomial):
+    class newClass(GFPolynomial):
+        modulus = p
         coeff_type = coefficient_type
         zero = coeff_type(0)
 
-        @staticmethod
-        def from_int_dict(int_dict):
-            """Alternative construction, through integers."""
-            result_dict = {}
-            for e, c in int_dict.iteritems():
-                cc = coefficient_type(c)
-                if cc:
-                    result_dict[e] = cc
-            return newClass(result_dict)
-
-        def to_int_dict(self):
-            """Returns the dictionaries of integer representators."""
-            result_dict = {}
-            for e, c in self.coeffs.iteritems():
-                result_dict[e] = c.value
-            return result_dict
-
-        def to_sym_int_dict(self):
-            """Returns the dictionaries of symmetric integer representators."""
-            result_dict = {}
-            for e, c in self.coeffs.iteritems():
-                result_dict[e] = int(c)
-            return result_dict
-
-        @staticmethod
-        def random(min_degree, max_degree, monic=True):
-            """Generate random polynomial in given degree range."""
-            degree = random.randrange(min_degree, max_degree + 1)
-            p = coefficient_type.modulus
-            result_dict = {}
-            if monic:
-                result_dict[degree] = coefficient_type(1)
-                degree -= 1
-            for e in xrange(0, degree + 1):
-                c = coefficient_type(random.randrange(p))
-                if c:
-                    result_dict[e] = c
-            return newClass(result_dict)
-            
-        def monic(self):
-            if not self:
-                return self.coeff_type(0), self
-            leading_coeff = self[self.degree]
-            return leading_coeff, self.scale(self.coeff_type(1)/leading_coeff)
-
     newClass.__name__ = "%sPoly" % coefficient_type.__name__
+    _gf_poly_classes[p] = newClass
     return newClass
 
 
@@ -65,23 +280,17 @@ def GFPolyFactory(p):
 
 def div(f, g):
     """Division with remainder."""
-    q = f.__class__()
-    r = f
     if not g:
-        return q, r
-    deg_diff = r.degree - g.degree
-    while deg_diff >= 0:
-        quot = f.__class__({deg_diff: r[r.degree]/g[g.degree]})
-        q += quot
-        r -= quot*g
-        deg_diff = r.degree - g.degree
-    return q, r
+        return f.__class__(), f
+    q, r = div_mod(f.coeffs, g.coeffs, f.modulus)
+    return f.__class__(q), f.__class__(r)
 
 def gcd(f, g):
     """Euclidean algorithm."""
-    while g:
-        f, g = g, div(f,g)[1]
-    return f.monic()[1]
+    return f.__class__(gcd_mod(f.coeffs, g.coeffs, f.modulus))
+
+def resultant(f, g):
+    return f.coeff_type(resultant_mod(f.coeffs, g.coeffs, f.modulus))
 
 def lcm(f, g):
     q, r = div(f*g, gcd(f,g))
@@ -93,7 +302,7 @@ def xgcd(f, g):
 
     Outputs the gcd, s and t, such that:
         h == s*f + t*g
-    
+
     """
     one = f.coeff_type(1)
     p, q, r, s, t  = [], [], [], [], []
@@ -103,11 +312,11 @@ def xgcd(f, g):
     pp, rr = g.monic()
     p.append(pp)
     r.append(rr)
-    s.append(f.__class__({0:(one/p[0])}))
+    s.append(f.__class__([int(one/p[0]) % f.modulus]))
     s.append(f.__class__())
     t.append(f.__class__())
-    t.append(f.__class__({0:(one/p[1])}))
-            
+    t.append(f.__class__([int(one/p[1]) % f.modulus]))
+
     while True:
         q.append(div(r[-2], r[-1])[0])
         pp, rr = (r[-2] - q[-1]*r[-1]).monic()
@@ -123,18 +332,14 @@ def xgcd(f, g):
 
 def truncate(f, n):
     """The remainder from division by x**n."""
-    result_dict = {}
-    for e, c in f.coeffs.iteritems():
-        if e < n:
-            result_dict[e] = c
-    return f.__class__(result_dict)
+    return f.__class__(f.coeffs[:n])
 
 
 def pow_mod(f, n, p):
     """Repeated squaring."""
     assert isinstance(n, (int, long)) and n >= 0
     if n == 0:
-        return f.__class__({0: f.__class__.coeff_type(1)})
+        return f.__class__([1])
     binary_n = []
     while n:
         if n % 2:
@@ -162,32 +367,35 @@ def distinct_degree_factor(f):
     """
 
     result = []
-    coeff_type = f.__class__.coeff_type
-    p = coeff_type.modulus
-    x_poly = f.__class__({1: coeff_type(1)})
-    one_poly = f.__class__({0: coeff_type(1)})
+    p = f.modulus
+    x_poly = f.__class__([0, 1])
+    one_poly = f.__class__([1])
     h = x_poly
+    i = 0
     while f != one_poly:
+        i += 1
         h = pow_mod(h, p, f) # h <- h**p mod f
         g = gcd(h - x_poly, f)
         f, r = div(f, g)
         assert not r
         result.append(g)
-        # Early abort:
-        if f.degree < 2*(g.degree + 1):
-            result.append(f)
+        # Early abort: the factors left have degrees > i, so f is
+        # irreducible if its degree is less than 2*(i + 1).
+        if f.degree < 2*(i + 1):
+            if f.degree > 0:
+                result += [one_poly]*(f.degree - i - 1)
+                result.append(f)
             break
     return result
 
 def equal_degree_split(f, degree):
     """Finds divisor of a result from distinct-degree factorization."""
-    coeff_type = f.__class__.coeff_type
-    one_poly = f.__class__({0: coeff_type(1)})
+    one_poly = f.__class__([1])
     a = f.random(1, f.degree - 1)
     g = gcd(f, a)
     if g != one_poly:
         return g
-    b = pow_mod(a, (coeff_type.modulus**degree - 1)/2, f)
+    b = pow_mod(a, (f.modulus**degree - 1)/2, f)
     g = gcd(b - one_poly, f)
     if g != one_poly and g != f:
         return g
@@ -210,10 +418,10 @@ def factor(f):
     Returns a list of the leading coefficient of f and the monic
     factors with their multiplicities.
     """
-    p = f.__class__.coeff_type.modulus
+    p = f.modulus
     leading_coeff, f = f.monic()
-    one_poly = f.__class__({0: f.__class__.coeff_type(1)})
-    x_poly = f.__class__({1: f.__class__.coeff_type(1)})
+    one_poly = f.__class__([1])
+    x_poly = f.__class__([0, 1])
     h = x_poly
     i = 0
     result = [leading_coeff]
@@ -243,7 +451,7 @@ def factor_sqf(f):
     Returns a list of the leading coefficient and the monic factors of f.
     """
 
-    one_poly = f.__class__({0: f.__class__.coeff_type(1)})
+    one_poly = f.__class__([1])
     leading_coeff, f = f.monic()
     result = [leading_coeff]
     for degree, divisor in enumerate(distinct_degree_factor(f)):
@@ -251,4 +459,3 @@ def factor_sqf(f):
             continue
         result += equal_degree_factor(divisor, degree + 1)
     return result
-
@@ -3,7 +3,9 @@
 import math
 
 from sympy import ntheory
-from sympy.polynomials.fast import modint, sparse_poly, gfpoly
+from sympy.polynomials.fast import modint, sparse_poly, dense_poly, gfpoly, \
+     lattice
+from sympy.utilities import parallel
 
 class IntPoly(sparse_poly.SparsePolynomial):
     def primitive(self):
@@ -24,20 +26,75 @@ class IntPoly(sparse_poly.SparsePolynomial):
                     result_dict[e] = cc
         return IntPoly(result_dict)
 
+    def to_dense(self):
+        return DenseIntPoly.from_dict(self.coeffs)
+
+class DenseIntPoly(dense_poly.DensePolynomial):
+    """Integer polynomial as a list of coefficients, for dense
+    polynomials of high degree."""
+
+    def primitive(self):
+        content = reduce(modint.gcd, self.coeffs, 0)
+        return content, DenseIntPoly([c/content for c in self.coeffs])
+
+    def mod_int(self, m, symmetric=False):
+        result = []
+        for c in self.coeffs:
+            cc = c % m
+            if symmetric and cc > m/2:
+                cc -= m
+            result.append(cc)
+        return DenseIntPoly(result)
+
+    def to_sparse(self):
+        return IntPoly(self.to_dict())
+
 # Division algorithms:
 
 def div(f, g):
     """Division with remainder over the integers."""
+    if isinstance(f, DenseIntPoly):
+        if not g:
+            return DenseIntPoly(), f
+        q, r = dense_poly.div_int(f.coeffs, g.coeffs)
+        return DenseIntPoly(q), DenseIntPoly(r)
     q = IntPoly()
     r = f
     if not g:
         return q, r
+    if dense_poly.is_dense(g.coeffs, g.degree):
+        q, r = dense_poly.div_int(dense_poly.from_dict(f.coeffs, f.degree),
+                                  dense_poly.from_dict(g.coeffs, g.degree))
+        return IntPoly(dense_poly.to_dict(q)), IntPoly(dense_poly.to_dict(r))
     while r.degree >= g.degree and not (r[r.degree] % g[g.degree]):
         quot = IntPoly({r.degree - g.degree: r[r.degree]/g[g.degree]})
         q += quot
         r -= quot*g
     return q, r
 
+def div_monic_mod(f, g, m):
+    """Division with remainder by a monic polynomial modulo m.
+
+    The coefficients of the quotient are reduced as they are computed,
+    so that they do not grow with its degree. Returns the symmetric
+    residues of quotient and remainder.
+    """
+    if not f:
+        return IntPoly(), IntPoly()
+    r = dense_poly.from_dict(f.coeffs, f.degree)
+    g = dense_poly.from_dict(g.coeffs, g.degree)
+    n = len(g) - 1
+    q = [0]*max(len(r) - n, 0)
+    for k in xrange(len(r) - 1, n - 1, -1):
+        c = r[k] % m
+        if c:
+            q[k - n] = c
+            for i in xrange(n):
+                r[k - n + i] -= c*g[i]
+    del r[n:]
+    return IntPoly(dense_poly.to_dict(q)).mod_int(m, symmetric=True), \
+           IntPoly(dense_poly.to_dict(r)).mod_int(m, symmetric=True)
+
 def gcd_small_primes(f, g):
     """Modular small primes version for primitive polynomials."""
     if f.degree < g.degree:
@@ -170,7 +227,141 @@ def gcd_heuristic(f, g):
                 return h
         u *= 2
     
-gcd = gcd_small_primes
+# Multi-modular algorithms:
+
+_modular_primes = []
+
+def modular_prime(i):
+    """The ith largest prime below 2**31."""
+    while len(_modular_primes) <= i:
+        if _modular_primes:
+            p = _modular_primes[-1]
+        else:
+            p = 2**31
+        _modular_primes.append(ntheory.generate.prevprime(p))
+    return _modular_primes[i]
+
+def _gcd_image(task):
+    f, g, p = task
+    return p, gfpoly.gcd_mod(gfpoly.strip([c % p for c in f]),
+                             gfpoly.strip([c % p for c in g]), p)
+
+def _resultant_image(task):
+    f, g, p = task
+    return p, gfpoly.resultant_mod([c % p for c in f], [c % p for c in g], p)
+
+def _images(function, f, g, primes, processes):
+    """Apply function to f and g (coefficient lists) and each prime,
+    in processes worker processes if given."""
+    tasks = [(f, g, p) for p in primes]
+    if processes and parallel.available:
+        return parallel.get_pool(processes).map(function, tasks)
+    return map(function, tasks)
+
+def _crt_step(a, m, b, p):
+    """The integer -m*p/2 < c <= m*p/2 with c == a mod m and c == b mod p."""
+    c = a + m*((b - a)*gfpoly.invert(m % p, p) % p)
+    mp = m*p
+    c %= mp
+    if c > mp/2:
+        c -= mp
+    return c
+
+def gcd_multimodular(f, g, processes=None):
+    """Multi-modular gcd of univariate integer polynomials.
+
+    The gcd is reconstructed from its images modulo primes below 2**31
+    by the chinese remainder theorem. Once a further prime does not
+    change the candidate, it is returned if it divides f and g.
+
+    The images are computed in batches of one per process, in parallel
+    if processes is given (see sympy.utilities.parallel).
+    """
+    if f.degree < g.degree:
+        f, g = g, f
+    if not g:
+        return f
+    cf, f = f.primitive()
+    cg, g = g.primitive()
+    c = modint.gcd(cf, cg)
+    if g.degree == 0:
+        return IntPoly({0: c})
+    ff = dense_poly.strip(dense_poly.from_dict(f.coeffs, f.degree))
+    gg = dense_poly.strip(dense_poly.from_dict(g.coeffs, g.degree))
+    b = modint.gcd(ff[-1], gg[-1])
+
+    e = g.degree + 1 # exceeds the degree of every image
+    h, m = None, 1
+    i = 0
+    while True:
+        primes = []
+        while len(primes) < (processes or 1):
+            p = modular_prime(i)
+            i += 1
+            if b % p:
+                primes.append(p)
+        for p, v in _images(_gcd_image, ff, gg, primes, processes):
+            d = len(v) - 1
+            if d == 0:
+                return IntPoly({0: c})
+            if d > e: # unlucky prime
+                continue
+            v = [cc*b % p for cc in v]
+            if d < e: # all previous primes were unlucky
+                e = d
+                h, m = [cc - p*(cc > p/2) for cc in v], p
+                continue
+            hh = [_crt_step(h[k], m, v[k], p) for k in xrange(d + 1)]
+            stable = hh == h
+            h, m = hh, m*p
+            if stable:
+                w = IntPoly(dense_poly.to_dict(h)).primitive()[1]
+                if not div(f, w)[1] and not div(g, w)[1]:
+                    return w.scale(c)
+
+def resultant(f, g, processes=None):
+    """Resultant of univariate integer polynomials.
+
+    The resultant is reconstructed from its values modulo primes below
+    2**31 whose product exceeds twice Hadamard's bound. The values are
+    computed in parallel if processes is given.
+    """
+    ff = dense_poly.strip(dense_poly.from_dict(f.coeffs, f.degree))
+    gg = dense_poly.strip(dense_poly.from_dict(g.coeffs, g.degree))
+    m, n = len(ff) - 1, len(gg) - 1
+    if m < 0 or n < 0:
+        return 0
+    if m == 0:
+        return ff[0]**n
+    if n == 0:
+        return gg[0]**m
+    # |res| <= |f|**n * |g|**m (2-norms), compared squared
+    bound = sum([c*c for c in ff])**n * sum([c*c for c in gg])**m
+    lc = ff[-1]*gg[-1]
+
+    primes, mm = [], 1
+    i = 0
+    while mm*mm <= 4*bound:
+        p = modular_prime(i)
+        i += 1
+        if lc % p:
+            primes.append(p)
+            mm *= p
+    r, mm = 0, 1
+    for p, v in _images(_resultant_image, ff, gg, primes, processes):
+        r = _crt_step(r, mm, v, p)
+        mm *= p
+    return r
+
+def discriminant(f, processes=None):
+    """Discriminant of a univariate integer polynomial."""
+    n = f.degree
+    r = resultant(f, f.diff(), processes)
+    if (n*(n - 1)/2) % 2:
+        r = -r
+    return r / f[n]
+
+gcd = gcd_multimodular
 
 def hensel_step(m, f, g, h, s, t):
     """One step in Hensel lifting.
@@ -192,19 +383,54 @@ def hensel_step(m, f, g, h, s, t):
     mm = m**2
 
     e = (f - g*h).mod_int(mm, symmetric=True)
-    q, r = div(s*e, h)
-    q, r = q.mod_int(mm, symmetric=True), r.mod_int(mm, symmetric=True)
+    q, r = div_monic_mod(s*e, h, mm)
     gg = (g + t*e + q*g).mod_int(mm, symmetric=True)
     hh = (h + r).mod_int(mm, symmetric=True)
 
     b = (s*gg + t*hh - IntPoly({0: 1})).mod_int(mm, symmetric=True)
-    c, d = div(s*b, hh)
-    c, d = c.mod_int(mm, symmetric=True), d.mod_int(mm, symmetric=True)
+    c, d = div_monic_mod(s*b, hh, mm)
     ss = (s - d).mod_int(mm, symmetric=True)
     tt = (t - t*b - c*gg).mod_int(mm, symmetric=True)
     
     return gg, hh, ss, tt
 
+def _factor_tree(p, f_list):
+    """Builds the balanced factor tree of f_1*...*f_r mod p.
+
+    Returns the tree and the product. A node is a list [value, left,
+    right, s, t] of integer polynomials, where value is the product of
+    the children and s*left + t*right == 1 mod p. Leaves have no
+    children.
+    """
+    if len(f_list) == 1:
+        f = f_list[0]
+        return [IntPoly(f.to_sym_int_dict()), None, None, None, None], f
+    k = len(f_list)//2
+    left, g = _factor_tree(p, f_list[:k])
+    right, h = _factor_tree(p, f_list[k:])
+    x, s, t = gfpoly.xgcd(g, h)
+    gh = g*h
+    return [IntPoly(gh.to_sym_int_dict()), left, right,
+            IntPoly(s.to_sym_int_dict()), IntPoly(t.to_sym_int_dict())], gh
+
+def _lift_tree(m, f, node):
+    """Lifts the factorizations of a factor tree from mod m to mod
+    m**2, where f == value of the node mod m**2."""
+    node[0] = f
+    if node[1] is not None:
+        g, h, node[3], node[4] = hensel_step(m, f, node[1][0], node[2][0],
+                                             node[3], node[4])
+        _lift_tree(m, g, node[1])
+        _lift_tree(m, h, node[2])
+
+def _tree_leaves(node, leaves):
+    if node[1] is None:
+        leaves.append(node[0])
+    else:
+        _tree_leaves(node[1], leaves)
+        _tree_leaves(node[2], leaves)
+    return leaves
+
 def multi_hensel_lift(p, f, f_list, l):
     """Multifactor Hensel lifting.
 
@@ -218,39 +444,153 @@ def multi_hensel_lift(p, f, f_list, l):
         f = lc(f)*ff_1*...*ff_r mod p**l
         ff_i = f_i mod p
 
+    The factors are the leaves of a balanced factor tree, and every
+    Hensel step lifts all the nodes of the tree, so that no
+    factorization is lifted from mod p twice (von zur Gathen, Gerhard,
+    Modern Computer Algebra, algorithm 15.17).
     """
-    r = len(f_list)
     lc = f[f.degree]
-
-    if r == 1:
-        lc_g, lc_s, lc_t = modint.xgcd(lc, p**l)
-        return [f.scale(lc_s).mod_int(p**l, symmetric=True)]
-    k = int(r/2)
-    d = int(math.ceil(math.log(l, 2)))
-
-    # Divide and conquer the factors. 
+    pl = p**l
     IntModpPoly = gfpoly.GFPolyFactory(p)
-    g = IntModpPoly.from_int_dict({0:lc})
-    for f_i in f_list[0:k]:
-        g *= IntModpPoly.from_int_dict(f_i.coeffs)
-    h = IntModpPoly.from_int_dict(f_list[k].coeffs)
-    for f_i in f_list[k+1:]:
-        h *= IntModpPoly.from_int_dict(f_i.coeffs)
-    x, s, t = gfpoly.xgcd(g, h)
-    g = IntPoly(g.to_sym_int_dict())
-    h = IntPoly(h.to_sym_int_dict())
-    s = IntPoly(s.to_sym_int_dict())
-    t = IntPoly(t.to_sym_int_dict())
+    f_list = [IntModpPoly.from_int_dict(f_i.coeffs) for f_i in f_list]
+    # The leading coefficient goes into the leftmost leaf.
+    f_list[0] *= IntModpPoly.from_int_dict({0: lc})
+    tree = _factor_tree(p, f_list)[0]
 
-    # Lift the two coprime parts.
     m = p
-    for j in range(1, d+1):
-        g, h, s, t = hensel_step(m, f, g, h, s, t)
+    for j in xrange(int(math.ceil(math.log(l, 2)))):
+        _lift_tree(m, f, tree)
         m *= m
 
-    # Call recursively.
-    return multi_hensel_lift(p, g, f_list[0:k], l) \
-           + multi_hensel_lift(p, h, f_list[k:], l)
+    result = []
+    for g in _tree_leaves(tree, []):
+        lc_g, lc_s, lc_t = modint.xgcd(g[g.degree], pl)
+        result.append(g.scale(lc_s).mod_int(pl, symmetric=True))
+    return result
+
+# Fewest modular factors that are recombined by lattice reduction
+# instead of trying all subsets.
+lattice_threshold = 8
+
+# Number of primes that zassenhaus tries if there are at least
+# lattice_threshold modular factors.
+prime_trials = 3
+
+def _power_sums(g, count, m):
+    """The power sums s_1, ..., s_count of the roots of the monic
+    polynomial g mod m, from Newton's identities."""
+    n = g.degree
+    c = [g[e] for e in xrange(n + 1)]
+    s = [0]
+    for j in xrange(1, count + 1):
+        if j <= n:
+            t = j*c[n - j]
+        else:
+            t = 0
+        for i in xrange(1, min(j - 1, n) + 1):
+            t += c[n - i]*s[j - i]
+        s.append(-t % m)
+    return s[1:]
+
+def _root_bound(f):
+    """A bound of |lc(f)*x| for the roots x of f."""
+    return abs(f[f.degree]) + max([abs(c) for e, c in f.coeffs.iteritems()
+                                   if e < f.degree])
+
+def trace_precision(f, p, r, count):
+    """Smallest exponent a such that p**a is large enough for the
+    recombination of r factors with count power sums by
+    lattice_recombine."""
+    bound = 2**(r + 11)*f.degree*_root_bound(f)**count
+    a = 1
+    while p**a <= bound:
+        a += 1
+    return a
+
+def _lattice_factors(f, factors, vectors, m):
+    """Tries the partition of the modular factors into the supports of
+    the vectors. Returns the factors of f, or None."""
+    groups = {}
+    for i in xrange(len(factors)):
+        key = tuple([v[i] for v in vectors])
+        groups.setdefault(key, []).append(i)
+    if len(groups) != len(vectors):
+        return None
+    b = f[f.degree]
+    result = []
+    groups = groups.values()
+    groups.sort()
+    for S in groups:
+        g = IntPoly({0: b})
+        for i in S:
+            g = (g*factors[i]).mod_int(m, symmetric=True)
+        g = g.primitive()[1]
+        f, r = div(f, g)
+        if r:
+            return None
+        result.append(g)
+    return result
+
+def lattice_recombine(f, factors, p, a, count):
+    """Finds the factors of f from its lifted modular factors by
+    lattice reduction.
+
+    Input: a square-free primitive polynomial f of degree n and monic
+    polynomials f_1, ..., f_r with f == lc(f)*f_1*...*f_r mod p**a,
+    where a >= trace_precision(f, p, r, count).
+
+    Output: a list of the irreducible factors of f, or None if the
+    recombination failed.
+
+    For each factor g of f, lc(f)**j times the j-th power sum of the
+    roots of g is a small integer, which is the sum of those of the
+    f_i that divide g mod p. A reduced basis of the lattice made of
+    the leading bits of these power sums mod p**a contains the 0-1
+    vectors of the factors (van Hoeij, Factoring polynomials and the
+    knapsack problem, 2002). The power sums are added one by one,
+    until the basis vectors split the f_i into factors of f, or all
+    count power sums are used.
+    """
+    n = f.degree
+    r = len(factors)
+    b = f[n]
+    m = p**a
+    root_bound = _root_bound(f)
+    # Leading bits of each power sum in the lattice.
+    scale = 2**(r + 10)
+    sums = [_power_sums(g, count, m) for g in factors]
+    vectors = [[0]*i + [1] + [0]*(r - i - 1) for i in xrange(r)]
+    b_j = 1
+    for j in xrange(count):
+        if m <= 2*scale*n*root_bound**(j + 1):
+            break
+        b_j = b_j*b % m
+        column = [b_j*s[j] % m*scale//m for s in sums]
+        rows = []
+        for v in vectors:
+            t = 0
+            for i in xrange(r):
+                t += v[i]*column[i]
+            t %= scale
+            if 2*t > scale:
+                t -= scale
+            rows.append(v + [t])
+        rows.append([0]*len(vectors[0]) + [scale])
+        rows, d = lattice.lll(rows)
+        # Drop the last vectors whose Gram-Schmidt norms are larger than
+        # the vectors of the factors may be; the span of the others
+        # still contains them.
+        bound = r + (j + 1)*(r + 1)**2
+        k = len(rows)
+        while k and d[k] > bound*d[k-1]:
+            k -= 1
+        if k == 0:
+            return None
+        vectors = rows[:k]
+        result = _lattice_factors(f, factors, vectors, m)
+        if result is not None:
+            return result
+    return None
 
 def zassenhaus(f):
     """Factors a square-free primitive polynomial.
@@ -277,29 +617,49 @@ def zassenhaus(f):
         return [f]
     A = max([abs(c) for c in f.coeffs.itervalues()])
     b = f[n]
-    B = int(math.sqrt(n+1)*2**n*A*b)
+    B = int(math.sqrt(n+1)*2**n*A*abs(b))
     C = (n+1)**(2*n)*A**(2*n-1)
     gamma = int(math.ceil(2*math.log(C, 2)))
     prime_border = int(2*gamma*math.log(gamma)) + 1
 
-    # Choose a prime.
-    while True:
-        p = ntheory.generate.randprime(2, prime_border)
-        if b % p:
-            poly_type = gfpoly.GFPolyFactory(p)
-            ff = poly_type.from_int_dict(f.coeffs)
-            gg = gfpoly.gcd(ff, ff.diff())
-            if gg.degree == 0:
-                break
+    # Choose a prime and factor modulo it. If there are many modular
+    # factors, try some more primes and keep the fewest factors.
+    h = None
+    for i in xrange(prime_trials):
+        while True:
+            p = ntheory.generate.randprime(2, prime_border)
+            if b % p:
+                poly_type = gfpoly.GFPolyFactory(p)
+                ff = poly_type.from_int_dict(f.coeffs)
+                gg = gfpoly.gcd(ff, ff.diff())
+                if gg.degree == 0:
+                    break
+        mod_factors = gfpoly.factor_sqf(ff)
+        if h is None or len(mod_factors) - 1 < len(h):
+            h = [IntPoly(hh.to_sym_int_dict()) for hh in mod_factors[1:]]
+            best_p = p
+        if len(h) < lattice_threshold:
+            break
+    p = best_p
     l = int(math.ceil(math.log(2*B + 1, p)))
 
-    # Modular factorization.
-    mod_factors = gfpoly.factor_sqf(ff)
-    bb = mod_factors[0] # Leading coefficient mod p.
-    h = [IntPoly(hh.to_sym_int_dict()) for hh in mod_factors[1:]]
-
-    # Hensel lifting.
-    g = multi_hensel_lift(p, f, h, l)
+    r = len(h)
+    if r >= lattice_threshold:
+        # Hensel lifting and lattice recombination. If the first r power
+        # sums do not suffice, lift again for all n of them.
+        count = r
+        while True:
+            l = max(l, trace_precision(f, p, r, count))
+            g = multi_hensel_lift(p, f, h, l)
+            G = lattice_recombine(f, g, p, l, count)
+            if G is not None:
+                return G
+            if count == n:
+                break
+            count = n
+    else:
+        # Hensel lifting.
+        g = multi_hensel_lift(p, f, h, l)
 
     # Factor combination and trial division.
     G = []
@@ -0,0 +1,80 @@
+"""Integer lattices."""
+
+def _dot(u, v):
+    result = 0
+    for x, y in zip(u, v):
+        result += x*y
+    return result
+
+def lll(basis):
+    """LLL-reduction of a lattice basis with the constant 3/4.
+
+    Input: a list of linearly independent integer vectors.
+
+    Output: the reduced basis and a list d, such that d[i] is the
+    Gram determinant of the first i reduced vectors. The squared norm
+    of the i-th Gram-Schmidt vector (counting from 1) is d[i]/d[i-1].
+
+    The integral version of the algorithm is used, which works with
+    integers only (H. Cohen, A Course in Computational Algebraic
+    Number Theory, algorithm 2.6.7).
+
+    >>> lll([[1, 1, 1], [-1, 0, 2], [3, 5, 6]])[0]
+    [[0, 1, 0], [1, 0, 1], [-1, 0, 2]]
+    """
+    n = len(basis)
+    # The vectors, d and lam are indexed from 1, as in the reference.
+    b = [None] + [list(v) for v in basis]
+    d = [1] + [0]*n
+    lam = [[0]*(n + 1) for i in xrange(n + 1)]
+    if n == 0:
+        return [], d
+
+    def reduce(k, l):
+        if 2*abs(lam[k][l]) > d[l]:
+            q = (2*lam[k][l] + d[l]) // (2*d[l])
+            bl = b[l]
+            b[k] = [x - q*y for x, y in zip(b[k], bl)]
+            lam[k][l] -= q*d[l]
+            lam_k, lam_l = lam[k], lam[l]
+            for i in xrange(1, l):
+                lam_k[i] -= q*lam_l[i]
+
+    def swap(k):
+        b[k], b[k-1] = b[k-1], b[k]
+        lam_k, lam_k1 = lam[k], lam[k-1]
+        for j in xrange(1, k - 1):
+            lam_k[j], lam_k1[j] = lam_k1[j], lam_k[j]
+        l = lam_k[k-1]
+        B = (d[k-2]*d[k] + l*l) // d[k-1]
+        for i in xrange(k + 1, kmax + 1):
+            lam_i = lam[i]
+            t = lam_i[k]
+            lam_i[k] = (d[k]*lam_i[k-1] - l*t) // d[k-1]
+            lam_i[k-1] = (B*t + l*lam_i[k]) // d[k]
+        d[k-1] = B
+
+    d[1] = _dot(b[1], b[1])
+    k, kmax = 2, 1
+    while k <= n:
+        if k > kmax:
+            kmax = k
+            for j in xrange(1, k + 1):
+                u = _dot(b[k], b[j])
+                for i in xrange(1, j):
+                    u = (d[i]*u - lam[k][i]*lam[j][i]) // d[i-1]
+                if j < k:
+                    lam[k][j] = u
+                else:
+                    if u == 0:
+                        raise ValueError("linearly dependent vectors")
+                    d[k] = u
+        reduce(k, k - 1)
+        if 4*d[k]*d[k-2] < 3*d[k-1]**2 - 4*lam[k][k-1]**2:
+            swap(k)
+            k = max(2, k - 1)
+        else:
+            for l in xrange(k - 2, 0, -1):
+                reduce(k, l)
+            k += 1
+    return b[1:], d
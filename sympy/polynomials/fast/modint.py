@@ -65,13 +65,23 @@ class ModularInteger(object):
     def __nonzero__(self):
         return bool(self.value)
 
+_modular_integer_classes = {}
+
 def ModularIntegerFactory(m):
-    """Create custom class for specific integer modulus."""
+    """Create custom class for specific integer modulus.
+
+    The class is created once for each modulus m.
+    """
+    try:
+        return _modular_integer_classes[m]
+    except KeyError:
+        pass
 
     class newClass(ModularInteger):
         modulus = m
         
     newClass.__name__ = "IntMod%s" % m
+    _modular_integer_classes[m] = newClass
     return newClass
 
 def gcd(a, b):
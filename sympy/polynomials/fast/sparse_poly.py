@@ -1,5 +1,6 @@
 """Univariate polynomials in sparse representation"""
 
+import dense_poly
 
 class SparsePolynomial(object):
     """Dictionary-based polynomial representation. (abstract class)"""
@@ -75,10 +76,28 @@ class SparsePolynomial(object):
         return self.__class__(result_dict)
 
     def __mul__(self, other):
-        result = self.__class__()
-        for e, c in other.coeffs.iteritems():
-            result += self.scale(c, e)
-        return result
+        """Multiplication, with the dense algorithms if both factors
+        are dense (see dense_poly.is_dense)."""
+        if not self.coeffs or not other.coeffs:
+            return self.__class__()
+        if dense_poly.is_dense(self.coeffs, self.degree) \
+               and dense_poly.is_dense(other.coeffs, other.degree):
+            f = dense_poly.from_dict(self.coeffs, self.degree, self.zero)
+            g = dense_poly.from_dict(other.coeffs, other.degree, self.zero)
+            return self.__class__(dense_poly.to_dict(
+                dense_poly.mul(f, g, self.zero)))
+        result_dict = {}
+        for e1, c1 in self.coeffs.iteritems():
+            for e2, c2 in other.coeffs.iteritems():
+                e = e1 + e2
+                if e in result_dict:
+                    result_dict[e] += c1*c2
+                else:
+                    result_dict[e] = c1*c2
+        for e, c in result_dict.items():
+            if not c:
+                del result_dict[e]
+        return self.__class__(result_dict)
 
     def __pow__(self, exponent):
         """Repeated Squaring."""
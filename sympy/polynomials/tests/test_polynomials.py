@@ -81,6 +81,10 @@ def test_Polynomial():
 
     assert sqrt(y)*x == Polynomial(coeffs=((sqrt(y), Integer(1)),),
                                    var=[x]).sympy_expr
+    from sympy.polynomials.base import coefficients2sympy
+    # var need not be symbols
+    assert coefficients2sympy(((2, 1), (3, 0)), [2*x]) == 4*x + 3
+    assert coefficients2sympy(((2, 1), (3, 0)), [x + 1]) == 2*x + 5
     p = Polynomial(x/3 + 12*y + x**2/8)
     assert p.as_integer() == (24, Polynomial(3*x**2 + 8*x + 288*y))
     assert p.as_monic() == (Rational(1,8), Polynomial(x**2 + 96*y + 8*x/3))
@@ -90,6 +94,24 @@ def test_Polynomial():
     assert p.leading_coeff() == Rational(8)
     assert p.leading_term() == Polynomial(8*x**2)
 
+    from sympy.polynomials.base import monomial_key, integer_exponents
+    # The exponents are stored as Python integers.
+    f = Polynomial(x**2*y + 3*y - 1)
+    assert [type(e) for e in f.coeffs[0][1:]] == [int, int]
+    assert Polynomial(coeffs=((Integer(3), Integer(2)),), var=x).coeffs \
+           == integer_exponents(((Integer(3), Integer(2)),))
+    assert type(integer_exponents(((Integer(3), Integer(2)),))[0][1]) is int
+    terms = [(1, 0, 2), (1, 2, 0), (1, 1, 1), (1, 1, 0)]
+    terms.sort(key=monomial_key('lex'), reverse=True)
+    assert terms == [(1, 2, 0), (1, 1, 1), (1, 1, 0), (1, 0, 2)]
+    terms.sort(key=monomial_key('grevlex'), reverse=True)
+    assert terms == [(1, 2, 0), (1, 1, 1), (1, 0, 2), (1, 1, 0)]
+    py.test.raises(PolynomialException, "monomial_key('unknown')")
+    # Attributes of the SymPy expression are still available.
+    assert hash(f) == hash(f.sympy_expr)
+    assert f.subs(y, 1) == x**2 + 2
+    assert f.atoms(type=Symbol) == f.sympy_expr.atoms(type=Symbol)
+
 def test_coeff_ring():
     from sympy.polynomials.base import coeff_ring
     x = Symbol("x")
@@ -34,6 +34,52 @@ def test_ModularInteger():
     assert modint.crt([2, 3, 5], [-1, -1, -1], True) == -1
     assert modint.crt([2, 3, 5], [-1, -1, -1], False) == 2*3*5 - 1    
 
+# polynomials/fast/dense_poly.py
+
+def test_DensePoly():
+    from sympy.polynomials.fast import dense_poly, intpoly
+
+    assert dense_poly.add([1, 2, 3], [0, 1, -3]) == [1, 3]
+    assert dense_poly.sub([1], [1, 0, 2]) == [0, 0, -2]
+    assert dense_poly.mul([1, 1], [1, -1]) == [1, 0, -1]
+    assert dense_poly.mul([], [1, 2]) == []
+
+    f = [(3*i + 1) % 7 - 3 for i in xrange(100)]
+    g = [(5*i + 2) % 11 - 5 for i in xrange(77)]
+    assert dense_poly.mul_karatsuba(f, g) == dense_poly.mul_classical(f, g)
+    assert dense_poly.mul(f, g[:40]) == dense_poly.mul_classical(f, g[:40])
+    assert dense_poly.div_int(dense_poly.mul(f, g), g) == (f, [])
+
+    assert dense_poly.div_int([1, 0, 2], [1, 2]) == ([0, 1], [1, -1])
+    assert dense_poly.div_int([1, 0, 3], [1, 2]) == ([], [1, 0, 3])
+
+    f = intpoly.DenseIntPoly([-20, 8, 12])
+    assert f[1] == 8
+    assert f[5] == 0
+    assert f.degree == 2
+    assert f.to_dict() == {2:12, 1:8, 0:-20}
+    assert f.to_sparse().to_dense() == f
+    assert f.primitive() == (4, intpoly.DenseIntPoly([-5, 2, 3]))
+    assert f.evaluate(100) == 120780
+    assert f.diff() == intpoly.DenseIntPoly([8, 24])
+    assert f.mod_int(5, True) == intpoly.DenseIntPoly([0, -2, 2])
+    assert (f - f).degree == -1
+    assert f.scale(2, 1) == intpoly.DenseIntPoly([0, -40, 16, 24])
+    assert f**3 == f*f*f
+    assert (f**3).to_sparse() == f.to_sparse()**3
+    q, r = intpoly.div(f, intpoly.DenseIntPoly([0, 3]))
+    assert q == intpoly.DenseIntPoly([0, 4])
+    assert r == intpoly.DenseIntPoly([-20, 8])
+
+    # sparse polynomials use the dense algorithms when they are dense
+    f = intpoly.IntPoly(dict([(i, 2*i - 59) for i in xrange(60)]))
+    g = intpoly.IntPoly(dict([(i, 1 + i % 3) for i in xrange(50)]))
+    fg = (f.to_dense()*g.to_dense()).to_sparse()
+    assert f*g == fg
+    assert intpoly.div(fg, g) == (f, intpoly.IntPoly())
+    h = intpoly.IntPoly({100: 1, 0: 1})
+    assert h*h == intpoly.IntPoly({200: 1, 100: 2, 0: 1})
+
 # polynomials/fast/gfpoly.py
 
 def test_GFPoly():
@@ -133,6 +179,33 @@ def test_GFPoly():
     assert test_dict == {1: {1:1}, 3:{2:1, 0:1}, 6:{1:1, 0:1},
                          7:{2:1, 1:1, 0:-1}}
 
+def test_GFPoly_coefficients():
+    from sympy.polynomials.fast import gfpoly
+
+    IntMod7Poly = gfpoly.GFPolyFactory(7)
+    assert gfpoly.GFPolyFactory(7) is IntMod7Poly
+    f = IntMod7Poly.from_int_dict({3:-1, 1:9, 0:14})
+    assert f.coeffs == [0, 2, 0, 6]
+    assert f.to_int_dict() == {3:6, 1:2}
+    assert f.to_sym_int_dict() == {3:-1, 1:2}
+    assert f.scale(3) == IntMod7Poly([0, 6, 0, 4])
+    assert f.evaluate(2) == IntMod7Poly.coeff_type(3)
+
+    # long polynomials, with NumPy if it is installed
+    p = 2**31 - 1
+    IntModpPoly = gfpoly.GFPolyFactory(p)
+    f = IntModpPoly([(i**3 + 7) % p for i in xrange(150)] + [1])
+    g = IntModpPoly([(5*i**5 + 1) % p for i in xrange(100)] + [3])
+    h = IntModpPoly([i % p for i in xrange(1, 80)])
+    fg = f*g
+    assert fg.degree == 250
+    assert fg.coeffs == gfpoly.strip([c % p for c in
+        gfpoly.dense_poly.mul_classical(f.coeffs, g.coeffs)])
+    assert gfpoly.div(fg, g) == (f, IntModpPoly())
+    q, r = gfpoly.div(fg + h, g)
+    assert q == f and r == h
+    assert gfpoly.gcd(f*h, g*h) == h.monic()[1]
+
 
 # polynomials/fast/intpoly.py
 
@@ -192,3 +265,90 @@ def test_IntPoly():
     assert {2:2, 1:1, 0:4} in factors
     assert {2:3, 1:1, 0:1} in factors
     
+
+def test_IntPoly_multimodular():
+    from sympy.polynomials.fast import intpoly, gfpoly
+    from sympy.utilities import parallel
+
+    f = intpoly.IntPoly({3:2, 2:3})
+    g = intpoly.IntPoly({1:10, 0:15})
+    assert intpoly.gcd_multimodular(f, g) == intpoly.IntPoly({1:2, 0:3})
+    assert intpoly.gcd_multimodular(f.scale(4), g.scale(6)) \
+           == intpoly.IntPoly({1:4, 0:6})
+    assert intpoly.gcd_multimodular(f, intpoly.IntPoly({1:1, 0:1})) \
+           == intpoly.IntPoly({0:1})
+    assert intpoly.gcd_multimodular(f, intpoly.IntPoly({0:6})) \
+           == intpoly.IntPoly({0:1})
+
+    h = intpoly.IntPoly({7:3, 3:-1, 0:2})
+    f = intpoly.IntPoly(dict([(i, (i*i) % 17 - 20) for i in xrange(40)]))
+    g = intpoly.IntPoly(dict([(i, (i*i*i) % 13 + 1) for i in xrange(35)]))
+    assert intpoly.gcd_multimodular(f*h, g*h) == h
+
+    a = intpoly.IntPoly({1:1, 0:-3})
+    b = intpoly.IntPoly({1:1, 0:-5})
+    assert intpoly.resultant(a, b) == -2
+    assert intpoly.resultant(b, a) == 2
+    assert intpoly.resultant(a*b, b) == 0
+    assert intpoly.resultant(a, intpoly.IntPoly({0:4})) == 4
+    assert intpoly.discriminant(intpoly.IntPoly({2:1, 1:3, 0:-7})) == 37
+    assert intpoly.discriminant(intpoly.IntPoly({3:1, 1:-2, 0:5})) == -643
+
+    r = intpoly.resultant(f, g)
+    p = intpoly.modular_prime(0)
+    IntModpPoly = gfpoly.GFPolyFactory(p)
+    assert gfpoly.resultant(IntModpPoly.from_int_dict(f.coeffs),
+                            IntModpPoly.from_int_dict(g.coeffs)) \
+           == IntModpPoly.coeff_type(r)
+
+    if parallel.available:
+        assert intpoly.gcd_multimodular(f*h, g*h, processes=2) == h
+        assert intpoly.resultant(f, g, processes=2) == r
+        pool = parallel.get_pool(2)
+        parallel.close_pools()
+        assert parallel.get_pool(2) is not pool
+        parallel.close_pools()
+
+def test_IntPoly_factor():
+    from sympy.polynomials.fast import intpoly, gfpoly, lattice
+
+    basis, d = lattice.lll([[1, 1, 1], [-1, 0, 2], [3, 5, 6]])
+    assert basis == [[0, 1, 0], [1, 0, 1], [-1, 0, 2]]
+    assert d == [1, 1, 2, 9]
+
+    # x*(x + 1)*(x + 2) times two irreducible cubics mod 3.
+    IntMod3Poly = gfpoly.GFPolyFactory(3)
+    f = IntMod3Poly.from_int_dict({3:1, 1:-1}) \
+        * IntMod3Poly.from_int_dict({3:1, 1:-1, 0:1}) \
+        * IntMod3Poly.from_int_dict({3:1, 1:-1, 0:-1})
+    assert [g.degree for g in gfpoly.distinct_degree_factor(f)] == [3, 0, 6]
+    assert len(gfpoly.factor_sqf(f)) == 6
+
+    assert intpoly._power_sums(intpoly.IntPoly({2:1, 1:-3, 0:2}), 3, 100) \
+           == [3, 5, 9]
+
+    # The Swinnerton-Dyer polynomial of sqrt(2), sqrt(3), sqrt(5) and
+    # sqrt(7) is irreducible, but splits into factors of degree 1 or 2
+    # modulo every prime.
+    f = intpoly.IntPoly({16:1, 14:-136, 12:6476, 10:-141912, 8:1513334,
+                         6:-7453176, 4:13950764, 2:-5596840, 0:46225})
+    p = 13
+    IntModpPoly = gfpoly.GFPolyFactory(p)
+    h = [intpoly.IntPoly(g.to_sym_int_dict()) for g in
+         gfpoly.factor_sqf(IntModpPoly.from_int_dict(f.coeffs))[1:]]
+    assert len(h) >= intpoly.lattice_threshold
+    a = intpoly.trace_precision(f, p, len(h), 16)
+    g = intpoly.multi_hensel_lift(p, f, h, a)
+    assert intpoly.lattice_recombine(f, g, p, a, 16) == [f]
+
+    g = intpoly.IntPoly({8:1, 6:-40, 4:352, 2:-960, 0:576})
+    x = intpoly.IntPoly({1:1})
+    factors = intpoly.factor(f.scale(-6)*g*(x.scale(3) - g)**2)
+    assert factors[0] == (intpoly.IntPoly({0:6}), 1)
+    assert len(factors) == 4
+    assert (f, 1) in factors or (-f, 1) in factors
+    assert (g, 1) in factors or (-g, 1) in factors
+    assert (x.scale(3) - g, 2) in factors or (g - x.scale(3), 2) in factors
+
+    factors = intpoly.factor(intpoly.IntPoly({30:1, 0:-1}))
+    assert sorted([g.degree for g, e in factors[1:]]) == [1, 1, 2, 2, 4, 4, 8, 8]
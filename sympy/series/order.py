@@ -91,7 +91,7 @@ class Order(Basic, ArithMeths, RelMeths):
         else:
             symbols = list(expr.atoms(Basic.Symbol))
 
-        symbols.sort(Basic.compare)
+        symbols.sort(key=Basic.compare_key)
 
         if isinstance(expr, Order):
 
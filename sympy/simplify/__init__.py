@@ -3,4 +3,5 @@ from simplify import collect, separate, together, ratsimp, fraction, \
     simplify, trigsimp, powsimp, combsimp, hypersimp, hypersimilar, normal
 
 
-from rewrite import apart
\ No newline at end of file
+from rewrite import apart
+from cse import cse
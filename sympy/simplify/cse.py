@@ -0,0 +1,104 @@
+"""Module 'cse.py' contains common subexpression elimination.
+
+Subexpressions are identified by their hash, so that equal subtrees of
+any number of expressions are found in a single pass over the nodes.
+"""
+
+from sympy.core import Basic
+from sympy.utilities import numbered_symbols
+
+def _rebuildable(expr):
+    # nodes which can be rebuilt from their (changed) arguments
+    return isinstance(expr, (Basic.Add, Basic.Mul, Basic.Pow,
+                             Basic.SingleValuedFunction))
+
+def count_subexpressions(exprs):
+    """Count how often every compound subexpression of exprs is used.
+
+       An expression used n times counts once for each of its n uses,
+       its own subexpressions are not counted again for every use.
+       Returns a dictionary mapping the subexpressions to their counts.
+
+       >>> from sympy import *
+       >>> x, y = symbols('xy')
+       >>> counts = count_subexpressions([sin(x+y), cos(x+y), sin(x+y)])
+       >>> counts[x+y], counts[sin(x+y)]
+       (2, 2)
+    """
+    counts = {}
+    stack = list(exprs)
+    while stack:
+        expr = stack.pop()
+        if not expr._args:
+            continue
+        if expr in counts:
+            counts[expr] += 1
+            continue
+        counts[expr] = 1
+        if _rebuildable(expr):
+            for arg in expr._args:
+                if isinstance(arg, Basic):
+                    stack.append(arg)
+    return counts
+
+def cse(exprs, symbols=None):
+    """Perform common subexpression elimination on an expression or a
+       list of expressions.
+
+       Returns (replacements, reduced): replacements is a list of pairs
+       (symbol, subexpression) and reduced the list of the expressions
+       with all subexpressions used more than once replaced by symbols.
+       The subexpressions of the replacements are reduced in the same
+       way and only refer to symbols defined before them, so that the
+       original expressions are obtained by substituting the
+       replacements in reverse order.
+
+       The new symbols are taken from the iterator symbols, by default
+       x0, x1, ... skipping the symbols of exprs.
+
+       >>> from sympy import *
+       >>> x, y, z = symbols('xyz')
+       >>> cse([sin(x+y)**2 + z, z*sin(x+y)])
+       ([(x0, sin(x + y))], [z + x0**2, x0*z])
+    """
+    if isinstance(exprs, Basic):
+        exprs = [exprs]
+    exprs = [Basic.sympify(e) for e in exprs]
+    if symbols is None:
+        used = []
+        for e in exprs:
+            used.extend(e.atoms(type=Basic.Symbol))
+        symbols = numbered_symbols('x', exclude=used)
+
+    counts = count_subexpressions(exprs)
+    replacements = []
+    reduced = {}
+
+    def rebuild(expr):
+        try:
+            return reduced[expr]
+        except KeyError:
+            pass
+        if not expr._args:
+            return expr
+        new = expr
+        if _rebuildable(expr):
+            args = []
+            changed = False
+            for arg in expr._args:
+                if isinstance(arg, Basic):
+                    a = rebuild(arg)
+                    if a is not arg:
+                        changed = True
+                    arg = a
+                args.append(arg)
+            if changed:
+                new = expr.__class__(*args)
+        if counts[expr] > 1:
+            symbol = symbols.next()
+            replacements.append((symbol, new))
+            new = symbol
+        reduced[expr] = new
+        return new
+
+    return replacements, [rebuild(e) for e in exprs]
@@ -0,0 +1,55 @@
+from sympy import symbols, sin, cos, exp, sqrt, Symbol, Matrix, cse
+from sympy.simplify.cse import count_subexpressions
+
+x, y, z = symbols('xyz')
+
+def _restore(replacements, reduced):
+    for symbol, e in reversed(replacements):
+        reduced = [r.subs(symbol, e) for r in reduced]
+    return reduced
+
+def test_count_subexpressions():
+    counts = count_subexpressions([sin(x+y), cos(x+y), sin(x+y)])
+    assert counts[x+y] == 2
+    assert counts[sin(x+y)] == 2
+    assert counts[cos(x+y)] == 1
+    # atoms are not counted
+    assert x not in counts
+
+def test_cse_single():
+    e = sin(x+y)**2 + cos(x+y)**2 + x + y
+    replacements, reduced = cse(e)
+    assert len(replacements) == 1
+    x0 = replacements[0][0]
+    assert replacements[0][1] == x+y
+    # x + y is not a subtree of the flattened sum
+    assert reduced == [sin(x0)**2 + cos(x0)**2 + x + y]
+    assert _restore(replacements, reduced) == [e]
+
+def test_cse_nested():
+    # replacements refer only to earlier replacements
+    a = exp(x*y)
+    exprs = [sqrt(a + 1) + a, sqrt(a + 1)*z, x*y]
+    replacements, reduced = cse(exprs)
+    assert [r[1] for r in replacements] == [x*y, exp(replacements[0][0]),
+                                          sqrt(1 + replacements[1][0])]
+    assert _restore(replacements, reduced) == exprs
+
+def test_cse_symbols():
+    x0 = Symbol('x0')
+    replacements, reduced = cse([sin(x0+y), cos(x0+y)])
+    assert replacements[0][0] == Symbol('x1')
+    t = symbols('t0', 't1')
+    replacements, reduced = cse([sin(x+y), cos(x+y)], iter(t))
+    assert replacements == [(t[0], x+y)]
+    assert reduced == [sin(t[0]), cos(t[0])]
+    # nothing to eliminate
+    assert cse([x, sin(y)]) == ([], [x, sin(y)])
+
+def test_cse_jacobian():
+    f = Matrix([[sin(x*y)*exp(x+z), cos(x*y)*exp(x+z)]])
+    J = f.jacobian([x, y, z])
+    exprs = [J[i, j] for i in range(2) for j in range(3)]
+    replacements, reduced = cse(exprs)
+    assert len(replacements) > 0
+    assert _restore(replacements, reduced) == exprs
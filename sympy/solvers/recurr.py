@@ -494,6 +494,10 @@ def rsolve_hyper(coeffs, f, n, **hints):
     p_factors = [ z for z in set(roots(p, n)) ]
     q_factors = [ z for z in set(roots(q, n)) ]
 
+    # set order depends on hashes, sort to get reproducible solutions
+    p_factors.sort(key=Basic.compare_key, reverse=True)
+    q_factors.sort(key=Basic.compare_key, reverse=True)
+
     factors = [ (S.One, S.One) ]
 
     for p in p_factors:
@@ -530,7 +534,7 @@ def rsolve_hyper(coeffs, f, n, **hints):
             if not isinstance(coeff, Basic.Zero):
                 poly += coeff * Z**i
 
-        for z in set(roots(poly, Z)):
+        for z in sorted(set(roots(poly, Z)), key=Basic.compare_key):
             if not z.is_real or z.is_zero:
                 continue
 
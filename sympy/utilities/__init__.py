@@ -1,7 +1,7 @@
 
 import sys
 
-from iterables import make_list, flatten
+from iterables import make_list, flatten, numbered_symbols
 
 if sys.version_info[1] < 5:
     from iterables import any, all
@@ -9,4 +9,4 @@ else:
     any = any
     all = all
 
-from lambdify import lambdify
+from lambdify import lambdify, compile_function, evaluate_many
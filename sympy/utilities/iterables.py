@@ -83,3 +83,21 @@ def flatten(iterable):
             result.append(item)
 
     return result
+
+def numbered_symbols(prefix='x', start=0, exclude=[]):
+    """Generate an infinite stream of Symbols named by a prefix and
+       increasing numbers, skipping the names of the Symbols in
+       exclude.
+
+       >>> from sympy import *
+       >>> g = numbered_symbols('y', exclude=[Symbol('y1')])
+       >>> [g.next() for i in range(3)]
+       [y0, y2, y3]
+    """
+    from sympy.core import Symbol
+    exclude = dict([(str(s), True) for s in exclude])
+    while True:
+        name = '%s%s' % (prefix, start)
+        start += 1
+        if name not in exclude:
+            yield Symbol(name)
@@ -1,68 +1,591 @@
-from __future__ import division
-
-from sympy import Basic, Symbol
-from math import sin, cos, tan, asin, acos, atan, log, pi, exp
-Pi = pi
-E = exp(1)
-
-def lambdify(*args):
-    """
-    >>> from sympy import symbols, sqrt
-    >>> x,y,z = symbols('xyz')
-    >>> f = lambdify(x**2, [x])
-    >>> f(2)
-    4
-    >>> f = lambdify([z,y,x], [x,y,z])
-    >>> f(1,2,3)
-    (3, 2, 1)
-    >>> f = lambdify(sqrt(x), [x])
-    >>> f(4)
-    2.0
-    """
-    lstr = lambdastr(*args)
-    #print lstr
-    return eval(lstr)
-
-def lambdastr(*args):
-    """
-    >>> from sympy import symbols
-    >>> x,y,z = symbols('xyz')
-    >>> lambdastr(x**2, [x])
-    'lambda x: (x**2)'
-    >>> lambdastr([z,y,x], [x,y,z])
-    'lambda x,y,z: (z,y,x)'
-    """
-    assert len(args) == 2
-
-    if isinstance(args[0], str) and isinstance(args[1], str):
-        exprs, vargs = args
-
-    elif isinstance(args[1], (list, tuple)):
-        vargs = args[1]
-
-        for v in vargs:
-            assert isinstance(v, Symbol)
-
-        if isinstance(args[0], (list, tuple)):
-            exprs = list(args[0])
-        else: exprs = [args[0]]
-
-        for e in xrange(len(exprs)):
-            exprs[e] = Basic.sympify(exprs[e])
-            for a in exprs[e].atoms(type=Symbol):
-                assert a in vargs
-
-        vargs = ','.join(str(v) for v in vargs)
-        exprs = ','.join(str(e) for e in exprs)
-
-    else: raise ValueError("Lambdification requires arguments "
-                           "of the form expr(s), vars. Examples: "
-                           "(x**2, [x]) or ([x**2, 1/y], [x,y]).")
-
-    return "lambda %s: (%s)" % (vargs, exprs)
-
-if __name__ == '__main__':
-    from sympy import symbols
-    x,y,z = symbols('xyz')
-    print lambdastr(x**2, [x])
-    print lambdastr([z,y,x], [x,y,z])
+from __future__ import division
+
+from sympy import Basic, Symbol
+from math import sin, cos, tan, asin, acos, atan, log, pi, exp
+Pi = pi
+E = exp(1)
+
+def lambdify(*args, **kwargs):
+    """
+    Create a Python function evaluating expression(s) in the given
+    variables.
+
+    The expressions are compiled with compile_function (equal
+    subexpressions are computed once and the result is cached), the
+    keyword argument backend selects the numerical functions used, see
+    compile_function. Expressions that cannot be compiled are translated
+    to Python source with lambdastr instead.
+
+    >>> from sympy import symbols, sqrt
+    >>> x,y,z = symbols('xyz')
+    >>> f = lambdify(x**2, [x])
+    >>> f(2)
+    4
+    >>> f = lambdify([z,y,x], [x,y,z])
+    >>> f(1,2,3)
+    (3, 2, 1)
+    >>> f = lambdify(sqrt(x), [x])
+    >>> f(4)
+    2.0
+    """
+    backend = kwargs.get('backend', 'math')
+    exprs, vargs = _lambdify_args(*args)
+    if exprs is not None:
+        try:
+            return compile_function(exprs, vargs, backend)
+        except ValueError:
+            if backend != 'math':
+                raise
+    lstr = lambdastr(*args)
+    #print lstr
+    return eval(lstr)
+
+def _split_args(s):
+    # split s at the commas that are not enclosed in parentheses
+    parts = []
+    depth = 0
+    start = 0
+    for i, c in enumerate(s):
+        if c in '([':
+            depth += 1
+        elif c in ')]':
+            depth -= 1
+        elif c == ',' and depth == 0:
+            parts.append(s[start:i])
+            start = i + 1
+    parts.append(s[start:])
+    return [part.strip() for part in parts]
+
+def _lambdify_args(*args):
+    # validate the arguments of lambdify and return (exprs, vargs), where
+    # exprs is an expression or a list of expressions; exprs is None for
+    # strings that cannot be converted to expressions
+    assert len(args) == 2
+    if isinstance(args[0], str) and isinstance(args[1], str):
+        vargs = [Symbol(v) for v in _split_args(args[1]) if v]
+        exprs = _split_args(args[0])
+        try:
+            exprs = [Basic.sympify(e) for e in exprs]
+        except (ValueError, SyntaxError):
+            return None, vargs
+        if len(exprs) == 1:
+            exprs = exprs[0]
+        return exprs, vargs
+    elif isinstance(args[1], (list, tuple)):
+        vargs = list(args[1])
+        for v in vargs:
+            assert isinstance(v, Symbol)
+        if isinstance(args[0], (list, tuple)):
+            exprs = [Basic.sympify(e) for e in args[0]]
+            l = exprs
+        else:
+            exprs = Basic.sympify(args[0])
+            l = [exprs]
+        for e in l:
+            for a in e.atoms(type=Symbol):
+                assert a in vargs
+        return exprs, vargs
+    raise ValueError("Lambdification requires arguments "
+                     "of the form expr(s), vars. Examples: "
+                     "(x**2, [x]) or ([x**2, 1/y], [x,y]).")
+
+def lambdastr(*args):
+    """
+    >>> from sympy import symbols
+    >>> x,y,z = symbols('xyz')
+    >>> lambdastr(x**2, [x])
+    'lambda x: (x**2)'
+    >>> lambdastr([z,y,x], [x,y,z])
+    'lambda x,y,z: (z,y,x)'
+    """
+    assert len(args) == 2
+
+    if isinstance(args[0], str) and isinstance(args[1], str):
+        exprs, vargs = args
+
+    elif isinstance(args[1], (list, tuple)):
+        vargs = args[1]
+
+        for v in vargs:
+            assert isinstance(v, Symbol)
+
+        if isinstance(args[0], (list, tuple)):
+            exprs = list(args[0])
+        else: exprs = [args[0]]
+
+        for e in xrange(len(exprs)):
+            exprs[e] = Basic.sympify(exprs[e])
+            for a in exprs[e].atoms(type=Symbol):
+                assert a in vargs
+
+        vargs = ','.join(str(v) for v in vargs)
+        exprs = ','.join(str(e) for e in exprs)
+
+    else: raise ValueError("Lambdification requires arguments "
+                           "of the form expr(s), vars. Examples: "
+                           "(x**2, [x]) or ([x**2, 1/y], [x,y]).")
+
+    return "lambda %s: (%s)" % (vargs, exprs)
+
+# Compilation
+#
+# An expression is compiled once into a flat sequence of instructions
+# which operate on registers. Registers 0..n-1 hold the values of the n
+# variables, every instruction computes one new register and equal
+# subexpressions share their register.
+#
+# compile_function turns such a program into the source of a Python
+# function with one local variable per register, using the functions of
+# a selectable backend (math, cmath, numpy or the Float class of
+# sympy.numerics). evaluate_many executes the program column-wise
+# instead: each register holds the values for all points at once (a
+# NumPy array, or a list of floats when NumPy is not available), so the
+# interpretation overhead is paid once per instruction and not once per
+# point.
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+import math
+import cmath
+import operator
+import array
+
+from sympy.core.cache import cache_manager
+
+# implementations of the compiled functions for each backend: names of
+# attributes of the backend module, or the functions themselves
+backend_functions = {
+    'math' : {
+        'sin' : 'sin', 'cos' : 'cos', 'tan' : 'tan',
+        'asin' : 'asin', 'acos' : 'acos', 'atan' : 'atan',
+        'sinh' : 'sinh', 'cosh' : 'cosh', 'tanh' : 'tanh',
+        'exp' : 'exp', 'log' : 'log', 'sqrt' : 'sqrt',
+        'abs' : 'fabs', 'floor' : 'floor', 'ceiling' : 'ceil',
+        },
+    'cmath' : {
+        'sin' : 'sin', 'cos' : 'cos', 'tan' : 'tan',
+        'asin' : 'asin', 'acos' : 'acos', 'atan' : 'atan',
+        'sinh' : 'sinh', 'cosh' : 'cosh', 'tanh' : 'tanh',
+        'exp' : 'exp', 'log' : 'log', 'sqrt' : 'sqrt',
+        'abs' : abs,
+        },
+    'numpy' : {
+        'sin' : 'sin', 'cos' : 'cos', 'tan' : 'tan',
+        'asin' : 'arcsin', 'acos' : 'arccos', 'atan' : 'arctan',
+        'sinh' : 'sinh', 'cosh' : 'cosh', 'tanh' : 'tanh',
+        'exp' : 'exp', 'log' : 'log', 'sqrt' : 'sqrt',
+        'abs' : 'absolute', 'floor' : 'floor', 'ceiling' : 'ceil',
+        },
+    'float' : {
+        'sin' : 'sin', 'cos' : 'cos', 'tan' : 'tan', 'atan' : 'atan',
+        'exp' : 'exp', 'log' : 'log', 'sqrt' : 'sqrt',
+        'abs' : abs,
+        },
+    }
+
+def _backend_module(backend):
+    if backend == 'math':
+        return math
+    if backend == 'cmath':
+        return cmath
+    if backend == 'numpy':
+        if numpy is None:
+            raise ImportError("NumPy is not available")
+        return numpy
+    if backend == 'float':
+        from sympy.numerics import functions
+        return functions
+    raise ValueError("unknown backend %r" % backend)
+
+def compile_program(expr, vargs):
+    """
+    Compile expr to a flat instruction sequence in the variables vargs.
+
+    Returns (program, constants, nregs, result): program is a list of
+    instructions (opcode, dest, operands), constants a list of
+    (register, number) pairs, nregs the number of registers and result the
+    register holding the value of expr. expr can also be a list of
+    expressions, result is a list of registers then. Equal subexpressions
+    are computed only once.
+
+    >>> from sympy import symbols, sin
+    >>> x, y = symbols('xy')
+    >>> program, constants, nregs, result = compile_program(sin(x)*y + sin(x), [x, y])
+    >>> for instruction in program: print instruction
+    ('call', 2, ('sin', 0))
+    ('mul', 3, (1, 2))
+    ('add', 4, (3, 2))
+    """
+    registers = {}
+    for i, v in enumerate(vargs):
+        registers[v] = i
+    program = []
+    constants = []
+    nregs = [len(vargs)]
+
+    def new_register():
+        r = nregs[0]
+        nregs[0] += 1
+        return r
+
+    def visit(e):
+        try:
+            return registers[e]
+        except KeyError:
+            pass
+        if isinstance(e, (Basic.Number, Basic.NumberSymbol,
+                          Basic.ImaginaryUnit)):
+            r = new_register()
+            constants.append((r, e))
+        elif isinstance(e, Basic.Symbol):
+            raise ValueError("%s is not one of the variables %s" % (e, vargs))
+        elif isinstance(e, (Basic.Add, Basic.Mul)):
+            operands = tuple([visit(a) for a in e])
+            r = new_register()
+            program.append((e.__class__.__name__.lower(), r, operands))
+        elif isinstance(e, Basic.Pow):
+            operands = (visit(e.base), visit(e.exp))
+            r = new_register()
+            program.append(('pow', r, operands))
+        elif isinstance(e, Basic.Function) and len(e) == 1 \
+                 and e.__class__.__name__ in backend_functions['math']:
+            operand = visit(e[0])
+            r = new_register()
+            program.append(('call', r, (e.__class__.__name__, operand)))
+        else:
+            raise ValueError("cannot compile %s" % e)
+        registers[e] = r
+        return r
+
+    if isinstance(expr, (list, tuple)):
+        result = [visit(Basic.sympify(e)) for e in expr]
+    else:
+        result = visit(Basic.sympify(expr))
+    return program, constants, nregs[0], result
+
+def _float_constant(c):
+    if isinstance(c, Basic.ImaginaryUnit):
+        raise ValueError("%s is not real" % c)
+    return float(c)
+
+def _emit_constant(c, r, backend, namespace, lines):
+    # bind the value of the constant c to register r, either in the
+    # namespace of the function or by a line of its body
+    name = 'r%d' % r
+    if backend == 'float':
+        # Float constants are created when the function is called, so
+        # that they have the working precision of that call
+        if isinstance(c, Basic.ImaginaryUnit):
+            lines.append('%s = ComplexFloat(0, 1)' % name)
+        elif isinstance(c, (Basic.Infinity, Basic.NegativeInfinity,
+                            Basic.NaN)):
+            raise ValueError("%s has no Float value" % c)
+        elif isinstance(c, Basic.Integer):
+            namespace[name] = c.p
+        elif isinstance(c, Basic.Rational):
+            namespace['k%d' % r] = c
+            lines.append('%s = Float(k%d)' % (name, r))
+        elif isinstance(c, Basic.Real):
+            namespace['k%d' % r] = str(c)
+            lines.append('%s = Float(k%d)' % (name, r))
+        elif isinstance(c, Basic.Pi):
+            lines.append('%s = pi_float()' % name)
+        elif isinstance(c, Basic.Exp1):
+            lines.append('%s = exp(Float(1))' % name)
+        else:
+            namespace['k%d' % r] = float(c)
+            lines.append('%s = Float(k%d)' % (name, r))
+    elif isinstance(c, Basic.ImaginaryUnit):
+        if backend == 'math':
+            raise ValueError("%s is not real" % c)
+        namespace[name] = 1j
+    elif isinstance(c, Basic.Integer) and backend != 'numpy':
+        namespace[name] = c.p
+    elif backend == 'cmath':
+        # complex exponents make powers of negative numbers complex
+        namespace[name] = complex(c)
+    else:
+        namespace[name] = float(c)
+
+def _function_source(program, constants, nargs, result, backend, namespace):
+    # the source of a function computing program, the names it uses are
+    # added to namespace
+    functions = backend_functions[backend]
+    module = _backend_module(backend)
+    lines = []
+    values = {}
+    for r, c in constants:
+        values[r] = c
+        _emit_constant(c, r, backend, namespace, lines)
+    for op, dest, operands in program:
+        if op != 'call':
+            regs = ['r%d' % r for r in operands]
+        if op == 'add':
+            code = ' + '.join(regs)
+        elif op == 'mul':
+            code = ' * '.join(regs)
+        elif op == 'pow':
+            e = values.get(operands[1])
+            if isinstance(e, Basic.Half):
+                code = 'sqrt(%s)' % regs[0]
+                names = ['sqrt']
+            elif backend == 'float' and not isinstance(e, Basic.Integer):
+                # Float only implements integer powers and square roots
+                code = 'exp(log(%s) * %s)' % tuple(regs)
+                names = ['exp', 'log']
+            else:
+                code = '%s ** %s' % tuple(regs)
+                names = []
+            for name in names:
+                namespace[name] = getattr(module, functions[name])
+        else:
+            name, arg = operands
+            if name not in functions:
+                raise ValueError("%s is not available in the %s backend"
+                                 % (name, backend))
+            f = functions[name]
+            if isinstance(f, str):
+                f = getattr(module, f)
+            namespace[name] = f
+            code = '%s(r%d)' % (name, arg)
+        lines.append('r%d = %s' % (dest, code))
+    if isinstance(result, list):
+        lines.append('return (%s,)' % ', '.join(['r%d' % r for r in result]))
+    else:
+        lines.append('return r%d' % result)
+    args = ', '.join(['r%d' % i for i in xrange(nargs)])
+    return 'def f(%s):\n    %s\n' % (args, '\n    '.join(lines))
+
+def function_source(exprs, vargs, backend='math'):
+    """
+    Returns (source, namespace): the source of the function f created
+    by compile_function, and the names it uses besides its arguments.
+
+    Executing the source in (a copy of) the namespace defines f. For
+    the math and cmath backends the namespace only holds numbers and
+    functions of the backend module, so that both can be pickled and
+    sent to other processes.
+
+    >>> from sympy import symbols, sin
+    >>> x, y = symbols('xy')
+    >>> source, namespace = function_source(sin(x)*y + sin(x), [x, y])
+    >>> print source
+    def f(r0, r1):
+        r2 = sin(r0)
+        r3 = r1 * r2
+        r4 = r3 + r2
+        return r4
+    <BLANKLINE>
+    """
+    program, constants, nregs, result = compile_program(exprs, vargs)
+    namespace = {}
+    if backend == 'float':
+        from sympy.numerics import Float, ComplexFloat
+        from sympy.numerics.constants import pi_float
+        namespace['Float'] = Float
+        namespace['ComplexFloat'] = ComplexFloat
+        namespace['pi_float'] = pi_float
+        namespace['exp'] = _backend_module(backend).exp
+    source = _function_source(program, constants, len(vargs), result,
+                              backend, namespace)
+    return source, namespace
+
+_compiled_functions = cache_manager.new_cache('sympy.utilities.lambdify.compile_function')
+
+def compile_function(exprs, vargs, backend='math'):
+    """
+    Compile an expression or a list of expressions to a Python function
+    of the variables vargs.
+
+    The expression tree is translated directly to Python code (see
+    compile_program), computing equal subexpressions only once. The
+    numerical functions are taken from the backend:
+
+      'math'   floats (the default)
+      'cmath'  complex numbers
+      'numpy'  NumPy arrays, using ufuncs
+      'float'  arbitrary precision Float numbers of sympy.numerics,
+               constants have the working precision of each call
+
+    Compiled functions are cached, so compiling the same expressions
+    again is cheap. A ValueError is raised for expressions that cannot
+    be compiled.
+
+    >>> from sympy import symbols, sin, pi
+    >>> x, y = symbols('xy')
+    >>> f = compile_function([x*y, sin(x*y)], [x, y])
+    >>> f(0, 2)
+    (0, 0.0)
+    >>> compile_function([x*y, sin(x*y)], [x, y]) is f
+    True
+    >>> from sympy.numerics import Float
+    >>> Float.setdps(30)
+    >>> print compile_function(2*pi, [], 'float')()
+    6.28318530717958647692528676656
+    >>> Float.setdps(15)
+    """
+    if isinstance(exprs, (list, tuple)):
+        exprs = [Basic.sympify(e) for e in exprs]
+        key = (tuple(exprs), tuple(vargs), backend, True)
+    else:
+        exprs = Basic.sympify(exprs)
+        key = (exprs, tuple(vargs), backend, False)
+    try:
+        return _compiled_functions[key]
+    except KeyError:
+        pass
+    source, namespace = function_source(exprs, vargs, backend)
+    namespace = dict(namespace)
+    exec source in namespace
+    f = namespace['f']
+    _compiled_functions[key] = f
+    return f
+
+# errors of the math functions at invalid points
+_invalid_errors = (ValueError, ZeroDivisionError, OverflowError)
+_inf = 1e300 * 1e300
+_nan = _inf - _inf
+
+def _invalid_result(name, args):
+    # the value NumPy gives where the math function raises an error
+    a = args[0]
+    if name == 'log' and a == 0:
+        return -_inf
+    if name in ('exp', 'cosh') or (name == 'sinh' and a > 0):
+        return _inf
+    if name == 'sinh':
+        return -_inf
+    if name == 'pow':
+        # 0**negative, overflow, or a negative base
+        b = args[1]
+        if a >= 0:
+            return _inf
+        if b == int(b):
+            if int(b) % 2:
+                return -_inf
+            return _inf
+    return _nan
+
+def _checked(f, name):
+    # f with _invalid_result instead of errors
+    def checked_f(*args):
+        try:
+            return f(*args)
+        except _invalid_errors:
+            return _invalid_result(name, args)
+    return checked_f
+
+def _map2(f, a, b):
+    # apply f elementwise, a and b are lists of floats or floats
+    if isinstance(a, list):
+        if isinstance(b, list):
+            return map(f, a, b)
+        return [f(u, b) for u in a]
+    if isinstance(b, list):
+        return [f(a, v) for v in b]
+    return f(a, b)
+
+def _map1(f, a):
+    # apply f elementwise, a is a list of floats or a float
+    if isinstance(a, list):
+        return map(f, a)
+    return f(a)
+
+def _run_lists(program, registers):
+    # execute program on registers holding lists of floats (or floats)
+    #
+    # An instruction which raises an error at some point is repeated
+    # point by point, giving inf or nan there like NumPy does.
+    for op, dest, operands in program:
+        if op == 'call':
+            name, arg = operands
+            f = getattr(math, backend_functions['math'][name])
+            a = registers[arg]
+            try:
+                r = _map1(f, a)
+            except _invalid_errors:
+                r = _map1(_checked(f, name), a)
+        else:
+            f = {'add' : operator.add, 'mul' : operator.mul,
+                 'pow' : operator.pow}[op]
+            r = registers[operands[0]]
+            for arg in operands[1:]:
+                try:
+                    r = _map2(f, r, registers[arg])
+                except _invalid_errors:
+                    r = _map2(_checked(f, op), r, registers[arg])
+        registers[dest] = r
+
+def _run_numpy(program, registers):
+    # execute program on registers holding NumPy arrays (or floats)
+    for op, dest, operands in program:
+        if op == 'call':
+            name, arg = operands
+            r = getattr(numpy, backend_functions['numpy'][name])(registers[arg])
+        elif op == 'pow':
+            r = numpy.power(registers[operands[0]], registers[operands[1]])
+        else:
+            f = {'add' : numpy.add, 'mul' : numpy.multiply}[op]
+            r = registers[operands[0]]
+            for arg in operands[1:]:
+                r = f(r, registers[arg])
+        registers[dest] = r
+
+def evaluate_many(expr, vargs, points, use_numpy=None):
+    """
+    Evaluate expr at many points at once.
+
+    vargs is a list of symbols and points a sequence of tuples with one
+    value for each symbol (or of numbers when there is only one symbol),
+    or a NumPy array of shape (number of points, len(vargs)). The
+    expression is compiled only once (see compile_program).
+
+    Returns a NumPy array of floats, or an array.array('d') when NumPy is
+    not available (or use_numpy is False). Points where expr is not
+    defined give inf or nan with both, as with NumPy's functions.
+
+    >>> from sympy import symbols, sqrt
+    >>> x, y = symbols('xy')
+    >>> list(evaluate_many(x**2 + y, [x, y], [(1, 2), (3, 4)], use_numpy=False))
+    [3.0, 13.0]
+    >>> list(evaluate_many(sqrt(x), [x], [0, 1, 4], use_numpy=False))
+    [0.0, 1.0, 2.0]
+    """
+    if use_numpy is None:
+        use_numpy = numpy is not None
+    elif use_numpy and numpy is None:
+        raise ImportError("NumPy is not available")
+    program, constants, nregs, result = compile_program(expr, vargs)
+    n = len(points)
+    registers = [None] * nregs
+    if use_numpy:
+        points = numpy.asarray(points, dtype=float).reshape((n, len(vargs)))
+        for i in xrange(len(vargs)):
+            registers[i] = points[:, i]
+        for r, value in constants:
+            registers[r] = _float_constant(value)
+        _run_numpy(program, registers)
+        r = registers[result]
+        if not isinstance(r, numpy.ndarray):
+            r = numpy.array([r] * n, dtype=float)
+        return r.astype(float)
+    if len(vargs) == 1:
+        points = [(p,) for p in points]
+    for i in xrange(len(vargs)):
+        registers[i] = [float(p[i]) for p in points]
+    for r, value in constants:
+        registers[r] = _float_constant(value)
+    _run_lists(program, registers)
+    r = registers[result]
+    if not isinstance(r, list):
+        r = [r] * n
+    return array.array('d', r)
+
+if __name__ == '__main__':
+    from sympy import symbols
+    x,y,z = symbols('xyz')
+    print lambdastr(x**2, [x])
+    print lambdastr([z,y,x], [x,y,z])
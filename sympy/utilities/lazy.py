@@ -0,0 +1,72 @@
+"""
+Modules which import some of their attributes on first access.
+
+A package replaces itself by a LazyModule at the end of its __init__
+(see make_lazy()), so that its heavy subpackages are only imported
+when one of their names is used:
+
+>>> import sympy, sys
+>>> from sympy.utilities.lazy import LazyModule
+>>> isinstance(sympy, LazyModule)
+True
+>>> from sympy import Point
+>>> 'sympy.geometry' in sys.modules
+True
+"""
+
+import sys
+from types import ModuleType
+
+class LazyModule(ModuleType):
+    """
+    A module whose attributes listed in lazy are imported when they
+    are first accessed. lazy maps each name to the absolute name of
+    the module that defines it, or to None for a submodule of this
+    module. Once imported, the attribute is stored in the module's
+    dictionary and found by the normal attribute lookup.
+    """
+
+    def __init__(self, name, lazy):
+        ModuleType.__init__(self, name)
+        self.__dict__['_lazy'] = lazy
+
+    def __getattr__(self, name):
+        # only called when the normal lookup fails
+        lazy = self.__dict__['_lazy']
+        if name not in lazy:
+            raise AttributeError("'module' object has no attribute '%s'" % name)
+        module = lazy[name]
+        if module is None:
+            module = '%s.%s' % (self.__name__, name)
+            __import__(module)
+            value = sys.modules[module]
+        else:
+            __import__(module)
+            value = getattr(sys.modules[module], name)
+        self.__dict__[name] = value
+        return value
+
+    def __dir__(self):
+        names = dict.fromkeys(self.__dict__.keys() + self._lazy.keys())
+        names = names.keys()
+        names.sort()
+        return names
+
+def make_lazy(name, lazy, exported):
+    """
+    Replaces the module name in sys.modules by a LazyModule with
+    the same contents and the lazily imported attributes lazy (see
+    LazyModule). __all__ lists the public names of the module and
+    those of lazy which are in exported, so that "from name import *"
+    imports these. To be called at the end of the module's code;
+    "import name" returns the replacement.
+    """
+    module = sys.modules[name]
+    new = LazyModule(name, lazy)
+    for key, value in module.__dict__.items():
+        new.__dict__[key] = value
+    names = [n for n in module.__dict__.keys() if not n.startswith('_')]
+    names.extend([n for n in exported if n not in module.__dict__])
+    new.__dict__['__all__'] = names
+    sys.modules[name] = new
+    return new
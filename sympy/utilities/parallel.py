@@ -0,0 +1,53 @@
+"""
+Pools of worker processes for computations that split into independent
+tasks, like the evaluation of plots or the images of a polynomial
+modulo many primes.
+
+Requires the multiprocessing module; available tells if it can be
+imported. The functions run by the workers must be defined at the top
+level of a module, and their arguments and results must be picklable.
+
+The pools are kept until close_pools() is called, which also happens
+when the interpreter exits.
+"""
+
+import sys
+import atexit
+
+try:
+    import multiprocessing
+except ImportError:
+    multiprocessing = None
+
+available = multiprocessing is not None
+
+_pools = {}
+
+def get_pool(processes):
+    """
+    Returns the pool with the given number of worker
+    processes, creating it on first use.
+    """
+    pool = _pools.get(processes)
+    if pool is None:
+        # The new workers close sys.stdin, which fails for replacements
+        # of it without a close method (e.g. the one of py.test), so they
+        # are started with the original one.
+        stdin = sys.stdin
+        sys.stdin = sys.__stdin__
+        try:
+            pool = _pools[processes] = multiprocessing.Pool(processes)
+        finally:
+            sys.stdin = stdin
+    return pool
+
+def close_pools():
+    """
+    Terminates the worker processes of all pools.
+    """
+    for processes in _pools.keys():
+        pool = _pools.pop(processes)
+        pool.terminate()
+        pool.join()
+
+atexit.register(close_pools)
@@ -96,3 +96,85 @@ def test_str_args():
         f(0)
         raise Exception()
     except TypeError: pass
+
+def test_evaluate_many():
+    from sympy import Rational, exp, log, evaluate_many
+    from sympy.utilities.lambdify import compile_program
+    e = x**2 + y*sin(z)
+    points = [(1, 2, 0), (2, 1, pi/2), (-1, 0.5, 1)]
+    r = evaluate_many(e, [x, y, z], points)
+    assert len(r) == 3
+    for v, p in zip(r, points):
+        assert abs(v - e.subs_dict({x: p[0], y: p[1], z: p[2]})) < 1e-12
+    assert list(e.evaluate_many([x, y, z], points)) == list(r)
+    # the array module fallback gives the same results
+    assert list(evaluate_many(e, [x, y, z], points, use_numpy=False)) == list(r)
+    # a single variable and constant expressions
+    assert list(evaluate_many(sqrt(x) + Rational(1, 2), [x], [0, 4])) == [0.5, 2.5]
+    assert list(evaluate_many(2*pi, [x], [1, 2])) == [2*3.141592653589793]*2
+    assert abs(evaluate_many(exp(log(x)), [x], [3])[0] - 3) < 1e-12
+    # equal subexpressions are computed once
+    program = compile_program(sin(x)**2 + sin(x), [x])[0]
+    assert len([i for i in program if i[0] == 'call']) == 1
+    try:
+        evaluate_many(x + y, [x], [1])
+        assert False
+    except ValueError:
+        pass
+
+def test_compile_function():
+    from sympy import Rational, I, exp, E
+    from sympy.utilities.lambdify import compile_function, numpy
+    f = compile_function([x*y, sin(x*y)**2 + sin(x*y)], [x, y])
+    assert f(0, 2) == (0, 0.0)
+    assert abs(f(1, 2)[1] - (0.826821810431806 + 0.909297426825682)) < 1e-12
+    # compiled functions are cached
+    assert compile_function([x*y, sin(x*y)**2 + sin(x*y)], [x, y]) is f
+    assert lambdify([x*y, sin(x*y)**2 + sin(x*y)], [x, y]) is f
+    assert compile_function(x*y, [x, y]) is not compile_function(x*y, [y, x])
+    # powers of negative numbers are complex in cmath
+    f = compile_function(x**Rational(1, 2) + I*x, [x], 'cmath')
+    assert abs(f(-4) - (-2j)) < 1e-12
+    try:
+        compile_function(I*x, [x])
+        assert False
+    except ValueError:
+        pass
+    # Float constants have the working precision of the call
+    from sympy.numerics import Float
+    f = compile_function(sqrt(x) + 2*pi + E, [x], 'float')
+    assert isinstance(f(2), Float)
+    Float.setdps(30)
+    try:
+        assert str(f(4)) == '11.0014671356386317122855742379'
+    finally:
+        Float.setdps(15)
+    if numpy is not None:
+        f = compile_function([x*cos(x), 0.5], [x], 'numpy')
+        r = f(numpy.array([0.0, 1.0]))
+        assert abs(r[0][1] - 0.5403023058681398) < 1e-12 and r[1] == 0.5
+
+def test_lambdify_fallback():
+    # strings that are not expressions are translated to Python source
+    f = lambdify('x % y, y', 'x, y')
+    assert f(7, 4) == (3, 4)
+
+def test_evaluate_many_invalid():
+    from sympy import log, exp, evaluate_many
+    from sympy.utilities.lambdify import numpy
+    inf = 1e300*1e300
+    backends = [False]
+    if numpy is not None:
+        backends.append(True)
+    # invalid points give the same results with and without NumPy
+    for use_numpy in backends:
+        assert list(evaluate_many(1/x, [x], [0.0, 1.0],
+                                  use_numpy=use_numpy)) == [inf, 1.0]
+        r = list(evaluate_many(log(x), [x], [0.0, -1.0, 1.0],
+                               use_numpy=use_numpy))
+        assert r[0] == -inf and r[1] != r[1] and r[2] == 0.0
+        r = list(evaluate_many(sqrt(x), [x], [-1.0, 4.0], use_numpy=use_numpy))
+        assert r[0] != r[0] and r[1] == 2.0
+        r = list(evaluate_many(exp(x) + x**3, [x, y], [(1000, 0), (0, 1)],
+                               use_numpy=use_numpy))
+        assert r == [inf, 1.0]
@@ -0,0 +1,49 @@
+import os
+import sys
+from subprocess import Popen, PIPE
+
+import sympy
+from sympy.utilities.lazy import LazyModule
+
+root = os.path.abspath(os.path.join(os.path.dirname(sympy.__file__), '..'))
+
+def run(code):
+    """Runs code in a new interpreter and returns its output."""
+    p = Popen([sys.executable, '-c', code], cwd=root, stdout=PIPE)
+    return p.communicate()[0].strip()
+
+def test_lazy_subpackages_not_imported():
+    out = run("import sys, sympy; print [m for m in ['sympy.geometry', "
+              "'sympy.integrals', 'sympy.plotting', 'sympy.printing'] "
+              "if m in sys.modules]")
+    assert out == "[]"
+
+def test_import_cost():
+    # "import sympy" loads 82 modules of sympy, the eager import loaded
+    # 100; a ceiling on their number bounds the startup time
+    out = run("import sys, sympy; print len([m for m in sys.modules "
+              "if m.startswith('sympy') and sys.modules[m] is not None])")
+    assert int(out) <= 90
+
+def test_lazy_names():
+    out = run("import sys; from sympy import Point; import sympy; "
+              "print sympy.Point is sympy.geometry.Point is Point, "
+              "'sympy.integrals' in sys.modules")
+    assert out == "True False"
+
+def test_star_import():
+    out = run("from sympy import *; print Point.__module__, "
+              "integrate.__module__, textplot.__module__")
+    assert out == "sympy.geometry.point sympy.integrals.integrals " \
+                  "sympy.plotting.textplot"
+
+def test_lazy_module():
+    assert isinstance(sympy, LazyModule)
+    assert 'integrate' in sympy.__all__
+    assert 'physics' not in sympy.__all__
+    assert 'Plot' in dir(sympy)
+    try:
+        sympy.no_such_name
+        assert False
+    except AttributeError:
+        pass